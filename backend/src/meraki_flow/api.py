@@ -4,18 +4,28 @@ FastAPI server for Meraki Crews.
 Endpoints:
 - POST /discovery: Start a discovery job with quiz answers
 - GET /discovery/{job_id}: Poll job status and results
-- POST /sampling/preview: Start a sampling preview job
+- POST /discovery/batch: Start many discovery jobs at once (cohort onboarding)
+- GET /discovery/batch/{batch_id}: Poll aggregate batch progress
+- POST /sampling/preview: Start a sampling preview job (or serve a fresh stored result)
 - GET /sampling/preview/{job_id}: Poll sampling preview status
-- POST /sampling/local: Start a local experiences job
+- POST /sampling/local: Start a local experiences job (or serve a fresh stored result)
 - GET /sampling/local/{job_id}: Poll local experiences status
+- DELETE /jobs/{job_id}: Cancel a pending or running job
+- GET /metrics: LLM token/cost/latency usage aggregated by job type, Supabase pool, scheduler,
+  rate limit and LLM retry/hedging stats
 - GET /health: Health check
+
+Job submissions are rate limited per user and per job type (429 + Retry-After,
+see rate_limit.py).
 """
 
 import json
+import math
 import os
 import re
+import uuid
 import warnings
-from threading import Thread
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 warnings.filterwarnings("ignore", category=ResourceWarning)
@@ -25,31 +35,33 @@ from meraki_flow.opik_setup import initialize_opik
 initialize_opik()
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from meraki_flow.crews.discovery_crew.discovery_crew import DiscoveryCrew
 from meraki_flow.crews.sampling_preview_crew.sampling_preview_crew import SamplingPreviewCrew
 from meraki_flow.crews.local_experiences_crew.local_experiences_crew import LocalExperiencesCrew
 from meraki_flow.crews.practice_feedback_crew.practice_feedback_crew import PracticeFeedbackCrew
 from meraki_flow.crews.challenge_generation_crew.challenge_generation_crew import ChallengeGenerationCrew
 from meraki_flow.crews.motivation_crew.motivation_crew import MotivationCrew
 from meraki_flow.crews.roadmap_crew.roadmap_crew import RoadmapCrew
+from meraki_flow.cancellation import cancel_job, run_with_deadline
+from meraki_flow.discovery_modes import DISCOVERY_MODES, build_discovery_inputs, run_discovery
+from meraki_flow.matching.embedding_index import get_hobby_index
 from meraki_flow.models import SamplingRecommendation, MicroActivity, CuratedVideos
+from meraki_flow.rate_limit import RateLimited, get_rate_limiter
+from meraki_flow.resilience import resilience_metrics
+from meraki_flow.scheduler import get_scheduler
+from meraki_flow.supabase_http import pool_metrics
+from meraki_flow.usage import kickoff_with_usage, summarize_usage
+from meraki_flow import async_db
 from meraki_flow.db import (
-    create_job,
     get_job,
     update_job_status,
-    update_job_result,
+    complete_job,
     update_job_error,
-    save_sampling_result,
-    save_local_experience_result,
-    save_hobby_matches,
-    save_ai_feedback,
-    save_generated_challenge,
-    save_nudge,
-    save_generated_roadmap,
+    get_hobby_content,
+    save_hobby_content,
 )
 
 
@@ -77,6 +89,11 @@ class DiscoveryRequest(BaseModel):
     q20: str = ""
     q21: str = ""
     q22: str = ""
+    mode: str = ""  # "engine", "fast" or "crew"; defaults to DISCOVERY_MODE
+
+
+class DiscoveryBatchRequest(BaseModel):
+    requests: list[DiscoveryRequest]
 
 
 class SamplingPreviewRequest(BaseModel):
@@ -145,6 +162,12 @@ class RoadmapGenerationRequest(BaseModel):
 
 class JobResponse(BaseModel):
     job_id: str
+    cached: bool = False
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    job_ids: list[str]
 
 
 app = FastAPI(
@@ -165,36 +188,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+DISCOVERY_BATCH_MAX_SIZE = int(os.environ.get("DISCOVERY_BATCH_MAX_SIZE", "1000"))
 
-def parse_crew_output(raw_output: str) -> dict[str, Any]:
-    """Parse the crew's raw output to extract JSON result."""
-    # Try to find JSON in the output
-    # Look for the final JSON structure with matches
-    json_patterns = [
-        r'\{[\s\S]*"matches"[\s\S]*\}',  # Main result format
-        r'\[[\s\S]*"hobby_slug"[\s\S]*\]',  # Array format
-    ]
-
-    for pattern in json_patterns:
-        matches = re.findall(pattern, raw_output)
-        if matches:
-            # Try the last match (most likely the final output)
-            for match in reversed(matches):
-                try:
-                    parsed = json.loads(match)
-                    # Normalize to expected format
-                    if isinstance(parsed, list):
-                        return {"matches": parsed, "encouragement": ""}
-                    return parsed
-                except json.JSONDecodeError:
-                    continue
+# Cache-first sampling: /sampling/preview and /sampling/local serve the stored
+# result for the same user+hobby(+location) while it is younger than the max
+# age. Past REFRESH_AFTER (0 = never) it is still served, and a crew run
+# refreshes it in the background.
+SAMPLING_CACHE_MAX_AGE_HOURS = float(os.environ.get("SAMPLING_CACHE_MAX_AGE_HOURS", "168"))
+SAMPLING_CACHE_REFRESH_AFTER_HOURS = float(os.environ.get("SAMPLING_CACHE_REFRESH_AFTER_HOURS", "0"))
+_refreshing: set[tuple[str, ...]] = set()
 
-    # Fallback: return raw output wrapped
-    return {
-        "matches": [],
-        "encouragement": "",
-        "raw_output": raw_output,
-    }
+# Hobby-level content (curated videos, local spots) shared across users
+HOBBY_CONTENT_MAX_AGE_HOURS = float(os.environ.get("HOBBY_CONTENT_MAX_AGE_HOURS", "336"))
 
 
 def parse_task_output_json(raw_output: str) -> dict[str, Any] | None:
@@ -237,6 +242,85 @@ def parse_task_output_json(raw_output: str) -> dict[str, Any] | None:
     return None
 
 
+def hours_since(timestamp: str) -> float:
+    """Age in hours of a Postgres timestamptz string."""
+    # Python 3.10's fromisoformat needs exactly 3 or 6 fractional digits
+    match = re.match(r"([^.]*)(?:\.(\d+))?(.*)", timestamp.replace("Z", "+00:00"))
+    head, fraction, tz = match.groups()
+    created = datetime.fromisoformat(f"{head}.{(fraction or '').ljust(6, '0')[:6]}{tz}")
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return (datetime.now(timezone.utc) - created).total_seconds() / 3600
+
+
+def _run_refresh(runner, job_id: str, key: tuple[str, ...]) -> None:
+    try:
+        runner(job_id)
+    finally:
+        _refreshing.discard(key)
+
+
+async def serve_cached_result(
+    job_type: str,
+    request_data: dict[str, Any],
+    cached: dict[str, Any],
+    runner,
+    key: tuple[str, ...],
+) -> JobResponse:
+    """Answer with an already-completed job holding `cached`, refreshing it in the background if due."""
+    user_id = request_data.get("user_id", "")
+    job_id = await async_db.create_job(job_type, request_data, user_id, result=cached["result"])
+
+    due = SAMPLING_CACHE_REFRESH_AFTER_HOURS > 0 and hours_since(cached["created_at"]) >= SAMPLING_CACHE_REFRESH_AFTER_HOURS
+    if due and key not in _refreshing:
+        _refreshing.add(key)
+        refresh_id = await async_db.create_job(job_type, request_data, user_id)
+        get_scheduler().submit(job_type, _run_refresh, runner, refresh_id, key, cls="background")
+        print(f"[{job_type}] Serving cached result, refreshing in job {refresh_id}")
+
+    return JobResponse(job_id=job_id, cached=True)
+
+
+def cache_cutoff() -> str:
+    return (datetime.now(timezone.utc) - timedelta(hours=SAMPLING_CACHE_MAX_AGE_HOURS)).isoformat()
+
+
+async def enforce_rate_limit(job_type: str, user_id: str, http_request: Request) -> None:
+    """Take a rate limit token for a job submission, or answer 429 with Retry-After."""
+    client = http_request.client.host if http_request.client else ""
+    try:
+        await get_rate_limiter().check(job_type, user_id, client)
+    except RateLimited as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+
+
+def shared_hobby_content(content_type: str, hobby_key: str, location: str = "") -> Any | None:
+    """Fresh shared content for a hobby, or None (lookup errors never fail a job)."""
+    if not hobby_key or HOBBY_CONTENT_MAX_AGE_HOURS <= 0:
+        return None
+    since = (datetime.now(timezone.utc) - timedelta(hours=HOBBY_CONTENT_MAX_AGE_HOURS)).isoformat()
+    try:
+        return get_hobby_content(content_type, hobby_key, location, since=since)
+    except Exception as e:
+        print(f"[Hobby Content] Lookup failed for {content_type}/{hobby_key}: {e}")
+        return None
+
+
+def share_hobby_content(content_type: str, hobby_key: str, content: Any, location: str = "") -> None:
+    """Store content in the shared hobby cache (errors are logged, not raised)."""
+    if not hobby_key or not content:
+        return
+    try:
+        save_hobby_content(content_type, hobby_key, content, location)
+    except Exception as e:
+        print(f"[Hobby Content] Save failed for {content_type}/{hobby_key}: {e}")
+
+
+@run_with_deadline("discovery", on_timeout=update_job_error)
 def run_discovery_job(job_id: str) -> None:
     """Run the discovery crew in a background thread."""
     import traceback
@@ -249,53 +333,18 @@ def run_discovery_job(job_id: str) -> None:
         # Update status to running
         update_job_status(job_id, "running")
 
-        # Build inputs matching all task placeholders
         request_data = job["request_data"]
-        inputs = {
-            "q1_time_available": request_data.get("q1", ""),
-            "q2_practice_timing": request_data.get("q2", ""),
-            "q3_session_preference": request_data.get("q3", ""),
-            "q4_creative_type": request_data.get("q4", ""),
-            "q5_structure_preference": request_data.get("q5", ""),
-            "q6_mess_tolerance": request_data.get("q6", ""),
-            "q7_learning_method": request_data.get("q7", ""),
-            "q8_mistake_attitude": request_data.get("q8", ""),
-            "q9_practice_location": request_data.get("q9", ""),
-            "q10_social_preference": request_data.get("q10", ""),
-            "q11_initial_budget": request_data.get("q11", ""),
-            "q12_ongoing_costs": request_data.get("q12", ""),
-            "q13_try_before_commit": request_data.get("q13", ""),
-            "q14_motivations": request_data.get("q14", ""),
-            "q15_resonates": request_data.get("q15", ""),
-            "q16_learning_curve": request_data.get("q16", ""),
-            "q17_sensory_experience": request_data.get("q17", ""),
-            "q18_senses_to_engage": request_data.get("q18", ""),
-            "q19_physical_constraints": request_data.get("q19", ""),
-            "q20_seasonal_preference": request_data.get("q20", ""),
-            "q21_dream_hobby": request_data.get("q21", ""),
-            "q22_barriers": request_data.get("q22", ""),
-        }
-
-        print(f"[Discovery Job {job_id}] Starting crew with inputs: {list(inputs.keys())}")
-
-        # Call DiscoveryCrew directly
-        result = DiscoveryCrew().crew().kickoff(inputs=inputs)
+        inputs = build_discovery_inputs(request_data)
+        parsed, usage = run_discovery(job_id, inputs, request_data.get("mode", ""))
 
-        print(f"[Discovery Job {job_id}] Crew completed. Raw output length: {len(result.raw) if result.raw else 0}")
-
-        # Parse JSON output
-        parsed = parse_crew_output(result.raw)
-
-        update_job_result(job_id, parsed)
-
-        # Save hobby matches if user_id is available
+        # Complete the job and save hobby matches (if user_id is available) in one call
         user_id = job.get("user_id", "")
-        if user_id and parsed.get("matches"):
-            try:
-                save_hobby_matches(user_id, parsed["matches"])
-                print(f"[Discovery Job {job_id}] Saved {len(parsed['matches'])} hobby matches")
-            except Exception as e:
-                print(f"[Discovery Job {job_id}] Failed to save hobby matches: {e}")
+        persist = "hobby_matches" if user_id and parsed.get("matches") else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"user_id": user_id})
+        if saved.get("error"):
+            print(f"[Discovery Job {job_id}] Failed to save hobby matches: {saved['error']}")
+        elif persist:
+            print(f"[Discovery Job {job_id}] Saved {saved.get('count', 0)} hobby matches")
 
         print(f"[Discovery Job {job_id}] Job completed successfully")
 
@@ -319,6 +368,7 @@ def classify_task_json(task_json: dict[str, Any]) -> str | None:
     return None
 
 
+@run_with_deadline("sampling_preview", on_timeout=update_job_error)
 def run_sampling_preview_job(job_id: str) -> None:
     """Run the sampling preview crew in a background thread."""
     import traceback
@@ -338,7 +388,17 @@ def run_sampling_preview_job(job_id: str) -> None:
 
         print(f"[Sampling Preview Job {job_id}] Starting crew for hobby: {inputs['hobby_name']}")
 
-        result = SamplingPreviewCrew().crew().kickoff(inputs=inputs)
+        # Curated videos depend only on the hobby: reuse them across users and
+        # only generate the personalized recommendation + micro activity
+        hobby_key = request_data.get("hobby_slug", "") or inputs["hobby_name"]
+        shared_videos = shared_hobby_content("videos", hobby_key)
+        if shared_videos:
+            print(f"[Sampling Preview Job {job_id}] Reusing shared videos for {hobby_key}")
+            crew = SamplingPreviewCrew().personalization_crew()
+        else:
+            crew = SamplingPreviewCrew().crew()
+
+        result, usage = kickoff_with_usage("sampling_preview", crew, inputs)
 
         num_tasks = len(result.tasks_output) if result.tasks_output else 0
         print(f"[Sampling Preview Job {job_id}] Crew completed. Tasks count: {num_tasks}")
@@ -374,22 +434,25 @@ def run_sampling_preview_job(job_id: str) -> None:
                         else:
                             parsed[key] = task_json
 
+        if shared_videos:
+            parsed["videos"] = shared_videos
+        elif isinstance(parsed["videos"], list):
+            share_hobby_content("videos", hobby_key, parsed["videos"])
+
         print(f"[Sampling Preview Job {job_id}] FINAL: "
               f"recommendation={'yes' if parsed['recommendation'] else 'no'}, "
               f"micro_activity={'yes' if parsed['micro_activity'] else 'no'}, "
               f"videos={len(parsed['videos']) if isinstance(parsed.get('videos'), list) else 'none'}")
 
-        update_job_result(job_id, parsed)
-
-        # Save sampling result if user_id and hobby_slug are available
+        # Complete the job and save the sampling result (if user_id and hobby_slug are available)
         user_id = request_data.get("user_id", "")
         hobby_slug = request_data.get("hobby_slug", "")
-        if user_id and hobby_slug:
-            try:
-                save_sampling_result(user_id, hobby_slug, parsed)
-                print(f"[Sampling Preview Job {job_id}] Saved sampling result for {hobby_slug}")
-            except Exception as e:
-                print(f"[Sampling Preview Job {job_id}] Failed to save sampling result: {e}")
+        persist = "sampling_result" if user_id and hobby_slug else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"user_id": user_id, "hobby_slug": hobby_slug})
+        if saved.get("error"):
+            print(f"[Sampling Preview Job {job_id}] Failed to save sampling result: {saved['error']}")
+        elif persist:
+            print(f"[Sampling Preview Job {job_id}] Saved sampling result for {hobby_slug}")
 
         print(f"[Sampling Preview Job {job_id}] Job completed successfully")
 
@@ -399,6 +462,7 @@ def run_sampling_preview_job(job_id: str) -> None:
         update_job_error(job_id, str(e))
 
 
+@run_with_deadline("local_experiences", on_timeout=update_job_error)
 def run_local_experiences_job(job_id: str) -> None:
     """Run the local experiences crew in a background thread."""
     import traceback
@@ -416,37 +480,50 @@ def run_local_experiences_job(job_id: str) -> None:
             "location": request_data.get("location", ""),
         }
 
-        print(f"[Local Experiences Job {job_id}] Starting crew for hobby: {inputs['hobby_name']} in {inputs['location']}")
+        # Local spots and tips depend only on hobby + location, not on the user
+        hobby_key = request_data.get("hobby_slug", "") or inputs["hobby_name"]
+        parsed = shared_hobby_content("local_experiences", hobby_key, inputs["location"])
+        usage = None
 
-        result = LocalExperiencesCrew().crew().kickoff(inputs=inputs)
+        if parsed:
+            print(f"[Local Experiences Job {job_id}] Reusing shared results for {hobby_key} in {inputs['location']}")
+        else:
+            print(f"[Local Experiences Job {job_id}] Starting crew for hobby: {inputs['hobby_name']} in {inputs['location']}")
 
-        print(f"[Local Experiences Job {job_id}] Crew completed. Raw output length: {len(result.raw) if result.raw else 0}")
+            result, usage = kickoff_with_usage("local_experiences", LocalExperiencesCrew().crew(), inputs)
 
-        if result.tasks_output and result.tasks_output[0].pydantic:
-            parsed = result.tasks_output[0].pydantic.model_dump()
-            print(f"[Local Experiences Job {job_id}] Parsed via pydantic output")
-        else:
-            # Fallback: try raw parsing
-            parsed = parse_task_output_json(result.raw or "")
-            if not parsed:
-                parsed = {"local_spots": [], "general_tips": {}}
-            print(f"[Local Experiences Job {job_id}] Parsed via raw fallback")
+            print(f"[Local Experiences Job {job_id}] Crew completed. Raw output length: {len(result.raw) if result.raw else 0}")
+
+            if result.tasks_output and result.tasks_output[0].pydantic:
+                parsed = result.tasks_output[0].pydantic.model_dump()
+                print(f"[Local Experiences Job {job_id}] Parsed via pydantic output")
+            else:
+                # Fallback: try raw parsing
+                parsed = parse_task_output_json(result.raw or "")
+                if not parsed:
+                    parsed = {"local_spots": [], "general_tips": {}}
+                print(f"[Local Experiences Job {job_id}] Parsed via raw fallback")
+
+            if parsed.get("local_spots"):
+                share_hobby_content("local_experiences", hobby_key, parsed, inputs["location"])
 
         print(f"[Local Experiences Job {job_id}] FINAL: "
               f"spots={len(parsed.get('local_spots', []))}, "
               f"tips={'yes' if parsed.get('general_tips') else 'no'}")
 
-        update_job_result(job_id, parsed)
-
-        # Save local experience result if user_id and hobby_slug are available
+        # Complete the job and save the result (if user_id and hobby_slug are available)
         user_id = request_data.get("user_id", "")
         hobby_slug = request_data.get("hobby_slug", "")
-        if user_id and hobby_slug:
-            try:
-                save_local_experience_result(user_id, hobby_slug, inputs["location"], parsed)
-                print(f"[Local Experiences Job {job_id}] Saved result for {hobby_slug} in {inputs['location']}")
-            except Exception as e:
-                print(f"[Local Experiences Job {job_id}] Failed to save result: {e}")
+        persist = "local_experience_result" if user_id and hobby_slug else ""
+        saved = complete_job(job_id, parsed, usage, persist, {
+            "user_id": user_id,
+            "hobby_slug": hobby_slug,
+            "location": inputs["location"],
+        })
+        if saved.get("error"):
+            print(f"[Local Experiences Job {job_id}] Failed to save result: {saved['error']}")
+        elif persist:
+            print(f"[Local Experiences Job {job_id}] Saved result for {hobby_slug} in {inputs['location']}")
 
         print(f"[Local Experiences Job {job_id}] Job completed successfully")
 
@@ -456,19 +533,33 @@ def run_local_experiences_job(job_id: str) -> None:
         update_job_error(job_id, str(e))
 
 
+@app.on_event("startup")
+def load_hobby_index() -> None:
+    """Memory-map the hobby embedding index once, before the first request."""
+    get_hobby_index()
+
+
+@app.on_event("shutdown")
+async def close_supabase() -> None:
+    """Release the async Supabase client's pooled connections."""
+    await async_db.close_async_supabase()
+
+
 # ─── Discovery Endpoints ───
 
 @app.post("/discovery", response_model=JobResponse)
-async def start_discovery(request: DiscoveryRequest):
+async def start_discovery(request: DiscoveryRequest, http_request: Request):
     """Start a new discovery job with all quiz answers."""
+    if request.mode and request.mode not in DISCOVERY_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown discovery mode: {request.mode}")
     request_data = request.model_dump()
     user_id = request_data.pop("user_id")
+    await enforce_rate_limit("discovery", user_id, http_request)
 
-    job_id = create_job("discovery", request_data, user_id)
+    job_id = await async_db.create_job("discovery", request_data, user_id)
 
     # Run in background thread (CrewAI isn't fully async-compatible)
-    thread = Thread(target=run_discovery_job, args=(job_id,))
-    thread.start()
+    get_scheduler().submit("discovery", run_discovery_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -476,7 +567,7 @@ async def start_discovery(request: DiscoveryRequest):
 @app.get("/discovery/{job_id}")
 async def get_discovery_status(job_id: str):
     """Get the status and result of a discovery job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -490,18 +581,88 @@ async def get_discovery_status(job_id: str):
     }
 
 
+@app.post("/discovery/batch", response_model=BatchResponse)
+async def start_discovery_batch(request: DiscoveryBatchRequest, http_request: Request):
+    """Start discovery jobs for many quiz submissions with one bulk insert."""
+    if not request.requests:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(request.requests) > DISCOVERY_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large ({len(request.requests)} > {DISCOVERY_BATCH_MAX_SIZE})",
+        )
+    bad_modes = {item.mode for item in request.requests if item.mode and item.mode not in DISCOVERY_MODES}
+    if bad_modes:
+        raise HTTPException(status_code=400, detail=f"Unknown discovery mode: {', '.join(sorted(bad_modes))}")
+    # One token per batch: its jobs already queue as capped background work
+    await enforce_rate_limit("discovery_batch", "", http_request)
+
+    items = []
+    for item in request.requests:
+        request_data = item.model_dump()
+        user_id = request_data.pop("user_id")
+        items.append((request_data, user_id))
+
+    batch_id = str(uuid.uuid4())
+    job_ids = await async_db.create_jobs("discovery", items, batch_id)
+
+    # Bulk onboarding queues as background work so it never delays interactive jobs
+    scheduler = get_scheduler()
+    for job_id in job_ids:
+        scheduler.submit("discovery", run_discovery_job, job_id, cls="background")
+
+    print(f"[Discovery Batch {batch_id}] Queued {len(job_ids)} jobs")
+    return BatchResponse(batch_id=batch_id, job_ids=job_ids)
+
+
+@app.get("/discovery/batch/{batch_id}")
+async def get_discovery_batch_status(batch_id: str):
+    """Get aggregate progress of a discovery batch."""
+    jobs = await async_db.get_batch_jobs(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    counts = {"pending": 0, "running": 0, "completed": 0, "failed": 0, "cancelled": 0}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+
+    total = len(jobs)
+    done = counts["completed"] + counts["failed"] + counts["cancelled"]
+    return {
+        "batch_id": batch_id,
+        "total": total,
+        **counts,
+        "progress": round(done / total, 4),
+        "done": done == total,
+        "failed_job_ids": [j["id"] for j in jobs if j["status"] == "failed"],
+    }
+
+
 # ─── Sampling Preview Endpoints ───
 
 @app.post("/sampling/preview", response_model=JobResponse)
-async def start_sampling_preview(request: SamplingPreviewRequest):
-    """Start a new sampling preview job."""
+async def start_sampling_preview(request: SamplingPreviewRequest, http_request: Request, refresh: bool = False):
+    """Start a new sampling preview job, or serve the user's stored result if still fresh.
+
+    `?refresh=true` skips the stored result and always runs the crew.
+    """
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
+    hobby_slug = request_data.get("hobby_slug", "")
 
-    job_id = create_job("sampling_preview", request_data, user_id)
+    if not refresh and user_id and hobby_slug and SAMPLING_CACHE_MAX_AGE_HOURS > 0:
+        cached = await async_db.get_sampling_result(user_id, hobby_slug, cache_cutoff())
+        if cached:
+            return await serve_cached_result(
+                "sampling_preview", request_data, cached, run_sampling_preview_job,
+                ("sampling_preview", user_id, hobby_slug),
+            )
 
-    thread = Thread(target=run_sampling_preview_job, args=(job_id,))
-    thread.start()
+    # Only a new crew run is rate limited; serving a stored result is cheap
+    await enforce_rate_limit("sampling_preview", user_id, http_request)
+    job_id = await async_db.create_job("sampling_preview", request_data, user_id)
+
+    get_scheduler().submit("sampling_preview", run_sampling_preview_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -509,7 +670,7 @@ async def start_sampling_preview(request: SamplingPreviewRequest):
 @app.get("/sampling/preview/{job_id}")
 async def get_sampling_preview_status(job_id: str):
     """Get the status and result of a sampling preview job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -526,15 +687,29 @@ async def get_sampling_preview_status(job_id: str):
 # ─── Local Experiences Endpoints ───
 
 @app.post("/sampling/local", response_model=JobResponse)
-async def start_local_experiences(request: LocalExperiencesRequest):
-    """Start a new local experiences job."""
+async def start_local_experiences(request: LocalExperiencesRequest, http_request: Request, refresh: bool = False):
+    """Start a new local experiences job, or serve the user's stored result if still fresh.
+
+    `?refresh=true` skips the stored result and always runs the crew.
+    """
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
+    hobby_slug = request_data.get("hobby_slug", "")
+    location = request_data.get("location", "")
 
-    job_id = create_job("local_experiences", request_data, user_id)
+    if not refresh and user_id and hobby_slug and SAMPLING_CACHE_MAX_AGE_HOURS > 0:
+        cached = await async_db.get_local_experience_result(user_id, hobby_slug, location, cache_cutoff())
+        if cached:
+            return await serve_cached_result(
+                "local_experiences", request_data, cached, run_local_experiences_job,
+                ("local_experiences", user_id, hobby_slug, location),
+            )
 
-    thread = Thread(target=run_local_experiences_job, args=(job_id,))
-    thread.start()
+    # Only a new crew run is rate limited; serving a stored result is cheap
+    await enforce_rate_limit("local_experiences", user_id, http_request)
+    job_id = await async_db.create_job("local_experiences", request_data, user_id)
+
+    get_scheduler().submit("local_experiences", run_local_experiences_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -542,7 +717,7 @@ async def start_local_experiences(request: LocalExperiencesRequest):
 @app.get("/sampling/local/{job_id}")
 async def get_local_experiences_status(job_id: str):
     """Get the status and result of a local experiences job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -558,6 +733,7 @@ async def get_local_experiences_status(job_id: str):
 
 # ─── Practice Feedback Endpoints ───
 
+@run_with_deadline("practice_feedback", on_timeout=update_job_error)
 def run_practice_feedback_job(job_id: str) -> None:
     """Run the practice feedback crew in a background thread."""
     import traceback
@@ -583,7 +759,7 @@ def run_practice_feedback_job(job_id: str) -> None:
 
         print(f"[Practice Feedback Job {job_id}] Starting crew for: {inputs['hobby_name']}")
 
-        result = PracticeFeedbackCrew().crew().kickoff(inputs=inputs)
+        result, usage = kickoff_with_usage("practice_feedback", PracticeFeedbackCrew().crew(), inputs)
 
         if result.tasks_output and result.tasks_output[0].pydantic:
             parsed = result.tasks_output[0].pydantic.model_dump()
@@ -592,15 +768,13 @@ def run_practice_feedback_job(job_id: str) -> None:
             if not parsed:
                 parsed = {"observations": [], "growth": [], "suggestions": [], "celebration": ""}
 
-        update_job_result(job_id, parsed)
-
         session_id = request_data.get("session_id", "")
-        if session_id:
-            try:
-                save_ai_feedback(session_id, parsed)
-                print(f"[Practice Feedback Job {job_id}] Saved feedback for session {session_id}")
-            except Exception as e:
-                print(f"[Practice Feedback Job {job_id}] Failed to save feedback: {e}")
+        persist = "ai_feedback" if session_id else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"session_id": session_id})
+        if saved.get("error"):
+            print(f"[Practice Feedback Job {job_id}] Failed to save feedback: {saved['error']}")
+        elif persist:
+            print(f"[Practice Feedback Job {job_id}] Saved feedback for session {session_id}")
 
         print(f"[Practice Feedback Job {job_id}] Job completed successfully")
 
@@ -611,15 +785,15 @@ def run_practice_feedback_job(job_id: str) -> None:
 
 
 @app.post("/practice/feedback", response_model=JobResponse)
-async def start_practice_feedback(request: PracticeFeedbackRequest):
+async def start_practice_feedback(request: PracticeFeedbackRequest, http_request: Request):
     """Start a practice feedback job."""
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
 
-    job_id = create_job("practice_feedback", request_data, user_id)
+    await enforce_rate_limit("practice_feedback", user_id, http_request)
+    job_id = await async_db.create_job("practice_feedback", request_data, user_id)
 
-    thread = Thread(target=run_practice_feedback_job, args=(job_id,))
-    thread.start()
+    get_scheduler().submit("practice_feedback", run_practice_feedback_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -627,7 +801,7 @@ async def start_practice_feedback(request: PracticeFeedbackRequest):
 @app.get("/practice/feedback/{job_id}")
 async def get_practice_feedback_status(job_id: str):
     """Get the status and result of a practice feedback job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -643,6 +817,7 @@ async def get_practice_feedback_status(job_id: str):
 
 # ─── Challenge Generation Endpoints ───
 
+@run_with_deadline("challenge_generation", on_timeout=update_job_error)
 def run_challenge_generation_job(job_id: str) -> None:
     """Run the challenge generation crew in a background thread."""
     import traceback
@@ -669,7 +844,7 @@ def run_challenge_generation_job(job_id: str) -> None:
 
         print(f"[Challenge Generation Job {job_id}] Starting crew for: {inputs['hobby_name']}")
 
-        result = ChallengeGenerationCrew().crew().kickoff(inputs=inputs)
+        result, usage = kickoff_with_usage("challenge_generation", ChallengeGenerationCrew().crew(), inputs)
 
         if result.tasks_output and result.tasks_output[0].pydantic:
             parsed = result.tasks_output[0].pydantic.model_dump()
@@ -678,17 +853,14 @@ def run_challenge_generation_job(job_id: str) -> None:
             if not parsed:
                 parsed = {"title": "", "description": ""}
 
-        update_job_result(job_id, parsed)
-
         user_id = request_data.get("user_id", "")
         hobby_slug = request_data.get("hobby_slug", "")
-        if user_id and hobby_slug and parsed.get("title"):
-            try:
-                uc_id = save_generated_challenge(user_id, hobby_slug, parsed)
-                if uc_id:
-                    print(f"[Challenge Generation Job {job_id}] Saved challenge, user_challenge_id={uc_id}")
-            except Exception as e:
-                print(f"[Challenge Generation Job {job_id}] Failed to save challenge: {e}")
+        persist = "challenge" if user_id and hobby_slug and parsed.get("title") else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"user_id": user_id, "hobby_slug": hobby_slug})
+        if saved.get("error"):
+            print(f"[Challenge Generation Job {job_id}] Failed to save challenge: {saved['error']}")
+        elif saved.get("id"):
+            print(f"[Challenge Generation Job {job_id}] Saved challenge, user_challenge_id={saved['id']}")
 
         print(f"[Challenge Generation Job {job_id}] Job completed successfully")
 
@@ -699,15 +871,15 @@ def run_challenge_generation_job(job_id: str) -> None:
 
 
 @app.post("/challenges/generate", response_model=JobResponse)
-async def start_challenge_generation(request: ChallengeGenerationRequest):
+async def start_challenge_generation(request: ChallengeGenerationRequest, http_request: Request):
     """Start a challenge generation job."""
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
 
-    job_id = create_job("challenge_generation", request_data, user_id)
+    await enforce_rate_limit("challenge_generation", user_id, http_request)
+    job_id = await async_db.create_job("challenge_generation", request_data, user_id)
 
-    thread = Thread(target=run_challenge_generation_job, args=(job_id,))
-    thread.start()
+    get_scheduler().submit("challenge_generation", run_challenge_generation_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -715,7 +887,7 @@ async def start_challenge_generation(request: ChallengeGenerationRequest):
 @app.get("/challenges/generate/{job_id}")
 async def get_challenge_generation_status(job_id: str):
     """Get the status and result of a challenge generation job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -731,6 +903,7 @@ async def get_challenge_generation_status(job_id: str):
 
 # ─── Motivation Check Endpoints ───
 
+@run_with_deadline("motivation_check", on_timeout=update_job_error)
 def run_motivation_check_job(job_id: str) -> None:
     """Run the motivation crew in a background thread."""
     import traceback
@@ -755,7 +928,7 @@ def run_motivation_check_job(job_id: str) -> None:
 
         print(f"[Motivation Check Job {job_id}] Starting crew for: {inputs['hobby_name']}")
 
-        result = MotivationCrew().crew().kickoff(inputs=inputs)
+        result, usage = kickoff_with_usage("motivation", MotivationCrew().crew(), inputs)
 
         if result.tasks_output and result.tasks_output[0].pydantic:
             parsed = result.tasks_output[0].pydantic.model_dump()
@@ -764,16 +937,14 @@ def run_motivation_check_job(job_id: str) -> None:
             if not parsed:
                 parsed = {"nudge_type": "", "message": "", "suggested_action": "", "urgency": "gentle"}
 
-        update_job_result(job_id, parsed)
-
         user_id = request_data.get("user_id", "")
         hobby_slug = request_data.get("hobby_slug", "")
-        if user_id and parsed.get("message"):
-            try:
-                save_nudge(user_id, hobby_slug, parsed)
-                print(f"[Motivation Check Job {job_id}] Saved nudge")
-            except Exception as e:
-                print(f"[Motivation Check Job {job_id}] Failed to save nudge: {e}")
+        persist = "nudge" if user_id and parsed.get("message") else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"user_id": user_id, "hobby_slug": hobby_slug})
+        if saved.get("error"):
+            print(f"[Motivation Check Job {job_id}] Failed to save nudge: {saved['error']}")
+        elif persist:
+            print(f"[Motivation Check Job {job_id}] Saved nudge")
 
         print(f"[Motivation Check Job {job_id}] Job completed successfully")
 
@@ -784,15 +955,15 @@ def run_motivation_check_job(job_id: str) -> None:
 
 
 @app.post("/motivation/check", response_model=JobResponse)
-async def start_motivation_check(request: MotivationCheckRequest):
+async def start_motivation_check(request: MotivationCheckRequest, http_request: Request):
     """Start a motivation check job."""
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
 
-    job_id = create_job("motivation_check", request_data, user_id)
+    await enforce_rate_limit("motivation_check", user_id, http_request)
+    job_id = await async_db.create_job("motivation_check", request_data, user_id)
 
-    thread = Thread(target=run_motivation_check_job, args=(job_id,))
-    thread.start()
+    get_scheduler().submit("motivation_check", run_motivation_check_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -800,7 +971,7 @@ async def start_motivation_check(request: MotivationCheckRequest):
 @app.get("/motivation/check/{job_id}")
 async def get_motivation_check_status(job_id: str):
     """Get the status and result of a motivation check job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -816,6 +987,7 @@ async def get_motivation_check_status(job_id: str):
 
 # ─── Roadmap Generation Endpoints ───
 
+@run_with_deadline("roadmap_generation", on_timeout=update_job_error)
 def run_roadmap_generation_job(job_id: str) -> None:
     """Run the roadmap crew in a background thread."""
     import traceback
@@ -839,7 +1011,7 @@ def run_roadmap_generation_job(job_id: str) -> None:
 
         print(f"[Roadmap Generation Job {job_id}] Starting crew for: {inputs['hobby_name']}")
 
-        result = RoadmapCrew().crew().kickoff(inputs=inputs)
+        result, usage = kickoff_with_usage("roadmap", RoadmapCrew().crew(), inputs)
 
         if result.tasks_output and result.tasks_output[0].pydantic:
             parsed = result.tasks_output[0].pydantic.model_dump()
@@ -848,17 +1020,14 @@ def run_roadmap_generation_job(job_id: str) -> None:
             if not parsed:
                 parsed = {"title": "", "description": "", "phases": []}
 
-        update_job_result(job_id, parsed)
-
         user_id = request_data.get("user_id", "")
         hobby_slug = request_data.get("hobby_slug", "")
-        if user_id and hobby_slug and parsed.get("phases"):
-            try:
-                ur_id = save_generated_roadmap(user_id, hobby_slug, parsed)
-                if ur_id:
-                    print(f"[Roadmap Generation Job {job_id}] Saved roadmap, user_roadmap_id={ur_id}")
-            except Exception as e:
-                print(f"[Roadmap Generation Job {job_id}] Failed to save roadmap: {e}")
+        persist = "roadmap" if user_id and hobby_slug and parsed.get("phases") else ""
+        saved = complete_job(job_id, parsed, usage, persist, {"user_id": user_id, "hobby_slug": hobby_slug})
+        if saved.get("error"):
+            print(f"[Roadmap Generation Job {job_id}] Failed to save roadmap: {saved['error']}")
+        elif saved.get("id"):
+            print(f"[Roadmap Generation Job {job_id}] Saved roadmap, user_roadmap_id={saved['id']}")
 
         print(f"[Roadmap Generation Job {job_id}] Job completed successfully")
 
@@ -869,15 +1038,15 @@ def run_roadmap_generation_job(job_id: str) -> None:
 
 
 @app.post("/roadmap/generate", response_model=JobResponse)
-async def start_roadmap_generation(request: RoadmapGenerationRequest):
+async def start_roadmap_generation(request: RoadmapGenerationRequest, http_request: Request):
     """Start a roadmap generation job."""
     request_data = request.model_dump()
     user_id = request_data.get("user_id", "")
 
-    job_id = create_job("roadmap_generation", request_data, user_id)
+    await enforce_rate_limit("roadmap_generation", user_id, http_request)
+    job_id = await async_db.create_job("roadmap_generation", request_data, user_id)
 
-    thread = Thread(target=run_roadmap_generation_job, args=(job_id,))
-    thread.start()
+    get_scheduler().submit("roadmap_generation", run_roadmap_generation_job, job_id)
 
     return JobResponse(job_id=job_id)
 
@@ -885,7 +1054,7 @@ async def start_roadmap_generation(request: RoadmapGenerationRequest):
 @app.get("/roadmap/generate/{job_id}")
 async def get_roadmap_generation_status(job_id: str):
     """Get the status and result of a roadmap generation job."""
-    job = get_job(job_id)
+    job = await async_db.get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
 
@@ -899,6 +1068,55 @@ async def get_roadmap_generation_status(job_id: str):
     }
 
 
+# ─── Job Cancellation ───
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str):
+    """Cancel a pending or running job of any type.
+
+    The job is marked `cancelled` right away; its worker thread stops at the
+    next LLM or tool call (see cancellation.py).
+    """
+    job = await async_db.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    cancelled = await async_db.cancel_job(job_id)
+    if cancelled:
+        cancel_job(job_id)
+
+    return {
+        "job_id": job["id"],
+        "status": "cancelled" if cancelled else job["status"],
+        "cancelled": cancelled,
+    }
+
+
+# ─── Metrics ───
+
+@app.get("/metrics")
+async def get_metrics(hours: int = 24, job_type: str = ""):
+    """Aggregate LLM usage (tokens, calls, wall time, cost) by job type.
+
+    Service-wide totals only: the endpoint is unauthenticated, so usage can't
+    be filtered down to a single user.
+
+    Also reports the Supabase clients' connection pool counters, the job
+    scheduler's queue depth and wait times per priority class, allowed /
+    rejected job submissions per job type, and LLM retry and hedging counters.
+    """
+    since = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+    rows = await async_db.get_job_usage(since, job_type=job_type)
+    return {
+        "since": since,
+        "usage": summarize_usage(rows),
+        "supabase_pool": pool_metrics(),
+        "scheduler": get_scheduler().stats(),
+        "rate_limits": get_rate_limiter().stats(),
+        "llm_resilience": resilience_metrics(),
+    }
+
+
 # ─── Health Check ───
 
 @app.get("/health")
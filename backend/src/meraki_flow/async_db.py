@@ -0,0 +1,188 @@
+"""
+Async Supabase helpers for the FastAPI endpoints.
+
+Job creation, polling, cancellation and usage queries on top of supabase's
+AsyncClient, so request handlers never block the event loop on a Supabase
+round trip. One client (and so one HTTP connection pool, see
+supabase_http.py) is shared by every request in the process.
+
+Background job threads update their jobs through the synchronous helpers in
+db.py.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timezone
+from typing import Any
+
+from dotenv import load_dotenv
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
+
+from meraki_flow.db import new_job_row
+from meraki_flow.supabase_http import async_http_client
+
+load_dotenv()
+
+
+_async_supabase: AsyncClient | None = None
+_client_lock = asyncio.Lock()
+
+
+async def get_async_supabase() -> AsyncClient:
+    """Return the process-wide async Supabase client, creating it on first use."""
+    global _async_supabase
+    if _async_supabase is None:
+        async with _client_lock:
+            if _async_supabase is None:
+                url = os.environ.get("SUPABASE_URL", "")
+                key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+                if not url or not key:
+                    raise RuntimeError(
+                        "SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment"
+                    )
+                _async_supabase = await acreate_client(
+                    url, key, options=AsyncClientOptions(httpx_client=async_http_client())
+                )
+    return _async_supabase
+
+
+async def close_async_supabase() -> None:
+    """Close the shared client's connection pool (call on app shutdown)."""
+    global _async_supabase
+    if _async_supabase is not None:
+        await _async_supabase.postgrest.aclose()
+        _async_supabase = None
+
+
+# ─── Job CRUD ───
+
+async def create_job(
+    job_type: str,
+    request_data: dict[str, Any],
+    user_id: str = "",
+    result: dict[str, Any] | None = None,
+) -> str:
+    """INSERT a new job row and return its id.
+
+    Passing `result` inserts an already-completed job (cache hits).
+    """
+    row = new_job_row(job_type, request_data, user_id, result=result)
+    sb = await get_async_supabase()
+    await sb.table("jobs").insert(row).execute()
+    return row["id"]
+
+
+async def create_jobs(
+    job_type: str,
+    items: list[tuple[dict[str, Any], str]],
+    batch_id: str,
+    chunk_size: int = 500,
+) -> list[str]:
+    """Bulk INSERT job rows sharing a batch_id. Returns job ids in input order.
+
+    `items` is a list of (request_data, user_id) pairs.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    rows = [
+        new_job_row(job_type, request_data, user_id, batch_id=batch_id, now=now)
+        for request_data, user_id in items
+    ]
+    sb = await get_async_supabase()
+    for start in range(0, len(rows), chunk_size):
+        await sb.table("jobs").insert(rows[start:start + chunk_size]).execute()
+    return [row["id"] for row in rows]
+
+
+async def get_job(job_id: str) -> dict[str, Any] | None:
+    """SELECT a job by id. Returns dict or None."""
+    sb = await get_async_supabase()
+    resp = await sb.table("jobs").select("*").eq("id", job_id).execute()
+    if resp.data and len(resp.data) > 0:
+        return resp.data[0]
+    return None
+
+
+async def cancel_job(job_id: str, reason: str = "Cancelled by user") -> bool:
+    """Mark a pending/running job cancelled. Returns False if it already finished."""
+    sb = await get_async_supabase()
+    resp = await (
+        sb.table("jobs")
+        .update({
+            "status": "cancelled",
+            "error": reason,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        })
+        .eq("id", job_id)
+        .in_("status", ["pending", "running"])
+        .execute()
+    )
+    return bool(resp.data)
+
+
+async def get_batch_jobs(batch_id: str) -> list[dict[str, Any]]:
+    """SELECT id/status/error of every job in a batch."""
+    sb = await get_async_supabase()
+    resp = await (
+        sb.table("jobs")
+        .select("id,status,error,updated_at")
+        .eq("batch_id", batch_id)
+        .execute()
+    )
+    return resp.data or []
+
+
+async def get_job_usage(since: str, job_type: str = "") -> list[dict[str, Any]]:
+    """SELECT usage rows for jobs created since `since` (ISO timestamp)."""
+    sb = await get_async_supabase()
+    query = (
+        sb.table("jobs")
+        .select("id,job_type,usage,created_at")
+        .gte("created_at", since)
+        .not_.is_("usage", "null")
+    )
+    if job_type:
+        query = query.eq("job_type", job_type)
+    resp = await query.execute()
+    return resp.data or []
+
+
+# ─── Stored results (cache-first sampling) ───
+
+async def get_sampling_result(
+    user_id: str,
+    hobby_slug: str,
+    since: str,
+) -> dict[str, Any] | None:
+    """SELECT the stored sampling result for a user+hobby if created since `since`."""
+    sb = await get_async_supabase()
+    resp = await (
+        sb.table("sampling_results")
+        .select("result,created_at")
+        .eq("user_id", user_id)
+        .eq("hobby_slug", hobby_slug)
+        .gte("created_at", since)
+        .limit(1)
+        .execute()
+    )
+    return resp.data[0] if resp.data else None
+
+
+async def get_local_experience_result(
+    user_id: str,
+    hobby_slug: str,
+    location: str,
+    since: str,
+) -> dict[str, Any] | None:
+    """SELECT the stored local experience result for a user+hobby+location if created since `since`."""
+    sb = await get_async_supabase()
+    resp = await (
+        sb.table("local_experience_results")
+        .select("result,created_at")
+        .eq("user_id", user_id)
+        .eq("hobby_slug", hobby_slug)
+        .eq("location", location)
+        .gte("created_at", since)
+        .limit(1)
+        .execute()
+    )
+    return resp.data[0] if resp.data else None
@@ -0,0 +1,238 @@
+"""
+Deadlines and cooperative cancellation for background crew jobs.
+
+Python threads can't be killed, so a running job stops itself: every agent
+LLM call, every tool call and the end of each crew kickoff check the job's
+context and raise JobCancelled once the job was cancelled (DELETE
+/jobs/{job_id}) or ran past its per-job-type deadline. A timer marks a
+timed-out job failed right at the deadline, so clients stop waiting even if
+the thread is stuck in a slow call until its next check.
+
+JobCancelled derives from BaseException (like asyncio.CancelledError) so the
+job runners' and CrewAI's broad `except Exception` handlers don't swallow it.
+
+Deadlines (seconds) can be overridden per job type with
+JOB_TIMEOUT_<JOB_TYPE>_S, e.g. JOB_TIMEOUT_SAMPLING_PREVIEW_S=600.
+Cancellations of jobs that never start in this process are forgotten after
+CANCEL_REQUEST_TTL_S (default 3600).
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Any
+
+DEFAULT_JOB_TIMEOUTS_S: dict[str, float] = {
+    "discovery": 180,
+    "sampling_preview": 300,
+    "local_experiences": 240,
+    "practice_feedback": 120,
+    "challenge_generation": 180,
+    "motivation_check": 120,
+    "roadmap_generation": 240,
+}
+
+
+def job_timeout(job_type: str) -> float:
+    """Deadline in seconds for a job type (env override, then default, then 300)."""
+    env = os.environ.get(f"JOB_TIMEOUT_{job_type.upper()}_S")
+    if env:
+        return float(env)
+    return DEFAULT_JOB_TIMEOUTS_S.get(job_type, 300)
+
+
+class JobCancelled(BaseException):
+    """Raised inside a job thread once its job was cancelled or timed out."""
+
+    def __init__(self, job_id: str, reason: str, timed_out: bool = False):
+        super().__init__(reason)
+        self.job_id = job_id
+        self.reason = reason
+        self.timed_out = timed_out
+
+
+class JobContext:
+    """Cancellation flag and deadline of one running job."""
+
+    def __init__(self, job_id: str, job_type: str, timeout: float):
+        self.job_id = job_id
+        self.job_type = job_type
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout
+        self._cancelled = threading.Event()
+        self.reason = ""
+        self.timed_out = False
+
+    def cancel(self, reason: str = "Cancelled by user", timed_out: bool = False) -> None:
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self.timed_out = timed_out
+            self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self) -> None:
+        """Raise JobCancelled if the job was cancelled or is past its deadline."""
+        if not self.cancelled and self.remaining() <= 0:
+            self.cancel(f"Timed out after {self.timeout:.0f}s", timed_out=True)
+        if self.cancelled:
+            raise JobCancelled(self.job_id, self.reason, self.timed_out)
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep up to `seconds` (never past the deadline), waking early on cancel."""
+        self._cancelled.wait(min(seconds, self.remaining()))
+        self.check()
+
+
+_active: dict[str, JobContext] = {}
+# job_id -> time.monotonic() of cancellations for jobs not running yet
+_cancel_requested: dict[str, float] = {}
+_registry_lock = threading.Lock()
+_local = threading.local()
+
+
+def current_job() -> JobContext | None:
+    """The job context of the calling thread, if any."""
+    return getattr(_local, "job", None)
+
+
+def run_as_job(job: JobContext | None, call, *args, **kwargs) -> Any:
+    """Run `call` on this thread with `job` as its current job.
+
+    For helper threads working on a job's behalf, so their cancellation
+    points and tool timeouts follow the job.
+    """
+    previous = current_job()
+    _local.job = job
+    try:
+        return call(*args, **kwargs)
+    finally:
+        _local.job = previous
+
+
+def check_cancelled() -> None:
+    """Cooperative cancellation point; a no-op outside a job thread."""
+    job = current_job()
+    if job is not None:
+        job.check()
+
+
+def call_timeout(default: float) -> float:
+    """Network timeout for a tool call: `default`, capped by the job's remaining time."""
+    job = current_job()
+    if job is None:
+        return default
+    return max(1.0, min(default, job.remaining()))
+
+
+def cancel_job(job_id: str, reason: str = "Cancelled by user") -> bool:
+    """Flag a job for cancellation. Returns True if it is running in this process.
+
+    A job that has not started yet (still queued in the scheduler) is
+    cancelled as soon as its thread picks it up.
+    """
+    with _registry_lock:
+        job = _active.get(job_id)
+        if job is None:
+            now = time.monotonic()
+            # Jobs queued on another replica or already finished never pick theirs up
+            ttl = float(os.environ.get("CANCEL_REQUEST_TTL_S", 3600))
+            for expired in [j for j, at in _cancel_requested.items() if now - at > ttl]:
+                del _cancel_requested[expired]
+            _cancel_requested[job_id] = now
+            return False
+    job.cancel(reason)
+    return True
+
+
+def active_jobs() -> list[dict[str, Any]]:
+    """Running jobs with their remaining time, for diagnostics."""
+    with _registry_lock:
+        return [
+            {"job_id": j.job_id, "job_type": j.job_type, "remaining_s": round(j.remaining(), 1)}
+            for j in _active.values()
+        ]
+
+
+def guard_llm_calls(crew: Any) -> None:
+    """Check the calling thread's job before every LLM call of `crew`'s agents.
+
+    Every task and every tool round trip goes through an LLM call, so this
+    stops a crew between tasks and tool calls. Captures the context at wrap
+    time because CrewAI may run agents in helper threads.
+    """
+    job = current_job()
+    if job is None:
+        return
+
+    def checked(call):
+        def _call(*args, **kwargs):
+            job.check()
+            return call(*args, **kwargs)
+        return _call
+
+    seen: set[int] = set()
+    for agent in getattr(crew, "agents", []) or []:
+        llm = getattr(agent, "llm", None)
+        if llm is None or not hasattr(llm, "call") or id(llm) in seen:
+            continue
+        seen.add(id(llm))
+        # Same per-instance hook as usage.wrap_llm_call (which imports this module)
+        object.__setattr__(llm, "call", checked(llm.call))
+
+
+def run_with_deadline(job_type: str, on_timeout=None):
+    """Decorator for `run_*_job(job_id)` functions.
+
+    Registers the job's context for the duration of the call and arms a timer
+    that calls `on_timeout(job_id, reason)` at the deadline. A JobCancelled
+    raised inside the job is absorbed: a user cancellation was already
+    recorded by the DELETE endpoint, and a timeout is reported once.
+    """
+    def decorator(run):
+        @functools.wraps(run)
+        def wrapper(job_id: str) -> None:
+            job = JobContext(job_id, job_type, job_timeout(job_type))
+            with _registry_lock:
+                _active[job_id] = job
+                if _cancel_requested.pop(job_id, None) is not None:
+                    job.cancel()
+            reported = threading.Event()
+
+            def report_timeout():
+                if on_timeout is None or reported.is_set():
+                    return
+                reported.set()
+                try:
+                    on_timeout(job_id, job.reason)
+                except Exception as e:
+                    print(f"[Job {job_id}] Failed to record timeout: {e}")
+
+            def expire():
+                job.cancel(f"Timed out after {job.timeout:.0f}s", timed_out=True)
+                report_timeout()
+
+            timer = threading.Timer(job.timeout, expire)
+            timer.daemon = True
+            timer.start()
+            _local.job = job
+            try:
+                job.check()
+                run(job_id)
+            except JobCancelled as e:
+                print(f"[{job_type} Job {job_id}] Stopped: {e.reason}")
+                if e.timed_out:
+                    report_timeout()
+            finally:
+                timer.cancel()
+                _local.job = None
+                with _registry_lock:
+                    _active.pop(job_id, None)
+        return wrapper
+    return decorator
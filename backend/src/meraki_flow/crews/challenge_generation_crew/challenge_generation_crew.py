@@ -48,13 +48,11 @@ class ChallengeGenerationCrew:
         """Log output metadata and scoring to Opik after crew execution."""
         if OPIK_AVAILABLE:
             try:
-                import re
+                from meraki_flow.models import GeneratedChallenge
+                from meraki_flow.opik_metrics import ChallengeCalibrationMetric, parse_field
                 raw = output.raw if hasattr(output, 'raw') else str(output)
-                # Extract difficulty from output JSON
-                diff_match = re.search(r'"difficulty"\s*:\s*"(\w+)"', raw)
-                difficulty = diff_match.group(1) if diff_match else "medium"
+                difficulty = parse_field(getattr(output, 'pydantic', None) or raw, GeneratedChallenge, "difficulty")
                 session_count = int(getattr(self, '_scoring_inputs', {}).get("session_count", 0))
-                from meraki_flow.opik_metrics import ChallengeCalibrationMetric
                 result = ChallengeCalibrationMetric().score(difficulty=difficulty, session_count=session_count)
                 opik_context.update_current_trace(
                     metadata={"crew_completed": "challenge_generation", "result_type": type(output).__name__},
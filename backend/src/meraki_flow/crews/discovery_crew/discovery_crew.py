@@ -3,6 +3,14 @@ from crewai.project import CrewBase, agent, crew, task, before_kickoff, after_ki
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 
+from meraki_flow.models import DiscoveryResult
+
+# Used when no embedding index narrowed the candidates for rank_hobbies_task
+DEFAULT_CANDIDATE_HOBBIES = (
+    "pottery, watercolor, drawing, knitting, crochet, photography, creative-writing, "
+    "digital-art, woodworking, container-gardening, herb-garden, houseplants"
+)
+
 try:
     from opik import opik_context
     OPIK_AVAILABLE = True
@@ -20,6 +28,8 @@ class DiscoveryCrew:
     @before_kickoff
     def log_inputs(self, inputs: dict):
         """Log input metadata to Opik before crew execution."""
+        if inputs is not None and not inputs.get("candidate_hobbies"):
+            inputs["candidate_hobbies"] = DEFAULT_CANDIDATE_HOBBIES
         if OPIK_AVAILABLE:
             try:
                 opik_context.update_current_trace(
@@ -83,3 +93,42 @@ class DiscoveryCrew:
             process=Process.sequential,
             verbose=True,
         )
+
+    def reasoning_crew(self) -> Crew:
+        """Single-task crew that only writes reasoning for engine-ranked matches.
+
+        Not decorated with @task/@crew so the full three-task crew is unchanged.
+        """
+        agent = self.discovery_agent()
+        return Crew(
+            agents=[agent],
+            tasks=[
+                Task(
+                    config=self.tasks_config['write_match_reasoning_task'],
+                    agent=agent,
+                    output_pydantic=DiscoveryResult,
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def fast_crew(self) -> Crew:
+        """Single-task crew that analyzes, ranks and writes recommendations in one LLM call.
+
+        Same output shape as the full crew, without re-sending the profile
+        across three sequential tasks.
+        """
+        agent = self.discovery_agent()
+        return Crew(
+            agents=[agent],
+            tasks=[
+                Task(
+                    config=self.tasks_config['match_hobbies_fast_task'],
+                    agent=agent,
+                    output_pydantic=DiscoveryResult,
+                )
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
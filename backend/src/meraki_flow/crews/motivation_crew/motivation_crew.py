@@ -48,13 +48,11 @@ class MotivationCrew:
         """Log output metadata and scoring to Opik after crew execution."""
         if OPIK_AVAILABLE:
             try:
-                import re
+                from meraki_flow.models import MotivationNudge
+                from meraki_flow.opik_metrics import NudgeUrgencyCalibrationMetric, parse_field
                 raw = output.raw if hasattr(output, 'raw') else str(output)
-                # Extract urgency from output JSON
-                urgency_match = re.search(r'"urgency"\s*:\s*"(\w+)"', raw)
-                urgency = urgency_match.group(1) if urgency_match else "check_in"
+                urgency = parse_field(getattr(output, 'pydantic', None) or raw, MotivationNudge, "urgency")
                 days = int(getattr(self, '_scoring_inputs', {}).get("days_since_last_session", 3))
-                from meraki_flow.opik_metrics import NudgeUrgencyCalibrationMetric
                 result = NudgeUrgencyCalibrationMetric().score(urgency=urgency, days_since_last_session=days)
                 opik_context.update_current_trace(
                     metadata={"crew_completed": "motivation", "result_type": type(output).__name__},
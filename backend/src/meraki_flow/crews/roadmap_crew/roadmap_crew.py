@@ -47,9 +47,12 @@ class RoadmapCrew:
         """Log output metadata and scoring to Opik after crew execution."""
         if OPIK_AVAILABLE:
             try:
-                raw = output.raw if hasattr(output, 'raw') else str(output)
+                from meraki_flow.models import GeneratedRoadmap
                 from meraki_flow.opik_metrics import RoadmapCompletenessMetric
-                result = RoadmapCompletenessMetric().score(output=raw)
+                roadmap = getattr(output, 'pydantic', None)
+                if not isinstance(roadmap, GeneratedRoadmap):
+                    roadmap = output.raw if hasattr(output, 'raw') else str(output)
+                result = RoadmapCompletenessMetric().score(output=roadmap)
                 opik_context.update_current_trace(
                     metadata={"crew_completed": "roadmap", "result_type": type(output).__name__},
                     feedback_scores=[{"name": result.name, "value": result.value, "reason": result.reason}],
@@ -101,3 +101,27 @@ class SamplingPreviewCrew:
             process=Process.sequential,
             verbose=True,
         )
+
+    def personalization_crew(self) -> Crew:
+        """Recommendation + micro activity only, for when curated videos come from the shared hobby cache.
+
+        Not decorated with @task/@crew so the full three-task crew is unchanged.
+        """
+        agent = self.sampling_preview_agent()
+        return Crew(
+            agents=[agent],
+            tasks=[
+                Task(
+                    config=self.tasks_config['recommend_sampling_path_task'],
+                    agent=agent,
+                    output_pydantic=SamplingRecommendation,
+                ),
+                Task(
+                    config=self.tasks_config['generate_micro_activity_task'],
+                    agent=agent,
+                    output_pydantic=MicroActivity,
+                ),
+            ],
+            process=Process.sequential,
+            verbose=True,
+        )
@@ -0,0 +1,137 @@
+"""
+A/B comparison of discovery modes (engine / fast / crew).
+
+Runs every item of the discovery dataset through each mode and reports
+quality (HobbyMatchDiversityMetric), latency and token usage side by side,
+so latency-sensitive traffic can be routed to the cheapest mode that holds
+up on quality.
+
+Usage:
+    python -m meraki_flow.evaluation.compare_discovery_modes                      # all modes
+    python -m meraki_flow.evaluation.compare_discovery_modes --modes fast crew    # subset
+    python -m meraki_flow.evaluation.compare_discovery_modes --limit 3            # quick run
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).resolve().parent.parent.parent.parent / ".env")
+
+import opik
+
+from meraki_flow.discovery_modes import DISCOVERY_MODES, run_discovery
+from meraki_flow.opik_metrics import HobbyMatchDiversityMetric
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+DATASET_NAME = "meraki-eval-discovery"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_mode(mode: str, items: list[dict]) -> dict:
+    """Run every dataset item through `mode` and return per-item and aggregate stats."""
+    metric = HobbyMatchDiversityMetric()
+    runs = []
+
+    print(f"\n=== Discovery mode: {mode} ===")
+    for i, item in enumerate(items):
+        crew_inputs = dict(item.get("metadata", {}).get("crew_inputs", {}))
+        label = f"eval-{mode}-{i}"
+        start = time.perf_counter()
+        try:
+            parsed, usage = run_discovery(label, crew_inputs, mode)
+        except Exception as e:
+            print(f"  [{i}] FAILED: {e}")
+            runs.append({"item": i, "error": str(e)})
+            continue
+        latency = time.perf_counter() - start
+
+        score = metric.score(output=json.dumps(parsed))
+        runs.append({
+            "item": i,
+            "latency_s": round(latency, 3),
+            "total_tokens": usage.get("total_tokens", 0),
+            "llm_calls": usage.get("llm_calls", 0),
+            "estimated_cost_usd": usage.get("estimated_cost_usd", 0.0),
+            "diversity": score.value,
+            "matches": [m.get("hobby_slug") for m in parsed.get("matches", [])],
+        })
+        print(f"  [{i}] {latency:.1f}s, diversity={score.value:.2f}, tokens={usage.get('total_tokens', 0)}")
+
+    ok = [r for r in runs if "error" not in r]
+    summary = {"mode": mode, "items": len(runs), "failed": len(runs) - len(ok), "runs": runs}
+    if ok:
+        latencies = [r["latency_s"] for r in ok]
+        summary.update({
+            "diversity_mean": round(statistics.mean(r["diversity"] for r in ok), 3),
+            "latency_mean_s": round(statistics.mean(latencies), 3),
+            "latency_p50_s": round(_percentile(latencies, 50), 3),
+            "latency_p95_s": round(_percentile(latencies, 95), 3),
+            "tokens_mean": round(statistics.mean(r["total_tokens"] for r in ok), 1),
+            "llm_calls_mean": round(statistics.mean(r["llm_calls"] for r in ok), 2),
+            "cost_total_usd": round(sum(r["estimated_cost_usd"] for r in ok), 6),
+        })
+    return summary
+
+
+def save_results(results: list[dict]) -> Path:
+    """Save the comparison to timestamped JSON."""
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    filepath = RESULTS_DIR / f"discovery_modes_{ts}.json"
+
+    with open(filepath, "w") as f:
+        json.dump({
+            "dataset": DATASET_NAME,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "modes": results,
+        }, f, indent=2, default=str)
+
+    print(f"\nResults saved to: {filepath}")
+    return filepath
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare discovery modes on quality and latency")
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=list(DISCOVERY_MODES),
+        default=list(DISCOVERY_MODES),
+        help="Discovery modes to compare",
+    )
+    parser.add_argument("--limit", type=int, default=0, help="Only use the first N dataset items")
+    args = parser.parse_args()
+
+    opik.configure(use_local=False)
+    items = opik.Opik().get_dataset(name=DATASET_NAME).get_items()
+    if args.limit:
+        items = items[:args.limit]
+    print(f"Dataset: {DATASET_NAME} ({len(items)} items)")
+
+    results = [run_mode(mode, items) for mode in args.modes]
+    save_results(results)
+
+    print("\n" + "=" * 72)
+    print("DISCOVERY MODE COMPARISON")
+    print("=" * 72)
+    print(f"  {'mode':<8} {'diversity':>9} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} {'tokens':>8} {'failed':>7}")
+    for r in results:
+        if "latency_mean_s" not in r:
+            print(f"  {r['mode']:<8} all {r['failed']} runs failed")
+            continue
+        print(f"  {r['mode']:<8} {r['diversity_mean']:>9.2f} {r['latency_mean_s']:>8.1f} "
+              f"{r['latency_p50_s']:>8.1f} {r['latency_p95_s']:>8.1f} {r['tokens_mean']:>8.0f} {r['failed']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Idempotent Opik dataset syncing.
+
+Items are identified by a hash of their content. A sync compares the local
+item definitions with what the remote dataset holds, deletes remote items that
+no longer exist locally (removed or edited), and inserts only new or changed
+items, in bulk batches.
+
+A local manifest (evaluation/cache/dataset_manifest.json) remembers the item
+hashes of the last successful sync per dataset, so when nothing has changed
+the sync skips downloading remote items entirely. The skip also requires the
+remote item count to match, so items added or deleted on the server (UI,
+another machine) trigger a full comparison.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from meraki_flow.evaluation import local_cache
+
+BATCH_SIZE = 100
+
+
+def manifest_path() -> Path:
+    return local_cache.CACHE_DIR / "dataset_manifest.json"
+
+
+def item_hash(item: dict[str, Any]) -> str:
+    """Content hash of a dataset item; ignores the server-assigned id."""
+    content = {k: v for k, v in item.items() if k != "id"}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def load_manifest() -> dict[str, Any]:
+    path = manifest_path()
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: dict[str, Any]) -> None:
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    tmp.replace(path)
+
+
+def _batches(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def sync_dataset(
+    client,
+    name: str,
+    items: list[dict[str, Any]],
+    description: str = "",
+    reset: bool = False,
+    batch_size: int = BATCH_SIZE,
+):
+    """Make the Opik dataset `name` hold exactly `items`, uploading only the difference.
+
+    With `reset`, the dataset is deleted and fully re-uploaded.
+    Returns the dataset.
+    """
+    local = {item_hash(item): item for item in items}
+    manifest = load_manifest()
+
+    if reset:
+        try:
+            client.delete_dataset(name=name)
+        except Exception:
+            pass
+        manifest.pop(name, None)
+
+    dataset = client.get_or_create_dataset(name=name, description=description)
+
+    unchanged = set(manifest.get(name, {}).get("hashes", [])) == set(local)
+    # None when the server doesn't report a count: compare items to be safe
+    remote_count = getattr(dataset, "dataset_items_count", None)
+    if not reset and unchanged and remote_count == len(local):
+        print(f"  {name}: {len(local)} items unchanged, nothing to upload")
+        return dataset
+
+    remote: dict[str, list[str]] = {}
+    for remote_item in ([] if reset else dataset.get_items()):
+        remote.setdefault(item_hash(remote_item), []).append(remote_item["id"])
+
+    stale = [item_id for h, ids in remote.items() if h not in local for item_id in ids]
+    # Duplicate uploads of the same item (e.g. from older insert-everything runs)
+    stale += [item_id for h, ids in remote.items() if h in local for item_id in ids[1:]]
+    new = [item for h, item in local.items() if h not in remote]
+
+    for batch in _batches(stale, batch_size):
+        dataset.delete(batch)
+    for batch in _batches(new, batch_size):
+        dataset.insert(batch)
+
+    manifest[name] = {
+        "hashes": sorted(local),
+        "synced_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _save_manifest(manifest)
+    print(f"  {name}: {len(new)} uploaded, {len(stale)} removed, "
+          f"{len(local) - len(new)} unchanged")
+    return dataset
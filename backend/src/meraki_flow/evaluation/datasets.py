@@ -8,9 +8,10 @@ IMPORTANT: Each dataset item's crew_inputs must contain ALL template variables
 expected by the crew's tasks.yaml, otherwise CrewAI will raise a missing variable error.
 
 Usage:
-    python -m meraki_flow.evaluation.datasets              # create all
+    python -m meraki_flow.evaluation.datasets              # create all / upload only changed items
     python -m meraki_flow.evaluation.datasets --only discovery challenges
     python -m meraki_flow.evaluation.datasets --reset      # delete + recreate
+    python -m meraki_flow.evaluation.datasets --export-local   # write the local JSONL cache (no network)
 """
 
 import argparse
@@ -23,6 +24,8 @@ load_dotenv(Path(__file__).resolve().parent.parent.parent.parent / ".env")
 
 import opik
 
+from meraki_flow.evaluation.dataset_sync import sync_dataset
+
 
 def _get_client() -> opik.Opik:
     opik.configure(use_local=False)
@@ -33,21 +36,9 @@ def _get_client() -> opik.Opik:
 # Dataset definitions
 # ---------------------------------------------------------------------------
 
-def create_discovery_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Discovery crew expects q1-q22 template variables."""
-    name = "meraki-eval-discovery"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for DiscoveryCrew — hobby recommendation quality",
-    )
-
-    dataset.insert([
+def discovery_items() -> list[dict]:
+    """Dataset items for meraki-eval-discovery."""
+    return [
         {
             "input": "Budget-limited solo creative seeking stress relief in small apartment",
             "expected_output": (
@@ -259,26 +250,23 @@ def create_discovery_dataset(client: opik.Opik, reset: bool = False) -> opik.Dat
                 },
             },
         },
-    ])
-
-    return dataset
+    ]
 
 
-def create_sampling_preview_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Sampling preview crew expects: hobby_name, quiz_answers."""
-    name = "meraki-eval-sampling-preview"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for SamplingPreviewCrew — preview content quality",
+def create_discovery_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Discovery crew expects q1-q22 template variables."""
+    return sync_dataset(
+        client,
+        "meraki-eval-discovery",
+        discovery_items(),
+        description="Evaluation dataset for DiscoveryCrew — hobby recommendation quality",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def sampling_preview_items() -> list[dict]:
+    """Dataset items for meraki-eval-sampling-preview."""
+    return [
         {
             "input": "Watercolor painting beginner who prefers video learning",
             "expected_output": (
@@ -354,26 +342,23 @@ def create_sampling_preview_dataset(client: opik.Opik, reset: bool = False) -> o
                 },
             },
         },
-    ])
+    ]
 
-    return dataset
 
-
-def create_local_experiences_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Local experiences crew expects: hobby_name, location."""
-    name = "meraki-eval-local-experiences"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for LocalExperiencesCrew — local spot discovery",
+def create_sampling_preview_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Sampling preview crew expects: hobby_name, quiz_answers."""
+    return sync_dataset(
+        client,
+        "meraki-eval-sampling-preview",
+        sampling_preview_items(),
+        description="Evaluation dataset for SamplingPreviewCrew — preview content quality",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def local_experiences_items() -> list[dict]:
+    """Dataset items for meraki-eval-local-experiences."""
+    return [
         {
             "input": "Pottery in New York, NY",
             "expected_output": (
@@ -422,26 +407,23 @@ def create_local_experiences_dataset(client: opik.Opik, reset: bool = False) ->
                 "crew_inputs": {"hobby_name": "calligraphy", "location": "Paris, France"},
             },
         },
-    ])
-
-    return dataset
+    ]
 
 
-def create_practice_feedback_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Practice feedback crew expects: hobby_name, session_type, duration, mood, notes, recent_sessions, completed_challenges, image_url."""
-    name = "meraki-eval-practice-feedback"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for PracticeFeedbackCrew — session feedback quality",
+def create_local_experiences_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Local experiences crew expects: hobby_name, location."""
+    return sync_dataset(
+        client,
+        "meraki-eval-local-experiences",
+        local_experiences_items(),
+        description="Evaluation dataset for LocalExperiencesCrew — local spot discovery",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def practice_feedback_items() -> list[dict]:
+    """Dataset items for meraki-eval-practice-feedback."""
+    return [
         {
             "input": "Beginner watercolor session — first time mixing colors",
             "expected_output": (
@@ -547,26 +529,23 @@ def create_practice_feedback_dataset(client: opik.Opik, reset: bool = False) ->
                 },
             },
         },
-    ])
-
-    return dataset
+    ]
 
 
-def create_challenges_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Challenge generation crew expects: hobby_name, session_count, avg_duration, mood_distribution, days_active, completed_challenges, skipped_challenges, recent_feedback, last_mood_trend."""
-    name = "meraki-eval-challenges"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for ChallengeGenerationCrew — challenge calibration",
+def create_practice_feedback_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Practice feedback crew expects: hobby_name, session_type, duration, mood, notes, recent_sessions, completed_challenges, image_url."""
+    return sync_dataset(
+        client,
+        "meraki-eval-practice-feedback",
+        practice_feedback_items(),
+        description="Evaluation dataset for PracticeFeedbackCrew — session feedback quality",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def challenges_items() -> list[dict]:
+    """Dataset items for meraki-eval-challenges."""
+    return [
         {
             "input": "Early watercolor learner with improving mood",
             "expected_output": json.dumps({
@@ -699,26 +678,23 @@ def create_challenges_dataset(client: opik.Opik, reset: bool = False) -> opik.Da
                 },
             },
         },
-    ])
+    ]
 
-    return dataset
 
-
-def create_motivation_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Motivation crew expects: hobby_name, days_since_last_session, recent_moods, challenge_skip_rate, current_streak, longest_streak, session_frequency_trend."""
-    name = "meraki-eval-motivation"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for MotivationCrew — nudge urgency calibration",
+def create_challenges_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Challenge generation crew expects: hobby_name, session_count, avg_duration, mood_distribution, days_active, completed_challenges, skipped_challenges, recent_feedback, last_mood_trend."""
+    return sync_dataset(
+        client,
+        "meraki-eval-challenges",
+        challenges_items(),
+        description="Evaluation dataset for ChallengeGenerationCrew — challenge calibration",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def motivation_items() -> list[dict]:
+    """Dataset items for meraki-eval-motivation."""
+    return [
         {
             "input": "Active guitarist on a 5-day streak",
             "expected_output": json.dumps({
@@ -814,26 +790,23 @@ def create_motivation_dataset(client: opik.Opik, reset: bool = False) -> opik.Da
                 },
             },
         },
-    ])
+    ]
 
-    return dataset
 
-
-def create_roadmap_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
-    """Roadmap crew expects: hobby_name, session_count, avg_duration, days_active, completed_challenges, user_goals."""
-    name = "meraki-eval-roadmap"
-    if reset:
-        try:
-            client.delete_dataset(name=name)
-        except Exception:
-            pass
-
-    dataset = client.get_or_create_dataset(
-        name=name,
-        description="Evaluation dataset for RoadmapCrew — learning path structure",
+def create_motivation_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Motivation crew expects: hobby_name, days_since_last_session, recent_moods, challenge_skip_rate, current_streak, longest_streak, session_frequency_trend."""
+    return sync_dataset(
+        client,
+        "meraki-eval-motivation",
+        motivation_items(),
+        description="Evaluation dataset for MotivationCrew — nudge urgency calibration",
+        reset=reset,
     )
 
-    dataset.insert([
+
+def roadmap_items() -> list[dict]:
+    """Dataset items for meraki-eval-roadmap."""
+    return [
         {
             "input": "Complete watercolor beginner wanting to learn basics",
             "expected_output": (
@@ -910,9 +883,18 @@ def create_roadmap_dataset(client: opik.Opik, reset: bool = False) -> opik.Datas
                 },
             },
         },
-    ])
+    ]
 
-    return dataset
+
+def create_roadmap_dataset(client: opik.Opik, reset: bool = False) -> opik.Dataset:
+    """Roadmap crew expects: hobby_name, session_count, avg_duration, days_active, completed_challenges, user_goals."""
+    return sync_dataset(
+        client,
+        "meraki-eval-roadmap",
+        roadmap_items(),
+        description="Evaluation dataset for RoadmapCrew — learning path structure",
+        reset=reset,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -929,6 +911,16 @@ DATASET_CREATORS = {
     "roadmap": create_roadmap_dataset,
 }
 
+DATASET_ITEMS = {
+    "discovery": discovery_items,
+    "sampling_preview": sampling_preview_items,
+    "local_experiences": local_experiences_items,
+    "practice_feedback": practice_feedback_items,
+    "challenges": challenges_items,
+    "motivation": motivation_items,
+    "roadmap": roadmap_items,
+}
+
 
 def create_all_datasets(only: list[str] | None = None, reset: bool = False):
     client = _get_client()
@@ -939,11 +931,21 @@ def create_all_datasets(only: list[str] | None = None, reset: bool = False):
         if not creator:
             print(f"[WARN] Unknown dataset: {name}, skipping")
             continue
-        print(f"Creating dataset: meraki-eval-{name} ...")
-        ds = creator(client, reset=reset)
-        print(f"  -> {ds.name} ready")
+        print(f"Syncing dataset: meraki-eval-{name} ...")
+        creator(client, reset=reset)
 
-    print("\nAll evaluation datasets created successfully.")
+    print("\nAll evaluation datasets are up to date.")
+
+
+def export_local_datasets(only: list[str] | None = None) -> None:
+    """Materialize dataset items into the local JSONL cache for offline evaluation."""
+    from meraki_flow.evaluation.local_cache import save_dataset
+
+    targets = only or list(DATASET_ITEMS.keys())
+    for name in targets:
+        items = DATASET_ITEMS[name]()
+        path = save_dataset(name, items)
+        print(f"Exported {len(items)} items for {name} -> {path}")
 
 
 # ---------------------------------------------------------------------------
@@ -963,8 +965,17 @@ def main():
         action="store_true",
         help="Delete and recreate datasets (destructive)",
     )
+    parser.add_argument(
+        "--export-local",
+        action="store_true",
+        help="Write datasets to the local JSONL cache instead of Opik",
+    )
     args = parser.parse_args()
 
+    if args.export_local:
+        export_local_datasets(only=args.only)
+        return
+
     create_all_datasets(only=args.only, reset=args.reset)
 
 
@@ -0,0 +1,144 @@
+"""
+Local JSONL cache for evaluation datasets and crew outputs.
+
+Datasets are materialized from the item definitions in datasets.py, and crew
+outputs are recorded during online evaluation runs. Together they let the
+heuristic metrics run fully offline for fast regression checks.
+
+Layout:
+    evaluation/cache/datasets/<crew>.jsonl   one dataset item per line
+    evaluation/cache/outputs/<crew>.jsonl    {"item_key", "config_hash", "input", "output"} per line
+
+Outputs are keyed by the dataset item's crew inputs *and* a hash of
+everything that shapes the crew's prompts (its configs and code, the shared
+output schemas, the tools it imports and the configured model), so a recorded
+output is only reused while none of them has changed.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR = Path(os.environ.get(
+    "MERAKI_EVAL_CACHE_DIR", Path(__file__).resolve().parent / "cache"
+))
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+# Every crew's output_pydantic schemas; CrewAI renders them into the prompt
+SHARED_SOURCES = ["models.py"]
+# Where CrewAI reads the default model when agents don't set one
+MODEL_ENV_VARS = ["OPENAI_MODEL_NAME", "MODEL"]
+_TOOL_IMPORT_RE = re.compile(r"meraki_flow\.tools\.(\w+)")
+
+_write_lock = threading.Lock()
+
+
+def dataset_path(crew_name: str) -> Path:
+    return CACHE_DIR / "datasets" / f"{crew_name}.jsonl"
+
+
+def outputs_path(crew_name: str) -> Path:
+    return CACHE_DIR / "outputs" / f"{crew_name}.jsonl"
+
+
+def read_jsonl(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_jsonl(path: Path, rows: list[dict[str, Any]]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".jsonl.tmp")
+    with open(tmp, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row, default=str) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def item_key(dataset_item: dict[str, Any]) -> str:
+    """Stable key for a dataset item, derived from its crew inputs."""
+    crew_inputs = dataset_item.get("metadata", {}).get("crew_inputs", {})
+    payload = json.dumps(crew_inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def crew_config_hash(crew_dir: Path) -> str:
+    """Hash a crew's YAML configs, Python sources and what they depend on.
+
+    Also covers the shared output schemas (models.py), the tool modules the
+    crew imports and the configured model. Any prompt, schema, tool, model or
+    crew-wiring change produces a new hash, which invalidates previously
+    recorded outputs for that crew.
+    """
+    digest = hashlib.sha256()
+    crew_files = sorted(crew_dir.glob("config/*.yaml")) + sorted(crew_dir.glob("*.py"))
+    tools = sorted({
+        name
+        for path in crew_files if path.suffix == ".py"
+        for name in _TOOL_IMPORT_RE.findall(path.read_text())
+    })
+    for path in crew_files:
+        digest.update(path.relative_to(crew_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    shared = SHARED_SOURCES + [f"tools/{name}.py" for name in tools]
+    for name in shared:
+        path = PACKAGE_DIR / name
+        digest.update(name.encode())
+        digest.update(path.read_bytes() if path.exists() else b"")
+    for var in MODEL_ENV_VARS:
+        digest.update(f"{var}={os.environ.get(var, '')}".encode())
+    return digest.hexdigest()[:16]
+
+
+def save_dataset(crew_name: str, items: list[dict[str, Any]]) -> Path:
+    return write_jsonl(dataset_path(crew_name), items)
+
+
+def load_dataset(crew_name: str) -> list[dict[str, Any]]:
+    """Load cached dataset items; raises if the cache hasn't been exported."""
+    path = dataset_path(crew_name)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"No local dataset for {crew_name} at {path}. "
+            "Run: python -m meraki_flow.evaluation.datasets --export-local"
+        )
+    return read_jsonl(path)
+
+
+def record_output(
+    crew_name: str,
+    dataset_item: dict[str, Any],
+    output: str,
+    config_hash: str = "",
+) -> None:
+    """Append one crew output to the outputs cache (thread-safe)."""
+    path = outputs_path(crew_name)
+    row = {
+        "item_key": item_key(dataset_item),
+        "config_hash": config_hash,
+        "input": dataset_item.get("input", ""),
+        "output": output,
+    }
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(row, default=str) + "\n")
+
+
+def load_outputs(crew_name: str, config_hash: str | None = None) -> dict[str, str]:
+    """Return {item_key: output}; later recordings win over earlier ones.
+
+    With `config_hash`, only outputs recorded under that crew config are returned.
+    """
+    return {
+        row["item_key"]: row["output"]
+        for row in read_jsonl(outputs_path(crew_name))
+        if config_hash is None or row.get("config_hash", "") == config_hash
+    }
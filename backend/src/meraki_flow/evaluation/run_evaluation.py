@@ -8,12 +8,19 @@ Usage:
     python -m meraki_flow.evaluation.run_evaluation                        # all crews
     python -m meraki_flow.evaluation.run_evaluation --only discovery       # single crew
     python -m meraki_flow.evaluation.run_evaluation --heuristic-only       # skip LLM judges
+    python -m meraki_flow.evaluation.run_evaluation --workers 4 --task-threads 2 --rate-limit 20
+    python -m meraki_flow.evaluation.run_evaluation --offline              # heuristic metrics on cached outputs
+    python -m meraki_flow.evaluation.run_evaluation --replay               # reuse outputs unless prompts/inputs changed
+    python -m meraki_flow.evaluation.run_evaluation --llm-cache            # serve repeated LLM calls from disk
 """
 
 import argparse
 import json
-import re
+import os
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -24,6 +31,9 @@ import opik
 from opik.evaluation import evaluate
 from opik.evaluation.metrics import base_metric, score_result
 
+from meraki_flow.evaluation import local_cache
+from meraki_flow.llm_cache import cache_crew_llm_calls, get_llm_cache, install_llm_cache
+from meraki_flow.models import GeneratedChallenge, MotivationNudge
 from meraki_flow.opik_metrics import (
     HobbyMatchDiversityMetric,
     SamplingCompletenessMetric,
@@ -32,9 +42,11 @@ from meraki_flow.opik_metrics import (
     ChallengeCalibrationMetric,
     NudgeUrgencyCalibrationMetric,
     RoadmapCompletenessMetric,
+    parse_field,
 )
 
 RESULTS_DIR = Path(__file__).resolve().parent / "results"
+CREWS_DIR = Path(__file__).resolve().parent.parent / "crews"
 
 
 # ---------------------------------------------------------------------------
@@ -42,40 +54,35 @@ RESULTS_DIR = Path(__file__).resolve().parent / "results"
 # ---------------------------------------------------------------------------
 
 class ChallengeCalibrationAdapter(base_metric.BaseMetric):
-    """Wraps ChallengeCalibrationMetric to extract fields from raw output + metadata."""
+    """Wraps ChallengeCalibrationMetric to read the parsed challenge + metadata."""
 
     def __init__(self):
         super().__init__(name="challenge_calibration")
         self._inner = ChallengeCalibrationMetric()
 
     def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        # Extract difficulty from output JSON
-        diff_match = re.search(r'"difficulty"\s*:\s*"(\w+)"', output)
-        difficulty = diff_match.group(1) if diff_match else "medium"
-
         # Extract session_count from metadata (passed via reference_dataset_item)
         metadata = kwargs.get("metadata", {})
         crew_inputs = metadata.get("crew_inputs", {})
         session_count = int(crew_inputs.get("session_count", 0))
 
+        difficulty = parse_field(output, GeneratedChallenge, "difficulty")
         return self._inner.score(difficulty=difficulty, session_count=session_count)
 
 
 class NudgeUrgencyAdapter(base_metric.BaseMetric):
-    """Wraps NudgeUrgencyCalibrationMetric to extract fields from raw output + metadata."""
+    """Wraps NudgeUrgencyCalibrationMetric to read the parsed nudge + metadata."""
 
     def __init__(self):
         super().__init__(name="nudge_urgency_calibration")
         self._inner = NudgeUrgencyCalibrationMetric()
 
     def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        urgency_match = re.search(r'"urgency"\s*:\s*"(\w+)"', output)
-        urgency = urgency_match.group(1) if urgency_match else "check_in"
-
         metadata = kwargs.get("metadata", {})
         crew_inputs = metadata.get("crew_inputs", {})
         days = int(crew_inputs.get("days_since_last_session", 3))
 
+        urgency = parse_field(output, MotivationNudge, "urgency")
         return self._inner.score(urgency=urgency, days_since_last_session=days)
 
 
@@ -85,6 +92,14 @@ class NudgeUrgencyAdapter(base_metric.BaseMetric):
 # every template variable the crew's tasks.yaml expects.
 # ---------------------------------------------------------------------------
 
+def _kickoff(crew, crew_inputs: dict):
+    """Kick off a crew, serving its agents' LLM calls from the local cache when enabled."""
+    cache = get_llm_cache()
+    if cache is not None:
+        cache_crew_llm_calls(crew, cache)
+    return crew.kickoff(inputs=crew_inputs)
+
+
 def _extract_inputs(dataset_item: dict) -> tuple[dict, dict]:
     """Extract crew_inputs and metadata from a dataset item."""
     metadata = dataset_item.get("metadata", {})
@@ -96,7 +111,7 @@ def _run_discovery_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.discovery_crew.discovery_crew import DiscoveryCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = DiscoveryCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -105,7 +120,7 @@ def _run_sampling_preview_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.sampling_preview_crew.sampling_preview_crew import SamplingPreviewCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = SamplingPreviewCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -114,7 +129,7 @@ def _run_local_experiences_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.local_experiences_crew.local_experiences_crew import LocalExperiencesCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = LocalExperiencesCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -123,7 +138,7 @@ def _run_practice_feedback_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.practice_feedback_crew.practice_feedback_crew import PracticeFeedbackCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = PracticeFeedbackCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -132,7 +147,7 @@ def _run_challenges_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.challenge_generation_crew.challenge_generation_crew import ChallengeGenerationCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = ChallengeGenerationCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -141,7 +156,7 @@ def _run_motivation_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.motivation_crew.motivation_crew import MotivationCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = MotivationCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -150,7 +165,7 @@ def _run_roadmap_task(dataset_item: dict) -> dict:
     from meraki_flow.crews.roadmap_crew.roadmap_crew import RoadmapCrew
     crew_inputs, metadata = _extract_inputs(dataset_item)
     crew = RoadmapCrew()
-    result = crew.crew().kickoff(inputs=crew_inputs)
+    result = _kickoff(crew.crew(), crew_inputs)
     raw = result.raw if hasattr(result, 'raw') else str(result)
     return {"output": raw, "metadata": metadata}
 
@@ -173,48 +188,117 @@ EVAL_CONFIGS = {
     "discovery": {
         "dataset_name": "meraki-eval-discovery",
         "task_fn": _run_discovery_task,
+        "crew_dir": CREWS_DIR / "discovery_crew",
         "heuristic_metrics": [HobbyMatchDiversityMetric()],
         "experiment_name": "meraki-eval-discovery",
     },
     "sampling_preview": {
         "dataset_name": "meraki-eval-sampling-preview",
         "task_fn": _run_sampling_preview_task,
+        "crew_dir": CREWS_DIR / "sampling_preview_crew",
         "heuristic_metrics": [SamplingCompletenessMetric()],
         "experiment_name": "meraki-eval-sampling-preview",
     },
     "local_experiences": {
         "dataset_name": "meraki-eval-local-experiences",
         "task_fn": _run_local_experiences_task,
+        "crew_dir": CREWS_DIR / "local_experiences_crew",
         "heuristic_metrics": [LocalExperiencesCompletenessMetric()],
         "experiment_name": "meraki-eval-local-experiences",
     },
     "practice_feedback": {
         "dataset_name": "meraki-eval-practice-feedback",
         "task_fn": _run_practice_feedback_task,
+        "crew_dir": CREWS_DIR / "practice_feedback_crew",
         "heuristic_metrics": [FeedbackSpecificityMetric()],
         "experiment_name": "meraki-eval-practice-feedback",
     },
     "challenges": {
         "dataset_name": "meraki-eval-challenges",
         "task_fn": _run_challenges_task,
+        "crew_dir": CREWS_DIR / "challenge_generation_crew",
         "heuristic_metrics": [ChallengeCalibrationAdapter()],
         "experiment_name": "meraki-eval-challenges",
     },
     "motivation": {
         "dataset_name": "meraki-eval-motivation",
         "task_fn": _run_motivation_task,
+        "crew_dir": CREWS_DIR / "motivation_crew",
         "heuristic_metrics": [NudgeUrgencyAdapter()],
         "experiment_name": "meraki-eval-motivation",
     },
     "roadmap": {
         "dataset_name": "meraki-eval-roadmap",
         "task_fn": _run_roadmap_task,
+        "crew_dir": CREWS_DIR / "roadmap_crew",
         "heuristic_metrics": [RoadmapCompletenessMetric()],
         "experiment_name": "meraki-eval-roadmap",
     },
 }
 
 
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Thread-safe limiter that spaces task starts to at most `per_minute`."""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _rate_limited(task_fn, limiter: RateLimiter):
+    """Wrap a task function so every dataset item waits for a rate-limit slot."""
+    def _task(dataset_item: dict) -> dict:
+        limiter.acquire()
+        return task_fn(dataset_item)
+    return _task
+
+
+def _recorded(crew_name: str, task_fn, config_hash: str):
+    """Wrap a task function so each crew output is saved to the local outputs cache."""
+    def _task(dataset_item: dict) -> dict:
+        result = task_fn(dataset_item)
+        try:
+            local_cache.record_output(crew_name, dataset_item, result.get("output", ""), config_hash)
+        except Exception as e:
+            print(f"[WARN] Could not cache output for {crew_name}: {e}")
+        return result
+    return _task
+
+
+def _replaying(crew_name: str, task_fn, config_hash: str, stats: dict):
+    """Wrap a task function to return the recorded output when one exists.
+
+    Only items whose crew inputs or crew config changed since the recording
+    actually run the crew. `stats` collects replayed/executed counts.
+    """
+    recorded = local_cache.load_outputs(crew_name, config_hash)
+    lock = threading.Lock()
+
+    def _task(dataset_item: dict) -> dict:
+        output = recorded.get(local_cache.item_key(dataset_item))
+        with lock:
+            stats["replayed" if output is not None else "executed"] += 1
+        if output is not None:
+            return {"output": output, "metadata": dataset_item.get("metadata", {})}
+        return task_fn(dataset_item)
+    return _task
+
+
 # ---------------------------------------------------------------------------
 # Runner
 # ---------------------------------------------------------------------------
@@ -222,15 +306,28 @@ EVAL_CONFIGS = {
 def run_evaluation(
     crew_name: str,
     heuristic_only: bool = False,
+    task_threads: int = 1,
+    rate_limit: float = 0,
+    replay: bool = False,
 ) -> dict:
-    """Run evaluation for a single crew and return results summary."""
+    """Run evaluation for a single crew and return results summary.
+
+    `task_threads` dataset items run concurrently inside `evaluate()`, and
+    `rate_limit` caps how many items may start per minute (0 = unlimited).
+    With `replay`, recorded outputs for the current crew config are re-scored
+    instead of re-running the crew.
+    """
     config = EVAL_CONFIGS[crew_name]
+    started = time.perf_counter()
     client = opik.Opik()
 
     # Load dataset
     dataset = client.get_dataset(name=config["dataset_name"])
     print(f"\n=== Evaluating: {crew_name} ===")
     print(f"Dataset: {config['dataset_name']}")
+    llm_cache = install_llm_cache()
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.path}")
 
     # Build metrics list
     metrics = list(config["heuristic_metrics"])
@@ -244,12 +341,22 @@ def run_evaluation(
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     experiment_name = f"{config['experiment_name']}_{ts}"
 
+    config_hash = local_cache.crew_config_hash(config["crew_dir"])
+    task_fn = _recorded(crew_name, config["task_fn"], config_hash)
+    if rate_limit > 0:
+        # Only actual crew runs consume rate budget, not replays
+        task_fn = _rate_limited(task_fn, RateLimiter(rate_limit))
+    replay_stats = {"replayed": 0, "executed": 0}
+    if replay:
+        task_fn = _replaying(crew_name, task_fn, config_hash, replay_stats)
+
     # Run evaluation
     result = evaluate(
         dataset=dataset,
-        task=config["task_fn"],
+        task=task_fn,
         scoring_metrics=metrics,
         experiment_name=experiment_name,
+        task_threads=task_threads,
     )
 
     # Build summary
@@ -259,8 +366,17 @@ def run_evaluation(
         "dataset": config["dataset_name"],
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "heuristic_only": heuristic_only,
+        "task_threads": task_threads,
+        "rate_limit_per_minute": rate_limit,
+        "config_hash": config_hash,
         "test_results": [],
     }
+    if replay:
+        summary["replay"] = replay_stats
+        print(f"Replayed {replay_stats['replayed']} recorded outputs, ran crew for {replay_stats['executed']}")
+    if llm_cache is not None:
+        summary["llm_cache"] = llm_cache.stats()
+        print(f"LLM cache: {llm_cache.hits} hits, {llm_cache.misses} misses")
 
     if hasattr(result, 'test_results'):
         for tr in result.test_results:
@@ -269,10 +385,137 @@ def run_evaluation(
                 "scores": {s.name: s.value for s in tr.score_results} if hasattr(tr, 'score_results') else {},
             })
 
-    print(f"Evaluation complete: {experiment_name}")
+    summary["wall_time_s"] = round(time.perf_counter() - started, 1)
+    print(f"Evaluation complete: {experiment_name} ({summary['wall_time_s']}s)")
+    return summary
+
+
+def run_offline_evaluation(crew_name: str) -> dict:
+    """Score cached crew outputs with the heuristic metrics, without network access.
+
+    Uses the local dataset cache (datasets.py --export-local) and the outputs
+    recorded by previous online runs under the current crew config. Items
+    without a matching recorded output are skipped.
+    """
+    config = EVAL_CONFIGS[crew_name]
+    started = time.perf_counter()
+    items = local_cache.load_dataset(crew_name)
+    config_hash = local_cache.crew_config_hash(config["crew_dir"])
+    outputs = local_cache.load_outputs(crew_name, config_hash)
+    print(f"\n=== Offline evaluation: {crew_name} ===")
+    print(f"Dataset: {local_cache.dataset_path(crew_name)} ({len(items)} items, {len(outputs)} cached outputs)")
+
+    scored_items = []
+    skipped = 0
+    for item in items:
+        output = outputs.get(local_cache.item_key(item))
+        if output is None:
+            skipped += 1
+            continue
+        scored_items.append((item, output))
+
+    test_results = [
+        {"input": item.get("input", "")[:200], "scores": {}} for item, _ in scored_items
+    ]
+    for metric in config["heuristic_metrics"]:
+        if hasattr(metric, "score_batch"):
+            # Text-only metrics score every cached output in one call
+            results = metric.score_batch([output for _, output in scored_items])
+        else:
+            results = [metric.score(output=output, **item) for item, output in scored_items]
+        for tr, result in zip(test_results, results):
+            tr["scores"][result.name] = result.value
+
+    averages: dict[str, float] = {}
+    for tr in test_results:
+        for name, value in tr["scores"].items():
+            averages[name] = averages.get(name, 0.0) + value
+    averages = {name: round(total / len(test_results), 3) for name, total in averages.items()}
+
+    summary = {
+        "crew": crew_name,
+        "offline": True,
+        "dataset": str(local_cache.dataset_path(crew_name)),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "heuristic_only": True,
+        "config_hash": config_hash,
+        "skipped_without_output": skipped,
+        "average_scores": averages,
+        "test_results": test_results,
+        "wall_time_s": round(time.perf_counter() - started, 3),
+    }
+    print(f"Scored {len(test_results)} items, skipped {skipped}: {averages}")
     return summary
 
 
+def _evaluate_crew(
+    crew_name: str,
+    heuristic_only: bool,
+    task_threads: int,
+    rate_limit: float,
+    replay: bool = False,
+) -> dict:
+    """Evaluate one crew, turning failures into an error summary.
+
+    Module-level so it can be pickled into a worker process.
+    """
+    started = time.perf_counter()
+    try:
+        return run_evaluation(
+            crew_name,
+            heuristic_only=heuristic_only,
+            task_threads=task_threads,
+            rate_limit=rate_limit,
+            replay=replay,
+        )
+    except Exception as e:
+        print(f"\n[ERROR] Evaluation failed for {crew_name}: {e}")
+        return {
+            "crew": crew_name,
+            "error": str(e),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "wall_time_s": round(time.perf_counter() - started, 1),
+        }
+
+
+def run_all(
+    targets: list[str],
+    heuristic_only: bool = False,
+    workers: int = 1,
+    task_threads: int = 1,
+    rate_limit: float = 0,
+    replay: bool = False,
+) -> list[dict]:
+    """Evaluate crews, `workers` at a time in separate processes.
+
+    Results come back in `targets` order regardless of completion order.
+    """
+    if workers <= 1 or len(targets) <= 1:
+        return [
+            _evaluate_crew(name, heuristic_only, task_threads, rate_limit, replay)
+            for name in targets
+        ]
+
+    results: dict[str, dict] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+        futures = {
+            pool.submit(_evaluate_crew, name, heuristic_only, task_threads, rate_limit, replay): name
+            for name in targets
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed or unpicklable result)
+                results[name] = {
+                    "crew": name,
+                    "error": f"worker failed: {e}",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+    return [results[name] for name in targets]
+
+
 def save_results(all_results: list[dict]) -> Path:
     """Save evaluation results to timestamped JSON."""
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -303,24 +546,69 @@ def main():
         action="store_true",
         help="Skip LLM-judge metrics (faster, cheaper)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of crews to evaluate concurrently (separate processes)",
+    )
+    parser.add_argument(
+        "--task-threads",
+        type=int,
+        default=1,
+        help="Dataset items evaluated concurrently within each crew",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0,
+        help="Max dataset items started per minute per crew (0 = unlimited)",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Score cached outputs with heuristic metrics only, using the local dataset cache",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="Re-score recorded outputs; only re-run crews for items whose prompts or inputs changed",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        help="Serve identical LLM requests from the local response cache (same as MERAKI_LLM_CACHE=1)",
+    )
     args = parser.parse_args()
-
-    opik.configure(use_local=False)
+    if args.llm_cache:
+        # Set in the environment so worker processes pick it up too
+        os.environ["MERAKI_LLM_CACHE"] = "1"
 
     targets = args.only or list(EVAL_CONFIGS.keys())
-    all_results = []
-
-    for crew_name in targets:
-        try:
-            result = run_evaluation(crew_name, heuristic_only=args.heuristic_only)
-            all_results.append(result)
-        except Exception as e:
-            print(f"\n[ERROR] Evaluation failed for {crew_name}: {e}")
-            all_results.append({
-                "crew": crew_name,
-                "error": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            })
+    started = time.perf_counter()
+    if args.offline:
+        all_results = []
+        for crew_name in targets:
+            try:
+                all_results.append(run_offline_evaluation(crew_name))
+            except Exception as e:
+                print(f"\n[ERROR] Offline evaluation failed for {crew_name}: {e}")
+                all_results.append({
+                    "crew": crew_name,
+                    "error": str(e),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                })
+    else:
+        opik.configure(use_local=False)
+        all_results = run_all(
+            targets,
+            heuristic_only=args.heuristic_only,
+            workers=args.workers,
+            task_threads=args.task_threads,
+            rate_limit=args.rate_limit,
+            replay=args.replay,
+        )
+    total_wall_time = time.perf_counter() - started
 
     save_results(all_results)
 
@@ -333,7 +621,11 @@ def main():
             print(f"  {r['crew']}: FAILED — {r['error']}")
         else:
             n_tests = len(r.get("test_results", []))
-            print(f"  {r['crew']}: {n_tests} test cases evaluated")
+            print(f"  {r['crew']}: {n_tests} test cases evaluated in {r.get('wall_time_s', 0)}s")
+
+    crew_time = sum(r.get("wall_time_s", 0) for r in all_results)
+    print(f"\nTotal wall time: {total_wall_time:.1f}s "
+          f"(sum of per-crew time: {crew_time:.1f}s, workers={args.workers})")
 
 
 if __name__ == "__main__":
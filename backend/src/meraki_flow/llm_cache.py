@@ -0,0 +1,244 @@
+"""
+Disk-backed LLM response cache for offline optimization and evaluation runs.
+
+Identical (model, messages, params) requests are answered from a SQLite file
+instead of the provider. The file is bounded in size and evicts the least
+recently used responses first, and it is shared by every process on the
+machine, so prompt optimizers, evaluation runs and their LLM judges all reuse
+each other's paid-for calls.
+
+Off by default. Switch it on with MERAKI_LLM_CACHE=1 (or --llm-cache on the
+optimization / evaluation CLIs). Two hooks install it:
+    install_llm_cache()       wraps litellm.completion / acompletion, used by
+                              opik-optimizer and the Opik LLM-judge metrics
+    cache_crew_llm_calls()    wraps each crew agent's LLM.call, since CrewAI's
+                              native OpenAI provider does not go through LiteLLM
+
+Cached calls are not re-sent, so anything the LLM call would have triggered
+(tool executions, provider-side logging) is skipped on a hit.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from meraki_flow.usage import wrap_llm_call
+
+LLM_CACHE_PATH = Path(os.environ.get(
+    "MERAKI_LLM_CACHE_PATH",
+    Path(__file__).resolve().parent.parent.parent / ".llm_cache" / "responses.sqlite",
+))
+LLM_CACHE_MAX_MB = float(os.environ.get("MERAKI_LLM_CACHE_MAX_MB", "256"))
+
+# Request fields that don't change the response (or differ on every call)
+_IGNORED_PARAMS = {"metadata", "api_key", "api_base", "timeout", "num_retries", "stream_options"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+def llm_cache_enabled() -> bool:
+    return os.environ.get("MERAKI_LLM_CACHE", "").lower() in ("1", "true", "yes")
+
+
+def request_key(model: str, messages: Any, **params: Any) -> str:
+    """Stable key for one LLM request."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "params": {k: v for k, v in params.items() if k not in _IGNORED_PARAMS and v is not None},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite response store with size-bounded LRU eviction.
+
+    Safe to share between threads; separate processes each open their own
+    connection to the same file.
+    """
+
+    def __init__(self, path: Path = LLM_CACHE_PATH, max_mb: float = LLM_CACHE_MAX_MB):
+        self.path = Path(path)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                    (time.time(), key),
+                )
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode()), now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used rows until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "size_mb": round(size / 1024 / 1024, 2),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Return this process's cache, or None when caching is switched off."""
+    global _cache
+    if not llm_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
+
+
+def install_llm_cache() -> LLMResponseCache | None:
+    """Serve litellm.completion / acompletion from the cache when it is enabled.
+
+    Install after install_litellm_throttle so cache hits skip the rate budget.
+    """
+    cache = get_llm_cache()
+    if cache is None:
+        return None
+
+    import litellm
+
+    if getattr(litellm.completion, "_meraki_cached", False):
+        return cache
+
+    completion = litellm.completion
+    acompletion = litellm.acompletion
+
+    def _lookup(args, kwargs):
+        if kwargs.get("stream"):
+            return None, None
+        model = kwargs.get("model") or (args[0] if args else "")
+        messages = kwargs.get("messages") or (args[1] if len(args) > 1 else [])
+        params = {k: v for k, v in kwargs.items() if k not in ("model", "messages")}
+        key = request_key(model, messages, **params)
+        cached = cache.get(key)
+        return key, litellm.ModelResponse(**json.loads(cached)) if cached is not None else None
+
+    def _store(key, kwargs, response) -> None:
+        if key is not None and hasattr(response, "model_dump_json"):
+            cache.put(key, str(kwargs.get("model", "")), response.model_dump_json())
+
+    @functools.wraps(completion)
+    def cached_completion(*args, **kwargs):
+        key, hit = _lookup(args, kwargs)
+        if hit is not None:
+            return hit
+        response = completion(*args, **kwargs)
+        _store(key, kwargs, response)
+        return response
+
+    @functools.wraps(acompletion)
+    async def cached_acompletion(*args, **kwargs):
+        key, hit = _lookup(args, kwargs)
+        if hit is not None:
+            return hit
+        response = await acompletion(*args, **kwargs)
+        _store(key, kwargs, response)
+        return response
+
+    cached_completion._meraki_cached = True
+    litellm.completion = cached_completion
+    litellm.acompletion = cached_acompletion
+    return cache
+
+
+def cache_crew_llm_calls(crew: Any, cache: LLMResponseCache) -> None:
+    """Serve each agent LLM's text responses in `crew` from `cache`."""
+    seen: set[int] = set()
+
+    def cached(llm):
+        def wrapper(call):
+            def _call(messages, tools=None, *args, **kwargs):
+                response_model = kwargs.get("response_model")
+                key = request_key(
+                    str(getattr(llm, "model", "")),
+                    messages,
+                    temperature=getattr(llm, "temperature", None),
+                    tools=tools,
+                    response_model=getattr(response_model, "__name__", None),
+                )
+                hit = cache.get(key)
+                if hit is not None:
+                    return hit
+                result = call(messages, tools, *args, **kwargs)
+                if isinstance(result, str):
+                    cache.put(key, str(getattr(llm, "model", "")), result)
+                return result
+            return _call
+        return wrapper
+
+    for agent in getattr(crew, "agents", []) or []:
+        llm = getattr(agent, "llm", None)
+        if llm is None or not hasattr(llm, "call") or id(llm) in seen:
+            continue
+        seen.add(id(llm))
+        wrap_llm_call(llm, cached(llm))
@@ -0,0 +1,179 @@
+"""
+Embedding index over the hobby catalog for semantic candidate retrieval.
+
+Built offline from the `hobbies` table (slug, name, description) and saved as
+a normalized float32 matrix (.npy) plus a JSON sidecar with the slugs. At
+startup the matrix is memory-mapped, so retrieval is a single brute-force
+dot product over the catalog with no extra service to run.
+
+Usage:
+    python -m meraki_flow.matching.embedding_index            # build from Supabase
+    python -m meraki_flow.matching.embedding_index --local    # build from HOBBY_PROFILES
+"""
+
+import argparse
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from meraki_flow.matching.hobby_profiles import HOBBY_PROFILES
+
+INDEX_DIR = Path(os.environ.get(
+    "HOBBY_INDEX_DIR", Path(__file__).resolve().parent / "index"
+))
+VECTORS_FILE = "hobby_embeddings.npy"
+META_FILE = "hobby_index.json"
+EMBEDDING_MODEL = os.environ.get("HOBBY_EMBEDDING_MODEL", "text-embedding-3-small")
+
+# Quiz answers that describe *what* the user wants to make/feel, used as the query
+QUERY_KEYS = [
+    "q4_creative_type",
+    "q14_motivations",
+    "q15_resonates",
+    "q17_sensory_experience",
+    "q18_senses_to_engage",
+    "q9_practice_location",
+    "q20_seasonal_preference",
+]
+DREAM_HOBBY_KEY = "q21_dream_hobby"
+
+
+def embed_texts(texts: list[str], model: str = EMBEDDING_MODEL) -> np.ndarray:
+    """Embed texts with the OpenAI embeddings API. Returns L2-normalized float32 rows."""
+    from openai import OpenAI
+
+    resp = OpenAI().embeddings.create(model=model, input=texts)
+    vectors = np.array([d.embedding for d in resp.data], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def hobby_document(hobby: dict[str, Any]) -> str:
+    """Text that represents a hobby in the index."""
+    parts = [hobby.get("name") or hobby["slug"], hobby.get("description", "")]
+    tags = hobby.get("tags") or []
+    if tags:
+        parts.append("Qualities: " + ", ".join(tags))
+    return ". ".join(p for p in parts if p)
+
+
+def profile_query(inputs: dict[str, Any]) -> str:
+    """Text that represents a quiz profile as a retrieval query.
+
+    The free-text dream hobby goes first so it dominates short profiles.
+    """
+    parts = []
+    dream = str(inputs.get(DREAM_HOBBY_KEY, "") or "").strip()
+    if dream:
+        parts.append(f"Dream hobby: {dream}")
+    for key in QUERY_KEYS:
+        value = str(inputs.get(key, "") or "").strip()
+        if value:
+            parts.append(value)
+    return ". ".join(parts)
+
+
+def build_index(hobbies: list[dict[str, Any]], index_dir: Path = INDEX_DIR) -> Path:
+    """Embed the catalog and write vectors + metadata to `index_dir`."""
+    if not hobbies:
+        raise ValueError("Cannot build an index from an empty catalog")
+    index_dir.mkdir(parents=True, exist_ok=True)
+
+    vectors = embed_texts([hobby_document(h) for h in hobbies])
+    np.save(index_dir / VECTORS_FILE, vectors)
+    with open(index_dir / META_FILE, "w") as f:
+        json.dump({
+            "model": EMBEDDING_MODEL,
+            "hobbies": [
+                {"slug": h["slug"], "name": h.get("name", ""), "description": h.get("description", "")}
+                for h in hobbies
+            ],
+        }, f, indent=2)
+    return index_dir
+
+
+class HobbyIndex:
+    """Memory-mapped brute-force cosine index over hobby embeddings."""
+
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        with open(index_dir / META_FILE) as f:
+            meta = json.load(f)
+        self.model = meta["model"]
+        self.hobbies: list[dict[str, Any]] = meta["hobbies"]
+        self.vectors = np.load(index_dir / VECTORS_FILE, mmap_mode="r")
+        if len(self.hobbies) != self.vectors.shape[0]:
+            raise ValueError("Hobby index metadata and vectors are out of sync; rebuild the index")
+
+    def search_vector(self, query: np.ndarray, k: int) -> list[tuple[dict[str, Any], float]]:
+        scores = np.asarray(self.vectors @ query)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.hobbies[i], float(scores[i])) for i in top]
+
+    def search(self, text: str, k: int = 8) -> list[tuple[dict[str, Any], float]]:
+        """Return the k catalog hobbies closest to `text` as (hobby, cosine) pairs."""
+        return self.search_vector(embed_texts([text], model=self.model)[0], k)
+
+    def candidates_for_profile(self, inputs: dict[str, Any], k: int = 8) -> list[dict[str, Any]]:
+        query = profile_query(inputs)
+        if not query:
+            return []
+        return [hobby for hobby, _ in self.search(query, k)]
+
+
+def format_candidates(hobbies: list[dict[str, Any]]) -> str:
+    """Render candidates for the rank_hobbies_task prompt."""
+    lines = []
+    for h in hobbies:
+        description = (h.get("description") or "").strip()
+        line = f"- {h['slug']} ({h.get('name') or h['slug']})"
+        if description:
+            line += f": {description[:160]}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=1)
+def get_hobby_index() -> HobbyIndex | None:
+    """Load the index once per process; None if it hasn't been built."""
+    if not (INDEX_DIR / VECTORS_FILE).exists():
+        print(f"[HobbyIndex] No index at {INDEX_DIR}, using the full hobby list")
+        return None
+    index = HobbyIndex(INDEX_DIR)
+    print(f"[HobbyIndex] Loaded {len(index.hobbies)} hobbies ({index.model})")
+    return index
+
+
+def _local_catalog() -> list[dict[str, Any]]:
+    return [
+        {"slug": slug, "name": p["name"], "description": "", "tags": p["tags"]}
+        for slug, p in HOBBY_PROFILES.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the hobby embedding index")
+    parser.add_argument("--local", action="store_true",
+                        help="Build from the bundled HOBBY_PROFILES instead of the hobbies table")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).resolve().parent.parent.parent.parent / ".env")
+
+    if args.local:
+        hobbies = _local_catalog()
+    else:
+        from meraki_flow.db import get_hobby_catalog
+        hobbies = get_hobby_catalog()
+
+    path = build_index(hobbies)
+    print(f"Indexed {len(hobbies)} hobbies into {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Deterministic hobby-profile matching engine.
+
+Encodes the 22 discovery quiz answers into a target vector over the hobby
+FEATURES, then scores every hobby in one vectorized pass against a
+precomputed (hobbies x features) matrix. Ranking the full catalog takes
+well under a millisecond, so the LLM is only needed to phrase reasoning.
+
+Each quiz option contributes (feature, kind, target, weight) rules:
+- "max":  the hobby should demand at most `target` (time, budget, mess...)
+- "min":  the hobby should offer at least `target` (tactile, nurture...)
+- "near": the hobby should be close to `target` (social, structure...)
+"""
+
+import re
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+
+from meraki_flow.matching.hobby_profiles import FEATURES, HOBBY_PROFILES
+
+Rule = tuple[str, str, float, float]  # (feature, kind, target, weight)
+
+# Quiz option texts from frontend/src/lib/quizData.ts (lowercased, dashes
+# normalized) -> rules. Neutral options ("No preference") have no rules: they
+# count as answered but constrain nothing. Answers that match no option fall
+# back to _fallback_rules and otherwise don't count as answered.
+QUESTION_RULES: dict[str, list[tuple[str, list[Rule]]]] = {
+    "q1_time_available": [
+        ("less than 1 hour", [("time", "max", 0.2, 2.0)]),
+        ("1-3 hours", [("time", "max", 0.4, 2.0)]),
+        ("3-5 hours", [("time", "max", 0.6, 2.0)]),
+        ("5-10 hours", [("time", "max", 0.8, 2.0)]),
+        ("10+ hours", [("time", "max", 1.0, 2.0)]),
+    ],
+    "q3_session_preference": [
+        ("are easy to pause and resume", [("pausable", "min", 0.8, 1.0)]),
+        ("require dedicated focus sessions", [("pausable", "near", 0.4, 0.5)]),
+        ("no preference", []),
+    ],
+    "q4_creative_type": [
+        ("making physical objects", [("craft", "min", 1.0, 2.0)]),
+        ("creating visual art", [("visual_art", "min", 1.0, 2.0)]),
+        ("performing or sound-based expression", [("movement", "min", 0.5, 0.5), ("imagination", "min", 0.6, 0.5)]),
+        ("writing or verbal expression", [("writing", "min", 1.0, 2.0)]),
+        ("growing or nurturing living things", [("growing", "min", 1.0, 2.0)]),
+    ],
+    "q5_structure_preference": [
+        ("following clear instructions", [("structure", "min", 0.8, 0.6)]),
+        ("free experimentation", [("structure", "near", 0.4, 0.4)]),
+        ("structure with room to improvise", [("structure", "near", 0.6, 0.3)]),
+    ],
+    "q6_mess_tolerance": [
+        ("love it - part of the fun", [("mess", "max", 1.0, 1.0)]),
+        ("okay if cleanup is manageable", [("mess", "max", 0.6, 1.0)]),
+        ("prefer clean, contained activities", [("mess", "max", 0.25, 1.5)]),
+        ("depends on the situation", [("mess", "max", 0.6, 0.5)]),
+    ],
+    "q9_practice_location": [
+        ("at home, with a dedicated space", [("space", "max", 1.0, 0.5)]),
+        ("at home, packs away easily", [("space", "max", 0.35, 1.0)]),
+        ("studio or community space", [("social", "min", 0.5, 0.3)]),
+        ("outdoors", [("outdoor", "min", 0.7, 0.7)]),
+        ("anywhere works", []),
+    ],
+    "q10_social_preference": [
+        ("group classes or shared practice", [("social", "near", 0.8, 1.0)]),
+        ("solo, but sharing progress", [("social", "near", 0.4, 0.5)]),
+        ("completely solo", [("social", "max", 0.3, 1.0)]),
+        ("depends on the hobby", []),
+    ],
+    "q11_initial_budget": [
+        ("under $25", [("budget", "max", 0.15, 2.0)]),
+        ("$25-$75", [("budget", "max", 0.35, 2.0)]),
+        ("$75-$150", [("budget", "max", 0.6, 2.0)]),
+        ("$150-$300", [("budget", "max", 0.8, 2.0)]),
+        ("$300+", [("budget", "max", 1.0, 2.0)]),
+    ],
+    "q12_ongoing_costs": [
+        ("prefer one-time purchases", [("ongoing_cost", "max", 0.2, 1.0)]),
+        ("okay with occasional refills", [("ongoing_cost", "max", 0.5, 1.0)]),
+        ("fine with regular costs", [("ongoing_cost", "max", 0.8, 1.0)]),
+        ("not a concern", []),
+    ],
+    "q14_motivations": [
+        ("stress relief and mindfulness", [("meditative", "min", 0.8, 1.0)]),
+        ("a sense of accomplishment", [("useful", "min", 0.5, 0.5)]),
+        ("self-expression", [("imagination", "min", 0.7, 0.8)]),
+        ("learning new skills", [("structure", "min", 0.6, 0.3)]),
+        ("making gifts or useful items", [("useful", "min", 0.9, 1.0)]),
+        ("community connection", [("social", "min", 0.6, 0.7)]),
+    ],
+    "q15_resonates": [
+        ("i want to make beautiful things", [("visual", "min", 0.7, 0.7)]),
+        ("i want to understand how things work", [("structure", "min", 0.6, 0.5)]),
+        ("i want to express myself", [("imagination", "min", 0.7, 0.7)]),
+        ("i want to create with my hands", [("tactile", "min", 0.9, 1.0), ("craft", "min", 0.7, 0.7)]),
+        ("i want to nurture something", [("nurture", "min", 0.9, 1.5)]),
+    ],
+    "q16_learning_curve": [
+        ("i embrace it", [("learning_curve", "max", 1.0, 0.5)]),
+        ("i need early wins", [("learning_curve", "max", 0.4, 0.8)]),
+        ("i need visible progress", [("learning_curve", "max", 0.5, 0.6)]),
+        ("i struggle with perfectionism", [("learning_curve", "max", 0.5, 0.5)]),
+    ],
+    "q17_sensory_experience": [
+        ("smells of materials", [("nurture", "min", 0.5, 0.3)]),
+        ("sounds and rhythm", [("meditative", "min", 0.6, 0.4)]),
+        ("hands-on texture", [("tactile", "min", 0.9, 1.0)]),
+        ("visual focus", [("visual", "min", 0.9, 1.0)]),
+        ("repetitive, meditative motion", [("meditative", "min", 0.9, 1.0)]),
+    ],
+    "q18_senses_to_engage": [
+        ("hands / touch", [("tactile", "min", 0.8, 0.7)]),
+        ("eyes / visuals", [("visual", "min", 0.8, 0.7)]),
+        ("whole body / movement", [("movement", "min", 0.7, 0.7)]),
+        ("mind / imagination", [("imagination", "min", 0.8, 0.7)]),
+        ("a mix", []),
+    ],
+    "q19_physical_constraints": [
+        ("need seated activities", [("movement", "max", 0.3, 1.5)]),
+        ("prefer movement", [("movement", "min", 0.6, 0.7)]),
+        ("limited hand dexterity", [("dexterity", "max", 0.3, 2.5)]),
+        ("need quiet activities", [("noise", "max", 0.3, 1.0)]),
+        ("no constraints", []),
+    ],
+    "q20_seasonal_preference": [
+        ("indoor year-round", [("outdoor", "max", 0.3, 1.0)]),
+        ("outdoor warm-weather", [("outdoor", "min", 0.7, 0.8)]),
+        ("seasonal variety", []),
+        ("no preference", []),
+    ],
+    "q22_barriers": [
+        ("not sure what to choose", []),
+        ("concerned about cost", [("budget", "max", 0.3, 0.7)]),
+        ("fear of not being good", [("learning_curve", "max", 0.5, 0.4)]),
+        ("not enough time", [("time", "max", 0.4, 0.7), ("pausable", "min", 0.7, 0.5)]),
+        ("didn't know where to start", [("structure", "min", 0.6, 0.4)]),
+        ("tried and quit", [("learning_curve", "max", 0.5, 0.4)]),
+    ],
+}
+
+DREAM_HOBBY_KEY = "q21_dream_hobby"
+DREAM_HOBBY_BONUS = 0.12
+MIN_ANSWERED_QUESTIONS = 6
+
+_FEATURE_INDEX = {f: i for i, f in enumerate(FEATURES)}
+_HOURS_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:hrs?|hours?)")
+_DOLLARS_RE = re.compile(r"\$\s*(\d+)")
+
+
+def _normalize(text: str) -> str:
+    return text.lower().replace("–", "-").replace("—", "-").strip()
+
+
+def _fallback_rules(key: str, answer: str) -> list[Rule]:
+    """Numeric fallbacks for free-text answers (e.g. evaluation datasets)."""
+    if key == "q1_time_available":
+        m = _HOURS_RE.search(answer)
+        if m:
+            hours = float(m.group(1))
+            return [("time", "max", min(1.0, 0.1 + hours / 10), 2.0)]
+    if key == "q11_initial_budget":
+        m = _DOLLARS_RE.search(answer)
+        if m:
+            dollars = float(m.group(1))
+            return [("budget", "max", min(1.0, 0.1 + dollars / 300), 2.0)]
+    return []
+
+
+class EncodedProfile:
+    """Target vector, weights and penalty masks for one quiz profile."""
+
+    def __init__(self):
+        n = len(FEATURES)
+        self.target = np.zeros(n, dtype=np.float32)
+        self.weight = np.zeros(n, dtype=np.float32)
+        self.penalize_over = np.zeros(n, dtype=bool)
+        self.penalize_under = np.zeros(n, dtype=bool)
+        self.answered = 0
+        self.dream_hobby = ""
+        self._sums: dict[int, tuple[float, float]] = {}
+
+    def add(self, feature: str, kind: str, target: float, weight: float) -> None:
+        i = _FEATURE_INDEX[feature]
+        # Several options may touch the same feature: weighted-mean target, max weight
+        total, wsum = self._sums.get(i, (0.0, 0.0))
+        total, wsum = total + target * weight, wsum + weight
+        self._sums[i] = (total, wsum)
+        self.target[i] = total / wsum
+        self.weight[i] = max(self.weight[i], weight)
+        if kind in ("max", "near"):
+            self.penalize_over[i] = True
+        if kind in ("min", "near"):
+            self.penalize_under[i] = True
+
+
+class MatchingEngine:
+    """Scores quiz profiles against the hobby feature matrix."""
+
+    def __init__(self, profiles: dict[str, dict] | None = None):
+        self.profiles = profiles or HOBBY_PROFILES
+        self.slugs = list(self.profiles)
+        self.matrix = np.array(
+            [[self.profiles[s]["features"][f] for f in FEATURES] for s in self.slugs],
+            dtype=np.float32,
+        )
+        self._aliases = [
+            [a.lower() for a in [s, self.profiles[s]["name"], *self.profiles[s]["aliases"]]]
+            for s in self.slugs
+        ]
+
+    def encode(self, inputs: dict[str, Any]) -> EncodedProfile:
+        """Encode discovery crew inputs (q1_time_available ... q22_barriers)."""
+        profile = EncodedProfile()
+        for key, options in QUESTION_RULES.items():
+            answer = _normalize(str(inputs.get(key, "") or ""))
+            if not answer:
+                continue
+            matched = [rs for pattern, rs in options if pattern in answer]
+            rules = [r for rs in matched for r in rs] or _fallback_rules(key, answer)
+            # Unrecognized free text says nothing about the profile
+            if matched or rules:
+                profile.answered += 1
+            for rule in rules:
+                profile.add(*rule)
+        profile.dream_hobby = _normalize(str(inputs.get(DREAM_HOBBY_KEY, "") or ""))
+        return profile
+
+    def _dream_bonus(self, dream_hobby: str) -> np.ndarray:
+        if not dream_hobby:
+            return np.zeros(len(self.slugs), dtype=np.float32)
+        return np.array(
+            [DREAM_HOBBY_BONUS if any(a in dream_hobby for a in aliases) else 0.0
+             for aliases in self._aliases],
+            dtype=np.float32,
+        )
+
+    def score_encoded(self, profiles: list[EncodedProfile]) -> np.ndarray:
+        """Score many encoded profiles at once. Returns (profiles x hobbies) in 0..1."""
+        targets = np.stack([p.target for p in profiles])        # (U, F)
+        weights = np.stack([p.weight for p in profiles])        # (U, F)
+        over_mask = np.stack([p.penalize_over for p in profiles])
+        under_mask = np.stack([p.penalize_under for p in profiles])
+
+        diff = self.matrix[None, :, :] - targets[:, None, :]    # (U, H, F)
+        over = np.clip(diff, 0.0, None) * over_mask[:, None, :]
+        under = np.clip(-diff, 0.0, None) * under_mask[:, None, :]
+        mismatch = np.einsum("uhf,uf->uh", over + under, weights)
+
+        total_weight = weights.sum(axis=1, keepdims=True)
+        scores = 1.0 - mismatch / np.maximum(total_weight, 1e-6)
+        scores += np.stack([self._dream_bonus(p.dream_hobby) for p in profiles])
+        return np.clip(scores, 0.0, 1.0)
+
+    def score(self, inputs: dict[str, Any]) -> np.ndarray:
+        """Score a single profile. Returns one 0..1 score per hobby slug."""
+        return self.score_encoded([self.encode(inputs)])[0]
+
+    def rank(self, inputs: dict[str, Any], top_k: int = 5) -> list[dict[str, Any]]:
+        """Return the top-k matches in the DiscoveryCrew output shape (no reasoning)."""
+        return self.rank_encoded([self.encode(inputs)], top_k=top_k)[0]
+
+    def rank_batch(self, inputs_list: list[dict[str, Any]], top_k: int = 5) -> list[list[dict[str, Any]]]:
+        """Rank many quiz profiles in one vectorized pass (bulk onboarding)."""
+        return self.rank_encoded([self.encode(i) for i in inputs_list], top_k=top_k)
+
+    def rank_encoded(self, profiles: list[EncodedProfile], top_k: int = 5) -> list[list[dict[str, Any]]]:
+        scores = self.score_encoded(profiles)
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :top_k]
+        results = []
+        for row, idxs in zip(scores, order):
+            results.append([
+                {
+                    "hobby_slug": self.slugs[i],
+                    "match_percentage": to_match_percentage(float(row[i])),
+                    "match_tags": list(self.profiles[self.slugs[i]]["tags"]),
+                    "reasoning": "",
+                }
+                for i in idxs
+            ])
+        return results
+
+
+def to_match_percentage(score: float) -> int:
+    """Map a 0..1 engine score onto the 40-98% range users see."""
+    return int(round(40 + 58 * max(0.0, min(1.0, score))))
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> MatchingEngine:
+    """Return the process-wide engine (matrix is built once)."""
+    return MatchingEngine()
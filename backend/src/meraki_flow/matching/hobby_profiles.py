@@ -0,0 +1,137 @@
+"""
+Hobby attribute profiles used by the deterministic matching engine.
+
+Every feature is normalized to 0..1. "Cost-like" features (time, budget,
+mess, dexterity, ...) describe what the hobby demands; "trait" features
+(tactile, visual, nurture, ...) describe what it offers. The slugs match
+the ones DiscoveryCrew is allowed to recommend.
+"""
+
+FEATURES: list[str] = [
+    # Demands
+    "time",            # weekly time needed to make progress
+    "budget",          # initial spend
+    "ongoing_cost",    # refills, materials, subscriptions
+    "mess",
+    "space",           # dedicated space needed
+    "dexterity",       # fine motor demand
+    "noise",
+    "learning_curve",  # how long before it feels rewarding
+    # Style
+    "social",          # naturally practiced with others / in classes
+    "structure",       # step-by-step instruction readily available
+    "pausable",        # easy to pause and resume in short pockets
+    "outdoor",
+    "movement",
+    # Sensory & motivation
+    "tactile",
+    "visual",
+    "imagination",
+    "meditative",
+    "nurture",
+    "useful",          # produces gifts or useful items
+    # Creative type
+    "craft",
+    "visual_art",
+    "writing",
+    "growing",
+]
+
+
+def _profile(name: str, tags: list[str], aliases: list[str], **features: float) -> dict:
+    missing = set(FEATURES) - set(features)
+    unknown = set(features) - set(FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown hobby features for {name}: {sorted(unknown)}")
+    values = {f: 0.0 for f in missing}
+    values.update(features)
+    return {"name": name, "tags": tags, "aliases": aliases, "features": values}
+
+
+HOBBY_PROFILES: dict[str, dict] = {
+    "pottery": _profile(
+        "Pottery", ["Tactile", "Meditative", "Hands-on"], ["pottery", "ceramic", "clay", "wheel"],
+        time=0.6, budget=0.7, ongoing_cost=0.6, mess=0.9, space=0.7, dexterity=0.6, noise=0.2,
+        learning_curve=0.7, social=0.7, structure=0.6, pausable=0.3, movement=0.3,
+        tactile=1.0, visual=0.5, imagination=0.6, meditative=0.8, useful=0.8,
+        craft=1.0, visual_art=0.3,
+    ),
+    "watercolor": _profile(
+        "Watercolor", ["Visual", "Expressive", "Relaxing"], ["watercolor", "painting", "paint"],
+        time=0.4, budget=0.3, ongoing_cost=0.4, mess=0.5, space=0.3, dexterity=0.5,
+        learning_curve=0.6, social=0.4, structure=0.6, pausable=0.7, outdoor=0.3, movement=0.1,
+        tactile=0.4, visual=1.0, imagination=0.8, meditative=0.7, useful=0.2,
+        craft=0.1, visual_art=1.0,
+    ),
+    "drawing": _profile(
+        "Drawing", ["Budget-friendly", "Portable", "Visual"], ["drawing", "sketch", "doodl"],
+        time=0.2, budget=0.1, ongoing_cost=0.1, mess=0.2, space=0.1, dexterity=0.5,
+        learning_curve=0.5, social=0.2, structure=0.6, pausable=1.0, outdoor=0.3, movement=0.1,
+        tactile=0.4, visual=1.0, imagination=0.8, meditative=0.6, useful=0.1,
+        visual_art=1.0,
+    ),
+    "knitting": _profile(
+        "Knitting", ["Meditative", "Portable", "Makes gifts"], ["knit"],
+        time=0.3, budget=0.2, ongoing_cost=0.4, mess=0.1, space=0.1, dexterity=0.7, noise=0.1,
+        learning_curve=0.4, social=0.5, structure=0.9, pausable=1.0, movement=0.1,
+        tactile=0.9, visual=0.4, imagination=0.4, meditative=1.0, useful=1.0,
+        craft=1.0, visual_art=0.1,
+    ),
+    "crochet": _profile(
+        "Crochet", ["Meditative", "Quick wins", "Makes gifts"], ["crochet", "amigurumi"],
+        time=0.3, budget=0.15, ongoing_cost=0.4, mess=0.1, space=0.1, dexterity=0.7, noise=0.1,
+        learning_curve=0.35, social=0.5, structure=0.9, pausable=1.0, movement=0.1,
+        tactile=0.9, visual=0.5, imagination=0.5, meditative=1.0, useful=1.0,
+        craft=1.0, visual_art=0.2,
+    ),
+    "photography": _profile(
+        "Photography", ["Visual", "Outdoors", "Explorative"], ["photo", "camera"],
+        time=0.4, budget=0.6, ongoing_cost=0.2, space=0.1, dexterity=0.2,
+        learning_curve=0.5, social=0.5, structure=0.5, pausable=0.9, outdoor=0.9, movement=0.7,
+        tactile=0.2, visual=1.0, imagination=0.7, meditative=0.5, useful=0.3,
+        visual_art=0.9,
+    ),
+    "creative-writing": _profile(
+        "Creative Writing", ["Free to start", "Expressive", "Quiet"],
+        ["writing", "poetry", "journal", "story", "novel"],
+        time=0.3, dexterity=0.1, learning_curve=0.5, social=0.3, structure=0.4, pausable=1.0,
+        outdoor=0.2, tactile=0.1, visual=0.2, imagination=1.0, meditative=0.6, useful=0.2,
+        writing=1.0,
+    ),
+    "digital-art": _profile(
+        "Digital Art", ["Mess-free", "Visual", "Expressive"],
+        ["digital art", "digital painting", "procreate", "illustration"],
+        time=0.5, budget=0.6, ongoing_cost=0.2, space=0.2, dexterity=0.4,
+        learning_curve=0.6, social=0.2, structure=0.6, pausable=0.9,
+        tactile=0.2, visual=1.0, imagination=0.9, meditative=0.5, useful=0.3,
+        visual_art=1.0,
+    ),
+    "woodworking": _profile(
+        "Woodworking", ["Hands-on", "Practical", "Skill-building"], ["wood", "carpentry", "carving"],
+        time=0.8, budget=0.9, ongoing_cost=0.5, mess=0.8, space=1.0, dexterity=0.8, noise=0.9,
+        learning_curve=0.8, social=0.5, structure=0.7, pausable=0.4, outdoor=0.4, movement=0.6,
+        tactile=1.0, visual=0.5, imagination=0.5, meditative=0.6, useful=1.0,
+        craft=1.0, visual_art=0.2,
+    ),
+    "container-gardening": _profile(
+        "Container Gardening", ["Nurturing", "Outdoors", "Calming"], ["gardening", "garden", "balcony"],
+        time=0.3, budget=0.3, ongoing_cost=0.4, mess=0.6, space=0.4, dexterity=0.3,
+        learning_curve=0.3, social=0.3, structure=0.5, pausable=0.6, outdoor=0.8, movement=0.5,
+        tactile=0.8, visual=0.6, imagination=0.3, meditative=0.8, nurture=1.0, useful=0.7,
+        growing=1.0,
+    ),
+    "herb-garden": _profile(
+        "Herb Garden", ["Nurturing", "Useful", "Beginner-friendly"], ["herb"],
+        time=0.2, budget=0.2, ongoing_cost=0.3, mess=0.5, space=0.3, dexterity=0.2,
+        learning_curve=0.2, social=0.2, structure=0.6, pausable=0.6, outdoor=0.6, movement=0.3,
+        tactile=0.7, visual=0.5, imagination=0.2, meditative=0.7, nurture=1.0, useful=1.0,
+        growing=1.0,
+    ),
+    "houseplants": _profile(
+        "Houseplants", ["Low-time", "Nurturing", "Indoor"], ["houseplant", "plants", "succulent"],
+        time=0.1, budget=0.2, ongoing_cost=0.3, mess=0.3, space=0.2, dexterity=0.1,
+        learning_curve=0.2, social=0.2, structure=0.5, pausable=0.8, movement=0.2,
+        tactile=0.6, visual=0.6, imagination=0.2, meditative=0.7, nurture=1.0, useful=0.4,
+        growing=1.0,
+    ),
+}
@@ -7,6 +7,20 @@ structured JSON output from LLM tasks, eliminating fragile regex/brace-counting
 from pydantic import BaseModel
 
 
+# --- Discovery Models ---
+
+class HobbyMatch(BaseModel):
+    hobby_slug: str
+    match_percentage: int
+    match_tags: list[str]
+    reasoning: str
+
+
+class DiscoveryResult(BaseModel):
+    matches: list[HobbyMatch]
+    encouragement: str = ""
+
+
 # --- Sampling Preview Models ---
 
 class SamplingRecommendation(BaseModel):
@@ -1,33 +1,146 @@
 """Custom Opik evaluation metrics for Meraki agents."""
 
+import json
+import re
+from functools import lru_cache
+from typing import Any, TypeVar
+
 from opik.evaluation.metrics import base_metric, score_result
+from pydantic import BaseModel, ValidationError
+
+from meraki_flow.models import GeneratedChallenge, GeneratedRoadmap, MotivationNudge
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+# ---------------------------------------------------------------------------
+# Shared output parsing
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=2048)
+def parse_output(output: str) -> Any:
+    """
+    Parse a crew's raw output as JSON once; every metric scoring the same output
+    gets the cached result. Falls back to the outermost {...} for outputs with
+    surrounding prose or code fences. Returns None if nothing parses.
+    The returned object is shared between callers and must not be mutated.
+    """
+    try:
+        return json.loads(output)
+    except (json.JSONDecodeError, TypeError):
+        pass
+    start, end = output.find("{"), output.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        return json.loads(output[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+
+
+@lru_cache(maxsize=2048)
+def parse_as(output: str, model: type[ModelT]) -> ModelT | None:
+    """Parse and validate `output` as `model`, cached per (output, model)."""
+    data = parse_output(output)
+    if not isinstance(data, dict):
+        return None
+    try:
+        return model.model_validate(data)
+    except ValidationError:
+        return None
+
+
+def parse_field(output: str | BaseModel, model: type[ModelT], field: str) -> str:
+    """
+    Read string `field` from a crew output: the model itself, raw output that
+    validates as `model`, or else the `"field": "value"` pair in the raw text
+    (truncated JSON, missing sibling fields). Returns "" if none of these work.
+    """
+    if isinstance(output, model):
+        return getattr(output, field)
+    if isinstance(output, BaseModel):
+        output = output.model_dump_json()
+    parsed = parse_as(output, model)
+    if parsed is not None:
+        return getattr(parsed, field)
+    match = re.search(rf'"{re.escape(field)}"\s*:\s*"(\w+)"', output)
+    return match.group(1) if match else ""
+
+
+def _as_text(output: str | BaseModel) -> str:
+    """Text view of an output for keyword-based metrics."""
+    return output.model_dump_json() if isinstance(output, BaseModel) else output
+
+
+class KeywordGroups:
+    """
+    Named keyword groups built once per metric instance, so `score` does no setup.
+    Plain substring checks benchmarked 2-6x faster than a compiled regex
+    alternation for these short lists, and `present` keeps any()'s early exit.
+    """
+
+    def __init__(self, groups: dict[str, list[str]]):
+        self.groups = {name: tuple(keywords) for name, keywords in groups.items()}
+
+    def count(self, group: str, text: str) -> int:
+        """Number of distinct keywords from `group` that occur in `text`."""
+        return sum(1 for kw in self.groups[group] if kw in text)
+
+    def present(self, text: str) -> list[str]:
+        """Names of the groups with at least one keyword in `text`."""
+        return [name for name, keywords in self.groups.items() if any(kw in text for kw in keywords)]
 
 
-class FeedbackSpecificityMetric(base_metric.BaseMetric):
+class BatchScoringMixin:
+    """Adds `score_batch` to metrics whose `score` only needs the output text."""
+
+    def score_batch(
+        self,
+        outputs: list[str | BaseModel],
+        **kwargs,
+    ) -> list[score_result.ScoreResult]:
+        """Score many outputs; identical text outputs (e.g. replayed runs) are scored once."""
+        scored: dict[str, score_result.ScoreResult] = {}
+        results = []
+        for output in outputs:
+            if not isinstance(output, str):
+                results.append(self.score(output=output, **kwargs))
+                continue
+            result = scored.get(output)
+            if result is None:
+                result = scored[output] = self.score(output=output, **kwargs)
+            results.append(result)
+        return results
+
+
+class FeedbackSpecificityMetric(BatchScoringMixin, base_metric.BaseMetric):
     """
     Scores PracticeFeedbackOutput on how specific vs generic the feedback is.
     Maps to: observations[], growth[], suggestions[], celebration
     """
 
+    SPECIFIC_INDICATORS = [
+        "technique", "brush", "color", "composition", "texture",
+        "proportion", "line", "shape", "blend", "layer",
+        "contrast", "depth", "perspective", "balance", "rhythm",
+        "pressure", "angle", "stroke", "pattern", "form",
+    ]
+    GENERIC_PHRASES = [
+        "great job", "well done", "nice work", "keep it up",
+        "good effort", "looking good", "nice try", "awesome",
+    ]
+
     def __init__(self, name: str = "feedback_specificity"):
         super().__init__(name=name)
+        self._keywords = KeywordGroups({
+            "specific": self.SPECIFIC_INDICATORS,
+            "generic": self.GENERIC_PHRASES,
+        })
 
-    def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        output_lower = output.lower()
-
-        specific_indicators = [
-            "technique", "brush", "color", "composition", "texture",
-            "proportion", "line", "shape", "blend", "layer",
-            "contrast", "depth", "perspective", "balance", "rhythm",
-            "pressure", "angle", "stroke", "pattern", "form",
-        ]
-        generic_phrases = [
-            "great job", "well done", "nice work", "keep it up",
-            "good effort", "looking good", "nice try", "awesome",
-        ]
-
-        specificity_count = sum(1 for t in specific_indicators if t in output_lower)
-        generic_count = sum(1 for p in generic_phrases if p in output_lower)
+    def score(self, output: str | BaseModel, **kwargs) -> score_result.ScoreResult:
+        output_lower = _as_text(output).lower()
+        specificity_count = self._keywords.count("specific", output_lower)
+        generic_count = self._keywords.count("generic", output_lower)
 
         score_val = min(1.0, max(0.0, (specificity_count - generic_count) / 5))
 
@@ -42,6 +155,7 @@ class ChallengeCalibrationMetric(base_metric.BaseMetric):
     """
     Scores GeneratedChallenge difficulty against user progression.
     Maps to: difficulty, session_count, days_active
+    Pass `challenge` to score an already-parsed GeneratedChallenge.
     """
 
     def __init__(self, name: str = "challenge_calibration"):
@@ -49,10 +163,15 @@ class ChallengeCalibrationMetric(base_metric.BaseMetric):
 
     def score(
         self,
-        difficulty: str,
+        difficulty: str = "",
+        *,
         session_count: int,
+        challenge: GeneratedChallenge | None = None,
         **kwargs,
     ) -> score_result.ScoreResult:
+        if challenge is not None:
+            difficulty = challenge.difficulty
+        difficulty = difficulty or "medium"
         difficulty_map = {"easy": 1, "medium": 2, "hard": 3, "expert": 4}
         diff_val = difficulty_map.get(difficulty.lower(), 2)
 
@@ -84,6 +203,7 @@ class NudgeUrgencyCalibrationMetric(base_metric.BaseMetric):
     """
     Scores MotivationNudge urgency against actual engagement signals.
     Maps to: nudge_type/urgency, days_since_last_session
+    Pass `nudge` to score an already-parsed MotivationNudge.
     """
 
     def __init__(self, name: str = "nudge_urgency_calibration"):
@@ -91,10 +211,15 @@ class NudgeUrgencyCalibrationMetric(base_metric.BaseMetric):
 
     def score(
         self,
-        urgency: str,
+        urgency: str = "",
+        *,
         days_since_last_session: int,
+        nudge: MotivationNudge | None = None,
         **kwargs,
     ) -> score_result.ScoreResult:
+        if nudge is not None:
+            urgency = nudge.urgency
+        urgency = urgency or "check_in"
         if days_since_last_session <= 3:
             expected = "gentle"
         elif days_since_last_session <= 7:
@@ -116,24 +241,34 @@ class NudgeUrgencyCalibrationMetric(base_metric.BaseMetric):
         )
 
 
-class RoadmapCompletenessMetric(base_metric.BaseMetric):
+class RoadmapCompletenessMetric(BatchScoringMixin, base_metric.BaseMetric):
     """
     Scores GeneratedRoadmap structural quality.
     Maps to: title, description, phases[] with goals and activities
+    Accepts a GeneratedRoadmap or raw output, which is parsed through the shared cache.
     """
 
+    CHECK_KEYS = {
+        "has_phases": ['"phase_number"', '"phases"'],
+        "has_goals": ['"goals"'],
+        "has_activities": ['"suggested_activities"'],
+        "has_time": ['"time_per_week"'],
+        "has_title": ['"title"'],
+        "has_description": ['"description"'],
+    }
+
     def __init__(self, name: str = "roadmap_completeness"):
         super().__init__(name=name)
+        self._keywords = KeywordGroups(self.CHECK_KEYS)
 
-    def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        checks = {
-            "has_phases": '"phase_number"' in output or '"phases"' in output,
-            "has_goals": '"goals"' in output,
-            "has_activities": '"suggested_activities"' in output,
-            "has_time": '"time_per_week"' in output,
-            "has_title": '"title"' in output,
-            "has_description": '"description"' in output,
-        }
+    def score(self, output: str | GeneratedRoadmap, **kwargs) -> score_result.ScoreResult:
+        roadmap = output if isinstance(output, GeneratedRoadmap) else parse_as(output, GeneratedRoadmap)
+        if roadmap is not None:
+            checks = self._structural_checks(roadmap)
+        else:
+            # Not a valid GeneratedRoadmap (truncated or prose around keys): probe for the keys
+            present = self._keywords.present(output)
+            checks = {check: check in present for check in self.CHECK_KEYS}
 
         passed = sum(1 for v in checks.values() if v)
         score_val = passed / len(checks)
@@ -149,33 +284,38 @@ class RoadmapCompletenessMetric(base_metric.BaseMetric):
             reason=reason,
         )
 
+    @staticmethod
+    def _structural_checks(roadmap: GeneratedRoadmap) -> dict[str, bool]:
+        phases = roadmap.phases
+        return {
+            "has_phases": bool(phases),
+            "has_goals": any(p.goals for p in phases),
+            "has_activities": any(p.suggested_activities for p in phases),
+            "has_time": any(p.time_per_week.strip() for p in phases),
+            "has_title": bool(roadmap.title.strip()),
+            "has_description": bool(roadmap.description.strip()),
+        }
 
-class SamplingCompletenessMetric(base_metric.BaseMetric):
+
+class SamplingCompletenessMetric(BatchScoringMixin, base_metric.BaseMetric):
     """
     Scores sampling preview output on whether all 3 sections are present:
     recommendation, micro_activity, and videos.
     """
 
+    SECTION_KEYWORDS = {
+        "recommendation": ["recommendation", "sampling_path", "recommended_path", "best_path"],
+        "micro_activity": ["micro_activity", "micro activity", "quick_activity", "try_this"],
+        "videos": ["video", "youtube", "watch", "curated_videos"],
+    }
+
     def __init__(self, name: str = "sampling_completeness"):
         super().__init__(name=name)
+        self._keywords = KeywordGroups(self.SECTION_KEYWORDS)
 
-    def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        output_lower = output.lower()
-
-        sections = {
-            "recommendation": any(
-                kw in output_lower
-                for kw in ["recommendation", "sampling_path", "recommended_path", "best_path"]
-            ),
-            "micro_activity": any(
-                kw in output_lower
-                for kw in ["micro_activity", "micro activity", "quick_activity", "try_this"]
-            ),
-            "videos": any(
-                kw in output_lower
-                for kw in ["video", "youtube", "watch", "curated_videos"]
-            ),
-        }
+    def score(self, output: str | BaseModel, **kwargs) -> score_result.ScoreResult:
+        present = self._keywords.present(_as_text(output).lower())
+        sections = {section: section in present for section in self.SECTION_KEYWORDS}
 
         found = sum(1 for v in sections.values() if v)
         score_val = found / 3
@@ -192,24 +332,23 @@ class SamplingCompletenessMetric(base_metric.BaseMetric):
         )
 
 
-class LocalExperiencesCompletenessMetric(base_metric.BaseMetric):
+class LocalExperiencesCompletenessMetric(BatchScoringMixin, base_metric.BaseMetric):
     """
     Scores local experiences output on spot count (70%) and general tips presence (30%).
     """
 
+    # Count local spots (look for patterns like numbered items or "name" fields)
+    SPOT_PATTERN = re.compile(r'"name"\s*:|"spot_name"\s*:|"place_name"\s*:|"local_spot"')
+    TIP_KEYWORDS = ["general_tips", "tips", "advice", "suggestion"]
+
     def __init__(self, name: str = "local_experiences_completeness"):
         super().__init__(name=name)
+        self._keywords = KeywordGroups({"tips": self.TIP_KEYWORDS})
 
-    def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        output_lower = output.lower()
+    def score(self, output: str | BaseModel, **kwargs) -> score_result.ScoreResult:
+        output_lower = _as_text(output).lower()
 
-        # Count local spots (look for patterns like numbered items or "name" fields)
-        import re
-        spot_patterns = re.findall(
-            r'"name"\s*:|"spot_name"\s*:|"place_name"\s*:|"local_spot"',
-            output_lower,
-        )
-        spot_count = len(spot_patterns)
+        spot_count = len(self.SPOT_PATTERN.findall(output_lower))
 
         if spot_count == 0:
             spot_score = 0.0
@@ -218,10 +357,7 @@ class LocalExperiencesCompletenessMetric(base_metric.BaseMetric):
         else:
             spot_score = 1.0
 
-        has_tips = any(
-            kw in output_lower
-            for kw in ["general_tips", "tips", "advice", "suggestion"]
-        )
+        has_tips = bool(self._keywords.present(output_lower))
         tips_score = 1.0 if has_tips else 0.0
 
         score_val = 0.7 * spot_score + 0.3 * tips_score
@@ -233,31 +369,28 @@ class LocalExperiencesCompletenessMetric(base_metric.BaseMetric):
         )
 
 
-class HobbyMatchDiversityMetric(base_metric.BaseMetric):
+class HobbyMatchDiversityMetric(BatchScoringMixin, base_metric.BaseMetric):
     """
     Scores Discovery output on recommendation diversity.
     Good matches should span different hobby categories, not cluster in one type.
     """
 
+    CATEGORIES = {
+        "visual_arts": ["painting", "drawing", "sketching", "photography", "calligraphy"],
+        "crafts": ["pottery", "knitting", "crochet", "woodworking", "sewing", "embroidery"],
+        "music": ["guitar", "piano", "ukulele", "singing", "drums"],
+        "nature": ["gardening", "birdwatching", "hiking", "foraging", "beekeeping"],
+        "culinary": ["cooking", "baking", "fermentation", "bread"],
+        "movement": ["yoga", "dance", "martial arts", "climbing"],
+        "writing": ["journaling", "poetry", "fiction", "blogging"],
+    }
+
     def __init__(self, name: str = "hobby_match_diversity"):
         super().__init__(name=name)
+        self._keywords = KeywordGroups(self.CATEGORIES)
 
-    def score(self, output: str, **kwargs) -> score_result.ScoreResult:
-        categories = {
-            "visual_arts": ["painting", "drawing", "sketching", "photography", "calligraphy"],
-            "crafts": ["pottery", "knitting", "crochet", "woodworking", "sewing", "embroidery"],
-            "music": ["guitar", "piano", "ukulele", "singing", "drums"],
-            "nature": ["gardening", "birdwatching", "hiking", "foraging", "beekeeping"],
-            "culinary": ["cooking", "baking", "fermentation", "bread"],
-            "movement": ["yoga", "dance", "martial arts", "climbing"],
-            "writing": ["journaling", "poetry", "fiction", "blogging"],
-        }
-
-        output_lower = output.lower()
-        matched_categories = set()
-        for cat, keywords in categories.items():
-            if any(kw in output_lower for kw in keywords):
-                matched_categories.add(cat)
+    def score(self, output: str | BaseModel, **kwargs) -> score_result.ScoreResult:
+        matched_categories = self._keywords.present(_as_text(output).lower())
 
         score_val = min(1.0, len(matched_categories) / 3)
 
@@ -0,0 +1,186 @@
+"""
+Adaptive trial budgeting for the prompt optimizers.
+
+Instead of spending a fixed `n_trials` in one optimize_prompt() call, the
+budget is spent in short rounds:
+
+1. Screen: each round runs the optimizer for `round_trials` trials, scoring
+   candidates on a small dataset subset only.
+2. Successive halving: the round's best candidates (by screening score, read
+   from the checkpoint) are re-scored on doubling subsets, keeping the top half
+   each time, until one survivor is scored on the full dataset.
+3. Early stopping: the survivor replaces the incumbent when its full-dataset
+   score beats it by at least `min_delta`; after `patience` rounds without such
+   an improvement, the remaining trials are skipped.
+
+Evaluations go through the OptimizationCheckpoint, so items a candidate was
+already scored on (during screening or an earlier rung) are never re-run.
+"""
+
+import json
+import math
+from typing import Any, Callable
+
+
+class EarlyStopping:
+    """Stops once `patience` consecutive rounds improve the best score by less than `min_delta`."""
+
+    def __init__(self, patience: int = 2, min_delta: float = 0.01):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best: float | None = None
+        self.stale_rounds = 0
+
+    def update(self, score: float) -> bool:
+        """Record a round's score; returns True if it counts as an improvement."""
+        if self.best is None or score >= self.best + self.min_delta:
+            self.best = score
+            self.stale_rounds = 0
+            return True
+        self.stale_rounds += 1
+        return False
+
+    @property
+    def should_stop(self) -> bool:
+        return self.patience > 0 and self.stale_rounds >= self.patience
+
+
+def successive_halving(
+    candidates: list[Any],
+    item_ids: list[str],
+    evaluate: Callable[[Any, list[str]], float],
+    min_items: int = 1,
+    eta: int = 2,
+) -> tuple[Any, float, list[dict[str, Any]]]:
+    """Pick the best candidate, spending full-dataset evaluations only on finalists.
+
+    Candidates are scored on the first `min_items` items, the top 1/eta go on to
+    eta times as many items, and so on until one remains or the whole dataset is
+    used. Returns (best_candidate, its score on the final rung, per-rung log).
+    """
+    survivors = list(candidates)
+    n_items = max(1, min(min_items, len(item_ids)))
+    rungs = []
+    while True:
+        subset = item_ids[:n_items]
+        scored = sorted(((evaluate(c, subset), i, c) for i, c in enumerate(survivors)),
+                        key=lambda t: (-t[0], t[1]))
+        rungs.append({"items": len(subset), "candidates": len(survivors), "scores": [s for s, _, _ in scored]})
+        if n_items >= len(item_ids):
+            return scored[0][2], scored[0][0], rungs
+        survivors = [c for _, _, c in scored[:max(1, math.ceil(len(scored) / eta))]]
+        n_items = min(len(item_ids), n_items * eta)
+
+
+def run_adaptive_optimization(
+    optimizer,
+    prompt,
+    dataset,
+    metric: Callable,
+    checkpoint,
+    n_trials: int,
+    round_trials: int,
+    patience: int = 2,
+    min_delta: float = 0.01,
+    screen_items: int | None = None,
+    finalists: int = 4,
+    **optimize_kwargs: Any,
+):
+    """Spend up to `n_trials` in rounds with successive halving and early stopping.
+
+    `metric` should already be wrapped by `checkpoint.wrap_metric`. Returns the
+    best round's OptimizationResult with prompt/score replaced by the overall
+    best full-dataset candidate and a `budget` entry in `details`.
+    """
+    items = dataset.get_items()
+    item_ids = [item["id"] for item in items]
+    checkpoint.bind_dataset(items)
+    screen_items = screen_items or max(1, math.ceil(len(item_ids) / 2))
+    n_threads = getattr(optimizer, "n_threads", 4)
+    base_seed = optimizer.seed
+
+    def evaluate(candidate, ids: list[str]) -> float:
+        return optimizer.evaluate_prompt(
+            prompt=candidate,
+            dataset=dataset,
+            metric=metric,
+            n_threads=n_threads,
+            verbose=0,
+            dataset_item_ids=ids,
+            agent_class=checkpoint.agent_class(candidate),
+        )
+
+    initial_score = evaluate(prompt, item_ids)
+    stopper = EarlyStopping(patience=patience, min_delta=min_delta)
+    stopper.update(initial_score)
+    incumbent, incumbent_score, best_result = prompt, initial_score, None
+    rounds = []
+    trials_used = 0
+
+    while trials_used < n_trials and not stopper.should_stop:
+        trials = min(round_trials, n_trials - trials_used)
+        known = set(checkpoint.prompts)
+        optimizer.seed = base_seed + len(rounds)  # new proposals even when the incumbent didn't change
+        result = optimizer.optimize_prompt(
+            prompt=incumbent,
+            dataset=dataset,
+            metric=metric,
+            n_samples=screen_items,
+            max_trials=trials,
+            agent_class=checkpoint.agent_class(incumbent),
+            **optimize_kwargs,
+        )
+        trials_used += trials
+        best_result = best_result or result
+
+        # Round candidates ranked by their screening score, plus the round's reported best
+        screened = checkpoint.candidate_scores(set(checkpoint.prompts) - known)
+        ranked = sorted(screened, key=lambda h: sum(screened[h]) / len(screened[h]), reverse=True)
+        candidates, seen = [], set()
+        for messages in [result.prompt] + [checkpoint.prompts[h] for h in ranked]:
+            key = json.dumps(messages, sort_keys=True)
+            if key not in seen and len(candidates) < finalists:
+                seen.add(key)
+                candidates.append(prompt.with_messages(messages))
+
+        winner, score, rungs = successive_halving(candidates, item_ids, evaluate, min_items=screen_items)
+        improved = stopper.update(score)
+        if improved:
+            incumbent, incumbent_score, best_result = winner, score, result
+        rounds.append({
+            "trials": trials,
+            "candidates": len(screened),
+            "finalist_score": score,
+            "improved": improved,
+            "rungs": rungs,
+        })
+        print(f"Round {len(rounds)}: {trials} trials, {len(screened)} candidates, "
+              f"finalist {score:.4f} (best {incumbent_score:.4f}){'' if improved else ' - no improvement'}")
+
+    optimizer.seed = base_seed
+    if best_result is None:
+        raise RuntimeError("No optimization rounds ran (n_trials must be positive)")
+    stopped_early = stopper.should_stop and trials_used < n_trials
+    if stopped_early:
+        print(f"Early stop: no improvement >= {min_delta} for {patience} rounds "
+              f"({trials_used}/{n_trials} trials used)")
+
+    return best_result.model_copy(update={
+        "prompt": incumbent.get_messages(),
+        "score": incumbent_score,
+        "initial_prompt": prompt.get_messages(),
+        "initial_score": initial_score,
+        "details": {
+            **best_result.details,
+            "budget": {
+                "n_trials": n_trials,
+                "trials_used": trials_used,
+                "round_trials": round_trials,
+                "patience": patience,
+                "min_delta": min_delta,
+                "screen_items": screen_items,
+                "stopped_early": stopped_early,
+                "rounds": rounds,
+            },
+        },
+    })
@@ -0,0 +1,211 @@
+"""
+Trial-level checkpoints for prompt optimization runs.
+
+Every candidate-prompt evaluation is appended to
+optimization/results/<crew>_checkpoint.jsonl as it happens:
+
+    {"kind": "prompt", "prompt_hash", "messages"}                             candidate prompt template
+    {"kind": "output", "prompt_hash", "messages_hash", "item_key", "output"}  LLM output for one dataset item
+    {"kind": "score",  "item_key", "output_hash", "score"}                    metric score for that output
+
+Outputs are cached on the rendered messages and scores on the dataset item;
+the item_key on output rows joins the two per candidate.
+
+With --resume the file is replayed, so candidates the optimizer proposes again
+(seeded optimizers re-propose the same ones after a restart) are served from
+the checkpoint instead of being re-run and re-scored. Without --resume the
+previous checkpoint is discarded.
+"""
+
+import functools
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _hash(payload: Any) -> str:
+    text = payload if isinstance(payload, str) else json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def item_key(dataset_item: dict[str, Any]) -> str:
+    """Stable key for a dataset item; ignores the Opik id, which changes when the dataset is recreated."""
+    return _hash({k: v for k, v in dataset_item.items() if k != "id"})
+
+
+class OptimizationCheckpoint:
+    """Append-only record of candidate evaluations for one optimizer run."""
+
+    def __init__(self, crew: str, resume: bool = False):
+        self.crew = crew
+        self.path = RESULTS_DIR / f"{crew}_checkpoint.jsonl"
+        self.prompts: dict[str, list[dict[str, Any]]] = {}
+        self.outputs: dict[tuple[str, str], str] = {}
+        self.output_items: dict[tuple[str, str], str] = {}
+        self.dataset_items: list[dict[str, Any]] = []
+        self.scores: dict[tuple[str, str], float] = {}
+        self.hits = 0
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+        elif self.path.exists():
+            self.path.unlink()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row["kind"] == "prompt":
+                    self.prompts[row["prompt_hash"]] = row["messages"]
+                elif row["kind"] == "output":
+                    if "messages_hash" not in row:
+                        # Older checkpoints stored the messages hash as item_key
+                        row = {**row, "messages_hash": row["item_key"], "item_key": None}
+                    key = (row["prompt_hash"], row["messages_hash"])
+                    self.outputs[key] = row["output"]
+                    if row["item_key"]:
+                        self.output_items[key] = row["item_key"]
+                elif row["kind"] == "score":
+                    self.scores[(row["item_key"], row["output_hash"])] = row["score"]
+
+    def _append(self, row: dict[str, Any]) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(row, default=str) + "\n")
+
+    def register_prompt(self, messages: list[dict[str, Any]], model: str | None = None,
+                        model_kwargs: dict[str, Any] | None = None) -> str:
+        """Record a candidate prompt template and return its hash."""
+        prompt_hash = _hash({"messages": messages, "model": model, "model_kwargs": model_kwargs or {}})
+        if prompt_hash not in self.prompts:
+            self.prompts[prompt_hash] = messages
+            self._append({"kind": "prompt", "prompt_hash": prompt_hash, "messages": messages})
+        return prompt_hash
+
+    def bind_dataset(self, dataset_items: list[dict[str, Any]]) -> None:
+        """Set the dataset items that outputs are attributed to."""
+        self.dataset_items = list(dataset_items)
+
+    def item_keys_for(self, prompt) -> dict[str, str]:
+        """Map {messages hash: item_key} for `prompt` rendered on each bound dataset item."""
+        return {_hash(prompt.get_messages(item)): item_key(item) for item in self.dataset_items}
+
+    def cached_output(self, prompt_hash: str, messages_hash: str) -> str | None:
+        output = self.outputs.get((prompt_hash, messages_hash))
+        if output is not None:
+            self.hits += 1
+        return output
+
+    def record_output(self, prompt_hash: str, messages_hash: str, output: str,
+                      key: str | None = None) -> None:
+        self.outputs[(prompt_hash, messages_hash)] = output
+        if key:
+            self.output_items[(prompt_hash, messages_hash)] = key
+        self._append({"kind": "output", "prompt_hash": prompt_hash, "messages_hash": messages_hash,
+                      "item_key": key, "output": output})
+
+    def cached_score(self, key: str, output: str) -> float | None:
+        score = self.scores.get((key, _hash(output.strip())))
+        if score is not None:
+            self.hits += 1
+        return score
+
+    def record_score(self, key: str, output: str, score: float) -> None:
+        output_hash = _hash(output.strip())
+        self.scores[(key, output_hash)] = score
+        self._append({"kind": "score", "item_key": key, "output_hash": output_hash, "score": score})
+
+    def agent_class(self, prompt) -> type:
+        """Build an opik-optimizer agent class whose invoke() is memoized in this checkpoint.
+
+        Each agent is bound to one candidate prompt; outputs are keyed on
+        (prompt hash, rendered messages), i.e. on candidate x dataset item, and
+        tagged with the item_key of the bound dataset item they were rendered from.
+        """
+        from opik_optimizer.utils import create_litellm_agent_class
+
+        checkpoint = self
+        base = create_litellm_agent_class(prompt)
+
+        class CheckpointedAgent(base):
+            def __init__(self, prompt, project_name: str | None = None) -> None:
+                super().__init__(prompt, project_name=project_name)
+                self.prompt_hash = checkpoint.register_prompt(
+                    prompt.get_messages(), self.model, self.model_kwargs,
+                )
+                self.item_keys = checkpoint.item_keys_for(prompt)
+
+            def invoke(self, messages: list[dict[str, str]], seed: int | None = None) -> str:
+                messages_hash = _hash(messages)
+                output = checkpoint.cached_output(self.prompt_hash, messages_hash)
+                if output is None:
+                    output = super().invoke(messages, seed=seed)
+                    checkpoint.record_output(self.prompt_hash, messages_hash, output,
+                                             self.item_keys.get(messages_hash))
+                return output
+
+        CheckpointedAgent.__name__ = base.__name__
+        return CheckpointedAgent
+
+    def wrap_metric(self, metric_fn: Callable) -> Callable:
+        """Memoize `metric_fn(dataset_item, llm_output)` on (dataset item, output).
+
+        Keeps the wrapped function's __name__, which opik-optimizer uses as the
+        objective metric name.
+        """
+        @functools.wraps(metric_fn)
+        def checkpointed_metric(dataset_item: dict, llm_output: str):
+            key = item_key(dataset_item)
+            cached = self.cached_score(key, llm_output)
+            if cached is not None:
+                return cached
+            result = metric_fn(dataset_item, llm_output)
+            self.record_score(key, llm_output, float(getattr(result, "value", result)))
+            return result
+
+        return checkpointed_metric
+
+    def candidate_scores(self, prompt_hashes: set[str] | None = None) -> dict[str, list[float]]:
+        """Return {prompt_hash: [per-item scores]} for candidates with at least one scored item."""
+        item_scores = defaultdict(list)
+        for (prompt_hash, messages_hash), output in self.outputs.items():
+            if prompt_hashes is not None and prompt_hash not in prompt_hashes:
+                continue
+            key = self.output_items.get((prompt_hash, messages_hash))
+            score = self.scores.get((key, _hash(output.strip())))
+            if score is not None:
+                item_scores[prompt_hash].append(score)
+        return dict(item_scores)
+
+    def best_so_far(self) -> dict[str, Any] | None:
+        """Return the best-scoring candidate recorded so far (mean score over its scored items)."""
+        item_scores = self.candidate_scores()
+        if not item_scores:
+            return None
+        prompt_hash, scores = max(item_scores.items(), key=lambda kv: sum(kv[1]) / len(kv[1]))
+        return {
+            "prompt_hash": prompt_hash,
+            "score": sum(scores) / len(scores),
+            "items_scored": len(scores),
+            "prompt": self.prompts.get(prompt_hash, []),
+        }
+
+    def print_failure_summary(self) -> None:
+        """Tell the user what survived a failed run and how to pick it back up."""
+        best = self.best_so_far()
+        if best:
+            print(f"Best candidate so far: {best['score']:.4f} over {best['items_scored']} items "
+                  f"(prompt {best['prompt_hash']})")
+        print(f"Checkpoint kept at {self.path} ({len(self.outputs)} outputs, {len(self.scores)} scores)")
+        print("Re-run with --resume to continue without repeating finished evaluations")
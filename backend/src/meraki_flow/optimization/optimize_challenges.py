@@ -7,6 +7,7 @@ Saves results (including best examples) to JSON and optionally updates agents.ya
 Usage:
     python -m meraki_flow.optimization.optimize_challenges
     python -m meraki_flow.optimization.optimize_challenges --apply
+    python -m meraki_flow.optimization.optimize_challenges --resume    # continue after a crash
 """
 
 import argparse
@@ -22,6 +23,11 @@ import yaml
 from opik.evaluation.metrics import LevenshteinRatio
 from opik_optimizer import FewShotBayesianOptimizer, ChatPrompt
 
+from meraki_flow.evaluation.dataset_sync import sync_dataset
+from meraki_flow.llm_cache import install_llm_cache
+from meraki_flow.optimization.budget import run_adaptive_optimization
+from meraki_flow.optimization.checkpoint import OptimizationCheckpoint
+
 CREW_DIR = Path(__file__).resolve().parent.parent / "crews" / "challenge_generation_crew" / "config"
 AGENTS_YAML = CREW_DIR / "agents.yaml"
 RESULTS_DIR = Path(__file__).resolve().parent / "results"
@@ -43,17 +49,8 @@ def create_dataset() -> "opik.Dataset":
 
     dataset_name = "meraki-challenge-optimization"
 
-    try:
-        client.delete_dataset(name=dataset_name)
-    except Exception:
-        pass
-
-    dataset = client.create_dataset(
-        name=dataset_name,
-        description="Challenge generation scenarios for optimization",
-    )
-
-    dataset.insert([
+    # Only new or changed items are uploaded; unchanged datasets are left as-is
+    return sync_dataset(client, dataset_name, [
         {
             "input": (
                 "Hobby: watercolor, Sessions: 5, Avg duration: 30min, "
@@ -149,9 +146,7 @@ def create_dataset() -> "opik.Dataset":
                 "what_youll_learn": ["Perspective as storytelling", "Finding beauty in the mundane"],
             }),
         },
-    ])
-
-    return dataset
+    ], description="Challenge generation scenarios for optimization")
 
 
 def build_metric():
@@ -165,7 +160,13 @@ def build_metric():
     return metric_fn
 
 
-def run_optimization(n_trials: int = 15) -> dict:
+def run_optimization(
+    n_trials: int = 15,
+    resume: bool = False,
+    patience: int = 2,
+    min_delta: float = 0.01,
+    round_trials: int | None = None,
+) -> dict:
     opik.configure(use_local=False)
 
     current_prompt_text = load_current_prompt()
@@ -186,17 +187,36 @@ def run_optimization(n_trials: int = 15) -> dict:
         verbose=0,
     )
 
+    checkpoint = OptimizationCheckpoint("challenges", resume=resume)
+    llm_cache = install_llm_cache()
+
     print("\n=== Starting Challenge Designer Optimization ===")
-    print(f"Trials: {n_trials}")
+    round_trials = round_trials or max(2, n_trials // 4)
+    print(f"Trials: up to {n_trials}, {round_trials} per round (patience {patience}, min delta {min_delta})")
+    if resume:
+        print(f"Resuming from checkpoint: {len(checkpoint.outputs)} outputs, "
+              f"{len(checkpoint.scores)} scores cached")
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.path}")
     print()
 
-    result = optimizer.optimize_prompt(
-        prompt=prompt,
-        dataset=dataset,
-        metric=build_metric(),
-        n_samples=None,
-        project_name="meraki-optimize-challenges",
-    )
+    try:
+        result = run_adaptive_optimization(
+            optimizer,
+            prompt,
+            dataset,
+            metric=checkpoint.wrap_metric(build_metric()),
+            checkpoint=checkpoint,
+            n_trials=n_trials,
+            round_trials=round_trials,
+            patience=patience,
+            min_delta=min_delta,
+            project_name="meraki-optimize-challenges",
+        )
+    except Exception:
+        print("\nOptimization failed.")
+        checkpoint.print_failure_summary()
+        raise
 
     print(f"\nOptimization complete!")
     print(f"Initial score: {result.initial_score}")
@@ -218,7 +238,12 @@ def run_optimization(n_trials: int = 15) -> dict:
         "initial_prompt": result.initial_prompt,
         "demonstrations": result.demonstrations,
         "n_trials": n_trials,
+        "resumed": resume,
+        "checkpoint_hits": checkpoint.hits,
+        "budget": result.details.get("budget"),
     }
+    if llm_cache is not None:
+        result_data["llm_cache"] = llm_cache.stats()
 
     return result_data
 
@@ -279,9 +304,23 @@ def main():
     parser = argparse.ArgumentParser(description="Optimize Challenge Designer prompt")
     parser.add_argument("--trials", type=int, default=15, help="Number of optimization trials")
     parser.add_argument("--apply", action="store_true", help="Apply optimized prompt to agents.yaml")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse evaluations from the last checkpoint instead of starting over")
+    parser.add_argument("--patience", type=int, default=2,
+                        help="Stop after this many rounds without improvement (0 = use all trials)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="Smallest full-dataset score gain that counts as an improvement")
+    parser.add_argument("--round-trials", type=int, default=None,
+                        help="Trials per round (default: a quarter of --trials, at least 2)")
     args = parser.parse_args()
 
-    result_data = run_optimization(n_trials=args.trials)
+    result_data = run_optimization(
+        n_trials=args.trials,
+        resume=args.resume,
+        patience=args.patience,
+        min_delta=args.min_delta,
+        round_trials=args.round_trials,
+    )
     filepath = save_results(result_data)
 
     if args.apply:
@@ -8,6 +8,7 @@ Optionally updates agents.yaml with the improved backstory.
 Usage:
     python -m meraki_flow.optimization.optimize_discovery
     python -m meraki_flow.optimization.optimize_discovery --apply
+    python -m meraki_flow.optimization.optimize_discovery --resume    # continue after a crash
 """
 
 import argparse
@@ -25,6 +26,11 @@ import yaml
 from opik.evaluation.metrics import LevenshteinRatio
 from opik_optimizer import MetaPromptOptimizer, ChatPrompt
 
+from meraki_flow.evaluation.dataset_sync import sync_dataset
+from meraki_flow.llm_cache import install_llm_cache
+from meraki_flow.optimization.budget import run_adaptive_optimization
+from meraki_flow.optimization.checkpoint import OptimizationCheckpoint
+
 # Paths
 CREW_DIR = Path(__file__).resolve().parent.parent / "crews" / "discovery_crew" / "config"
 AGENTS_YAML = CREW_DIR / "agents.yaml"
@@ -56,18 +62,8 @@ def create_dataset() -> "opik.Dataset":
 
     dataset_name = "meraki-discovery-optimization"
 
-    # Delete and recreate to ensure fresh data
-    try:
-        client.delete_dataset(name=dataset_name)
-    except Exception:
-        pass
-
-    dataset = client.create_dataset(
-        name=dataset_name,
-        description="Quiz profiles for discovery agent optimization",
-    )
-
-    dataset.insert([
+    # Only new or changed items are uploaded; unchanged datasets are left as-is
+    return sync_dataset(client, dataset_name, [
         {
             "input": (
                 "Time: 2hrs/week, Timing: evenings, Sessions: short bursts, "
@@ -142,9 +138,7 @@ def create_dataset() -> "opik.Dataset":
                 "Should provide clear 'where to start' guidance in reasoning."
             ),
         },
-    ])
-
-    return dataset
+    ], description="Quiz profiles for discovery agent optimization")
 
 
 def build_metric():
@@ -159,7 +153,13 @@ def build_metric():
     return metric_fn
 
 
-def run_optimization(n_trials: int = 10) -> dict:
+def run_optimization(
+    n_trials: int = 10,
+    resume: bool = False,
+    patience: int = 2,
+    min_delta: float = 0.01,
+    round_trials: int | None = None,
+) -> dict:
     """Run the MetaPromptOptimizer and return serialized results."""
     opik.configure(use_local=False)
 
@@ -179,19 +179,37 @@ def run_optimization(n_trials: int = 10) -> dict:
         verbose=0,
     )
 
+    checkpoint = OptimizationCheckpoint("discovery", resume=resume)
+    llm_cache = install_llm_cache()
+
     print("\n=== Starting Discovery Agent Optimization ===")
-    print(f"Trials: {n_trials}")
+    round_trials = round_trials or max(2, n_trials // 4)
+    print(f"Trials: up to {n_trials}, {round_trials} per round (patience {patience}, min delta {min_delta})")
+    if resume:
+        print(f"Resuming from checkpoint: {len(checkpoint.outputs)} outputs, "
+              f"{len(checkpoint.scores)} scores cached")
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.path}")
     print(f"Dataset: {dataset.name}")
     print()
 
-    result = optimizer.optimize_prompt(
-        prompt=prompt,
-        dataset=dataset,
-        metric=build_metric(),
-        n_samples=None,
-        max_trials=n_trials,
-        project_name="meraki-optimize-discovery",
-    )
+    try:
+        result = run_adaptive_optimization(
+            optimizer,
+            prompt,
+            dataset,
+            metric=checkpoint.wrap_metric(build_metric()),
+            checkpoint=checkpoint,
+            n_trials=n_trials,
+            round_trials=round_trials,
+            patience=patience,
+            min_delta=min_delta,
+            project_name="meraki-optimize-discovery",
+        )
+    except Exception:
+        print("\nOptimization failed.")
+        checkpoint.print_failure_summary()
+        raise
 
     # Print results as plain text (Rich display crashes on Windows cp1252)
     print(f"\nOptimization complete!")
@@ -212,7 +230,12 @@ def run_optimization(n_trials: int = 10) -> dict:
         "optimized_prompt": result.prompt,  # list of {role, content} dicts
         "initial_prompt": result.initial_prompt,
         "n_trials": n_trials,
+        "resumed": resume,
+        "checkpoint_hits": checkpoint.hits,
+        "budget": result.details.get("budget"),
     }
+    if llm_cache is not None:
+        result_data["llm_cache"] = llm_cache.stats()
 
     return result_data
 
@@ -272,9 +295,23 @@ def main():
     parser = argparse.ArgumentParser(description="Optimize Discovery Agent prompt")
     parser.add_argument("--trials", type=int, default=10, help="Number of optimization trials")
     parser.add_argument("--apply", action="store_true", help="Apply optimized prompt to agents.yaml")
+    parser.add_argument("--resume", action="store_true",
+                        help="Reuse evaluations from the last checkpoint instead of starting over")
+    parser.add_argument("--patience", type=int, default=2,
+                        help="Stop after this many rounds without improvement (0 = use all trials)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="Smallest full-dataset score gain that counts as an improvement")
+    parser.add_argument("--round-trials", type=int, default=None,
+                        help="Trials per round (default: a quarter of --trials, at least 2)")
     args = parser.parse_args()
 
-    result_data = run_optimization(n_trials=args.trials)
+    result_data = run_optimization(
+        n_trials=args.trials,
+        resume=args.resume,
+        patience=args.patience,
+        min_delta=args.min_delta,
+        round_trials=args.round_trials,
+    )
     filepath = save_results(result_data)
 
     if args.apply:
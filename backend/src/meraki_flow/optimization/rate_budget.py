@@ -0,0 +1,68 @@
+"""
+Global LLM request budget shared by optimizer processes.
+
+Optimizers run in separate processes but hit the same provider account, so
+their LLM calls draw from one requests-per-minute budget. The budget lives in
+a multiprocessing.Manager, and each worker wraps `litellm.completion` /
+`litellm.acompletion` (opik-optimizer and the Opik LLM-judge metrics both call
+through them) so every call blocks until the next slot is free.
+"""
+
+import asyncio
+import functools
+import time
+from multiprocessing.managers import SyncManager
+
+
+class SharedRateBudget:
+    """Spaces LLM calls across processes to at most `per_minute`.
+
+    Picklable: only holds Manager proxies, so it can be passed to pool workers.
+    """
+
+    def __init__(self, manager: SyncManager, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = manager.Lock()
+        self._next_slot = manager.Value("d", 0.0)
+
+    def acquire(self) -> float:
+        """Block until this caller's slot; returns the seconds waited."""
+        if not self.interval:
+            return 0.0
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next_slot.value)
+            self._next_slot.value = start + self.interval
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def install_litellm_throttle(budget: SharedRateBudget) -> None:
+    """Make every LiteLLM completion in this process wait for a slot in `budget`.
+
+    Wraps the module functions rather than registering a callback, because
+    opik-optimizer's agents reassign `litellm.callbacks` on every instantiation.
+    """
+    import litellm
+
+    if getattr(litellm.completion, "_meraki_throttled", False):
+        return
+
+    completion = litellm.completion
+    acompletion = litellm.acompletion
+
+    @functools.wraps(completion)
+    def throttled_completion(*args, **kwargs):
+        budget.acquire()
+        return completion(*args, **kwargs)
+
+    @functools.wraps(acompletion)
+    async def throttled_acompletion(*args, **kwargs):
+        await asyncio.to_thread(budget.acquire)
+        return await acompletion(*args, **kwargs)
+
+    throttled_completion._meraki_throttled = True
+    litellm.completion = throttled_completion
+    litellm.acompletion = throttled_acompletion
@@ -1,15 +1,28 @@
 """
-Run all optimization scripts sequentially and generate a summary report.
+Run all optimization scripts and generate a summary report.
+
+Optimizers target independent crews and datasets, so they run concurrently in
+separate processes. Their LLM calls share one global requests-per-minute budget.
 
 Usage:
     python -m meraki_flow.optimization.run_all
     python -m meraki_flow.optimization.run_all --apply
     python -m meraki_flow.optimization.run_all --only discovery challenges motivation
+    python -m meraki_flow.optimization.run_all --workers 1                # sequential
+    python -m meraki_flow.optimization.run_all --llm-rpm 120              # shared rate budget
+    python -m meraki_flow.optimization.run_all --resume                   # continue from checkpoints
+    python -m meraki_flow.optimization.run_all --llm-cache                # reuse identical LLM calls from disk
 """
 
 import argparse
 import json
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import nullcontext
 from datetime import datetime, timezone
+from multiprocessing import Manager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -33,17 +46,25 @@ OPTIMIZERS = {
 }
 
 
-def run_optimizer(name: str, apply: bool, trials: int) -> dict | None:
+def run_optimizer(
+    name: str,
+    apply: bool,
+    trials: int,
+    resume: bool = False,
+    patience: int = 2,
+    min_delta: float = 0.01,
+) -> dict | None:
     """Run a single optimizer and return its results."""
     info = OPTIMIZERS[name]
     print(f"\n{'='*60}")
     print(f"Running: {info['description']}")
     print(f"{'='*60}")
 
+    started = time.perf_counter()
     try:
         import importlib
         mod = importlib.import_module(info["module"])
-        result_data = mod.run_optimization(n_trials=trials)
+        result_data = mod.run_optimization(n_trials=trials, resume=resume, patience=patience, min_delta=min_delta)
         filepath = mod.save_results(result_data)
 
         if apply:
@@ -54,7 +75,9 @@ def run_optimizer(name: str, apply: bool, trials: int) -> dict | None:
             "status": "success",
             "initial_score": result_data.get("initial_score"),
             "best_score": result_data.get("best_score"),
+            "trials_used": (result_data.get("budget") or {}).get("trials_used"),
             "result_file": str(filepath),
+            "wall_time_s": round(time.perf_counter() - started, 1),
         }
     except Exception as e:
         print(f"\nFAILED: {e}")
@@ -64,9 +87,111 @@ def run_optimizer(name: str, apply: bool, trials: int) -> dict | None:
             "name": name,
             "status": "failed",
             "error": str(e),
+            "wall_time_s": round(time.perf_counter() - started, 1),
         }
 
 
+def _run_optimizer_worker(
+    name: str,
+    apply: bool,
+    trials: int,
+    resume: bool,
+    patience: int,
+    min_delta: float,
+    budget,
+    events,
+) -> dict | None:
+    """Pool entry point: install the shared LLM budget, then run one optimizer."""
+    if budget is not None:
+        from meraki_flow.optimization.rate_budget import install_litellm_throttle
+        install_litellm_throttle(budget)
+    events.put((name, "started", None))
+    result = run_optimizer(name, apply=apply, trials=trials, resume=resume,
+                           patience=patience, min_delta=min_delta)
+    events.put((name, (result or {}).get("status", "failed"), (result or {}).get("wall_time_s")))
+    return result
+
+
+def _print_events(events, started: float) -> None:
+    """Print queued progress events from the workers without blocking."""
+    while True:
+        try:
+            name, status, wall_time = events.get_nowait()
+        except queue.Empty:
+            return
+        elapsed = time.perf_counter() - started
+        detail = f" in {wall_time}s" if wall_time is not None else ""
+        print(f"[{elapsed:7.1f}s] {name}: {status}{detail}", flush=True)
+
+
+def run_parallel(
+    names: list[str],
+    apply: bool,
+    trials: int,
+    workers: int,
+    llm_rpm: float = 0,
+    resume: bool = False,
+    patience: int = 2,
+    min_delta: float = 0.01,
+) -> list[dict]:
+    """Run optimizers in separate processes sharing one LLM requests-per-minute budget.
+
+    Results come back in `names` order regardless of completion order.
+    """
+    from meraki_flow.optimization.rate_budget import SharedRateBudget
+
+    started = time.perf_counter()
+    results: dict[str, dict | None] = {}
+    with Manager() as manager:
+        budget = SharedRateBudget(manager, llm_rpm) if llm_rpm > 0 else None
+        events = manager.Queue()
+        with ProcessPoolExecutor(max_workers=min(workers, len(names))) as pool:
+            futures = {
+                pool.submit(_run_optimizer_worker, name, apply, trials, resume, patience, min_delta, budget, events): name
+                for name in names
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=2, return_when=FIRST_COMPLETED)
+                _print_events(events, started)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        # The worker process itself died
+                        results[name] = {"name": name, "status": "failed", "error": f"worker failed: {e}"}
+                        print(f"[{time.perf_counter() - started:7.1f}s] {name}: worker failed: {e}", flush=True)
+        _print_events(events, started)
+
+    return [results[name] for name in names if results.get(name)]
+
+
+def run_sequential(
+    names: list[str],
+    apply: bool,
+    trials: int,
+    llm_rpm: float = 0,
+    resume: bool = False,
+    patience: int = 2,
+    min_delta: float = 0.01,
+) -> list[dict]:
+    """Run optimizers one after another in this process, under the LLM budget if set."""
+    from meraki_flow.optimization.rate_budget import SharedRateBudget, install_litellm_throttle
+
+    results = []
+    # The budget's manager process lives exactly as long as the runs
+    with Manager() if llm_rpm > 0 else nullcontext() as manager:
+        if manager is not None:
+            install_litellm_throttle(SharedRateBudget(manager, llm_rpm))
+        for name in names:
+            result = run_optimizer(name, apply=apply, trials=trials, resume=resume,
+                                   patience=patience, min_delta=min_delta)
+            if result:
+                results.append(result)
+    return results
+
+
 def print_summary(results: list[dict]) -> None:
     """Print a summary table of all optimization results."""
     print(f"\n{'='*60}")
@@ -96,22 +221,44 @@ def main():
     parser.add_argument("--only", nargs="+", choices=list(OPTIMIZERS.keys()),
                         help="Only run specific optimizers")
     parser.add_argument("--trials", type=int, default=10, help="Trials per optimizer")
+    parser.add_argument("--workers", type=int, default=len(OPTIMIZERS),
+                        help="Optimizers run concurrently (1 = sequential, in-process)")
+    parser.add_argument("--llm-rpm", type=float, default=0,
+                        help="Global LLM requests per minute shared by all optimizers (0 = unlimited)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume each optimizer from its checkpoint in results/")
+    parser.add_argument("--patience", type=int, default=2,
+                        help="Stop an optimizer after this many rounds without improvement (0 = use all trials)")
+    parser.add_argument("--min-delta", type=float, default=0.01,
+                        help="Smallest full-dataset score gain that counts as an improvement")
+    parser.add_argument("--llm-cache", action="store_true",
+                        help="Serve identical LLM requests from the local response cache (same as MERAKI_LLM_CACHE=1)")
     args = parser.parse_args()
+    if args.llm_cache:
+        # Set in the environment so optimizer worker processes pick it up too
+        os.environ["MERAKI_LLM_CACHE"] = "1"
 
     to_run = args.only or list(OPTIMIZERS.keys())
 
     print(f"Meraki Agent Optimization")
     print(f"Running: {', '.join(to_run)}")
-    print(f"Trials per optimizer: {args.trials}")
+    print(f"Trials per optimizer: up to {args.trials} (patience {args.patience}, min delta {args.min_delta})")
     print(f"Apply results: {args.apply}")
+    print(f"Resume from checkpoints: {args.resume}")
+    print(f"Workers: {args.workers}, LLM budget: {args.llm_rpm or 'unlimited'} rpm")
 
-    results = []
-    for name in to_run:
-        result = run_optimizer(name, apply=args.apply, trials=args.trials)
-        if result:
-            results.append(result)
+    started = time.perf_counter()
+    if args.workers > 1 and len(to_run) > 1:
+        results = run_parallel(to_run, args.apply, args.trials, args.workers, args.llm_rpm, args.resume,
+                               args.patience, args.min_delta)
+    else:
+        results = run_sequential(to_run, args.apply, args.trials, args.llm_rpm, args.resume,
+                                 args.patience, args.min_delta)
+    total_wall_time = time.perf_counter() - started
 
     print_summary(results)
+    optimizer_time = sum(r.get("wall_time_s") or 0 for r in results)
+    print(f"Total wall time: {total_wall_time:.1f}s (sum of optimizer time: {optimizer_time:.1f}s)")
 
     # Save summary
     RESULTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -122,6 +269,12 @@ def main():
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "applied": args.apply,
             "trials_per_optimizer": args.trials,
+            "patience": args.patience,
+            "min_delta": args.min_delta,
+            "workers": args.workers,
+            "llm_rpm": args.llm_rpm,
+            "resumed": args.resume,
+            "wall_time_s": round(total_wall_time, 1),
             "results": results,
         }, f, indent=2, default=str)
 
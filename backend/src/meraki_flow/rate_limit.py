@@ -0,0 +1,246 @@
+"""
+Token-bucket rate limits for the job submission endpoints.
+
+Every submitted job costs several LLM calls, so each POST that starts a crew
+takes a token from two buckets before the job is created (from both or,
+when either is empty, from neither):
+
+- a per-user bucket keyed on `user_id` (requests without one share a bucket
+  per client address, with its own limit), shared by all job types, so one
+  runaway client can't flood the queue;
+- a global bucket per job type, which caps the total spend of that job type
+  no matter how many users submit it.
+
+A rejected request gets HTTP 429 with a Retry-After header. Buckets live in
+process memory by default; with several API replicas set
+RATE_LIMIT_BACKEND=supabase to share them through the take_rate_limit_tokens
+RPC (migration 015), or plug in another RateLimitStore with
+set_rate_limiter(). A shared store that errors lets the request through
+rather than failing every submission.
+
+Settings (env vars), all in requests per minute; 0 disables a limit:
+    RATE_LIMIT_USER_PER_MIN          per user_id (default 10, burst RATE_LIMIT_USER_BURST=5)
+    RATE_LIMIT_ANONYMOUS_PER_MIN     per client without user_id (default 30, burst 15)
+    RATE_LIMIT_<JOB_TYPE>_PER_MIN    global per job type, e.g. RATE_LIMIT_DISCOVERY_PER_MIN
+                                     (defaults in DEFAULT_GLOBAL_LIMITS_PER_MIN, burst one minute's worth)
+    RATE_LIMIT_BACKEND               "memory" (default) or "supabase"
+"""
+
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+from meraki_flow import async_db
+
+DEFAULT_GLOBAL_LIMITS_PER_MIN: dict[str, float] = {
+    "discovery": 120,
+    "discovery_batch": 6,
+    "sampling_preview": 120,
+    "local_experiences": 120,
+    "practice_feedback": 120,
+    "challenge_generation": 60,
+    "motivation_check": 60,
+    "roadmap_generation": 30,
+}
+
+
+class Limit:
+    """Bucket size and refill rate of one token bucket."""
+
+    def __init__(self, per_min: float, burst: float | None = None):
+        self.per_min = per_min
+        self.capacity = burst if burst is not None else per_min
+        self.refill_per_s = per_min / 60
+
+    @property
+    def enabled(self) -> bool:
+        return self.per_min > 0 and self.capacity > 0
+
+
+def _env_limit(name: str, per_min: float, burst: float | None = None) -> Limit:
+    per_min = float(os.environ.get(f"{name}_PER_MIN", per_min))
+    burst_env = os.environ.get(f"{name}_BURST")
+    return Limit(per_min, float(burst_env) if burst_env else burst)
+
+
+def global_limit(job_type: str) -> Limit:
+    """Global limit for a job type (env override, then default, then 60/min)."""
+    return _env_limit(
+        f"RATE_LIMIT_{job_type.upper()}",
+        DEFAULT_GLOBAL_LIMITS_PER_MIN.get(job_type, 60),
+    )
+
+
+class RateLimited(Exception):
+    """Raised when a bucket has no token left for the request."""
+
+    def __init__(self, scope: str, job_type: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded ({scope}) for {job_type}; retry in {retry_after:.0f}s")
+        self.scope = scope
+        self.job_type = job_type
+        self.retry_after = retry_after
+
+
+class RateLimitStore(ABC):
+    """Backend holding the token buckets."""
+
+    @abstractmethod
+    async def take(self, buckets: list[tuple[str, Limit]], cost: float = 1) -> list[float]:
+        """Take `cost` tokens from every (key, limit) bucket, or from none.
+
+        Returns one wait per bucket in seconds: all 0 if the tokens were
+        taken, else how long each bucket needs until it has enough.
+        """
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Buckets in process memory; each replica enforces its own limits."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, buckets: list[tuple[str, Limit]], cost: float = 1) -> list[float]:
+        now = time.monotonic()
+        with self._lock:
+            available = []
+            for key, limit in buckets:
+                tokens, updated = self._buckets.get(key, (limit.capacity, now))
+                available.append(min(limit.capacity, tokens + (now - updated) * limit.refill_per_s))
+            waits = [
+                max(0.0, (cost - tokens) / limit.refill_per_s)
+                for tokens, (_, limit) in zip(available, buckets)
+            ]
+            taken = cost if not any(waits) else 0
+            for tokens, (key, _) in zip(available, buckets):
+                self._buckets[key] = (tokens - taken, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune()
+            return waits
+
+    def _prune(self) -> None:
+        # Drop the least recently used half; a forgotten bucket just starts full again
+        by_age = sorted(self._buckets, key=lambda k: self._buckets[k][1])
+        for key in by_age[: len(by_age) // 2]:
+            del self._buckets[key]
+
+
+class SupabaseRateLimitStore(RateLimitStore):
+    """Buckets in the rate_limit_buckets table, shared by every replica."""
+
+    async def take(self, buckets: list[tuple[str, Limit]], cost: float = 1) -> list[float]:
+        sb = await async_db.get_async_supabase()
+        resp = await sb.rpc("take_rate_limit_tokens", {
+            "p_keys": [key for key, _ in buckets],
+            "p_capacities": [limit.capacity for _, limit in buckets],
+            "p_refills_per_s": [limit.refill_per_s for _, limit in buckets],
+            "p_cost": cost,
+        }).execute()
+        return [float(wait or 0) for wait in resp.data or [0.0] * len(buckets)]
+
+
+class RateLimiter:
+    """Checks the per-user and global per-job-type buckets for a submission."""
+
+    def __init__(
+        self,
+        store: RateLimitStore,
+        user_limit: Limit,
+        anonymous_limit: Limit,
+        global_limits: dict[str, Limit] | None = None,
+    ):
+        self.store = store
+        self.user_limit = user_limit
+        self.anonymous_limit = anonymous_limit
+        self.global_limits = global_limits or {}
+        self._allowed: dict[str, int] = {}
+        self._rejected: dict[str, dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _global_limit(self, job_type: str) -> Limit:
+        if job_type not in self.global_limits:
+            self.global_limits[job_type] = global_limit(job_type)
+        return self.global_limits[job_type]
+
+    async def check(self, job_type: str, user_id: str = "", client: str = "", cost: float = 1) -> None:
+        """Take `cost` tokens for one submission, or raise RateLimited.
+
+        Tokens are taken from the user's and the job type's bucket together,
+        so a request rejected by one bucket never uses up the other.
+        """
+        if user_id:
+            checks = [("user", f"user:{user_id}", self.user_limit)]
+        else:
+            checks = [("anonymous", f"anon:{client or 'unknown'}", self.anonymous_limit)]
+        checks.append(("global", f"global:{job_type}", self._global_limit(job_type)))
+        checks = [(scope, key, limit) for scope, key, limit in checks if limit.enabled]
+        if not checks:
+            self._count(job_type)
+            return
+
+        try:
+            waits = await self.store.take([(key, limit) for _, key, limit in checks], cost)
+        except Exception as e:
+            print(f"[RateLimit] Store error for {job_type}, allowing request: {e}")
+            waits = [0.0] * len(checks)
+
+        wait, scope = max(zip(waits, (scope for scope, _, _ in checks)))
+        if wait > 0:
+            self._count(job_type, scope)
+            raise RateLimited(scope, job_type, wait)
+        self._count(job_type)
+
+    def _count(self, job_type: str, rejected_scope: str = "") -> None:
+        with self._stats_lock:
+            if rejected_scope:
+                by_scope = self._rejected.setdefault(job_type, {})
+                by_scope[rejected_scope] = by_scope.get(rejected_scope, 0) + 1
+            else:
+                self._allowed[job_type] = self._allowed.get(job_type, 0) + 1
+
+    def stats(self) -> dict[str, Any]:
+        """Allowed and rejected submissions per job type since startup."""
+        with self._stats_lock:
+            job_types = sorted(set(self._allowed) | set(self._rejected))
+            return {
+                "backend": type(self.store).__name__,
+                "user_per_min": self.user_limit.per_min,
+                "job_types": {
+                    job_type: {
+                        "global_per_min": self._global_limit(job_type).per_min,
+                        "allowed": self._allowed.get(job_type, 0),
+                        "rejected": dict(self._rejected.get(job_type, {})),
+                    }
+                    for job_type in job_types
+                },
+            }
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter configured from env vars."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                backend = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()
+                store = SupabaseRateLimitStore() if backend == "supabase" else MemoryRateLimitStore()
+                _limiter = RateLimiter(
+                    store,
+                    user_limit=_env_limit("RATE_LIMIT_USER", 10, burst=5),
+                    anonymous_limit=_env_limit("RATE_LIMIT_ANONYMOUS", 30, burst=15),
+                )
+    return _limiter
+
+
+def set_rate_limiter(limiter: RateLimiter | None) -> None:
+    """Replace the process-wide limiter (e.g. with a custom shared store)."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
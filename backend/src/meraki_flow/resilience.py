@@ -0,0 +1,323 @@
+"""
+Retries and hedged requests for crew LLM calls.
+
+A transient provider error (rate limit, 5xx, timeout, dropped connection)
+used to fail the whole job. kickoff_with_usage now wraps every agent LLM so
+a failed call is retried in place, after a jittered exponential backoff
+("full jitter": a random delay up to base * 2^attempt, capped), and honors
+the provider's Retry-After. The task it belongs to carries on from where it
+was, and the crew keeps every task it already finished. Other errors
+propagate unchanged.
+
+Hedging (optional, off by default) targets the latency-critical final task:
+once the earlier tasks are done, a final-task call that hasn't answered
+within LLM_HEDGE_AFTER_S seconds gets a second, identical request, and the
+first answer wins. The loser is not aborted (providers bill it anyway). An
+LLM call may also execute the tools it asks for, so a hedge or a retry can
+repeat a tool call. Hedges run on a pool of JOB_WORKERS threads; while all of
+them are busy (a slow provider) calls are not hedged, so hedging never
+queues work or adds load when the provider is struggling.
+
+Inside a job, backoff sleeps and hedged waits stop at the job's deadline and
+end early when the job is cancelled, and hedged attempts run with the job's
+context (see cancellation.py).
+
+Settings (env vars):
+    LLM_MAX_RETRIES       retries per LLM call (default 3, 0 = off)
+    LLM_RETRY_BASE_S      backoff base in seconds (default 1)
+    LLM_RETRY_MAX_S       max backoff in seconds (default 30)
+    LLM_HEDGE_AFTER_S     hedge final-task calls slower than this (default 0 = off)
+"""
+
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from meraki_flow.cancellation import JobContext, current_job, run_as_job
+
+# Exception class names (OpenAI SDK, LiteLLM, httpx) worth retrying when the
+# error carries no HTTP status
+_RETRYABLE_ERRORS = {
+    "RateLimitError",
+    "APIConnectionError",
+    "APITimeoutError",
+    "InternalServerError",
+    "ServiceUnavailableError",
+    "Timeout",
+    "ConnectError",
+    "ReadTimeout",
+    "RemoteProtocolError",
+}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for rate limits, 408/409/5xx responses and connection errors."""
+    for e in (error, error.__cause__):
+        if e is None:
+            continue
+        status = getattr(e, "status_code", None)
+        if not isinstance(status, int):
+            status = getattr(getattr(e, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status in (408, 409, 429) or status >= 500
+        if type(e).__name__ in _RETRYABLE_ERRORS:
+            return True
+    return False
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds from the response's Retry-After header, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for retry number `attempt` (0-based)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class ResilienceStats:
+    """Thread-safe counters of retries and hedges."""
+
+    def __init__(self, parent: "ResilienceStats | None" = None):
+        self._lock = threading.Lock()
+        self.parent = parent
+        self.retries = 0
+        self.recovered = 0
+        self.exhausted = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedge_saved_s = 0.0
+        self.hedge_saved_max_s = 0.0
+
+    def add(self, **counts: float) -> None:
+        with self._lock:
+            for name, value in counts.items():
+                if name == "hedge_saved_s":
+                    self.hedge_saved_max_s = max(self.hedge_saved_max_s, value)
+                setattr(self, name, getattr(self, name) + value)
+        if self.parent is not None:
+            self.parent.add(**counts)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "llm_retries": self.retries,
+                "llm_retry_recovered": self.recovered,
+                "llm_retry_exhausted": self.exhausted,
+                "llm_hedged_calls": self.hedged,
+                "llm_hedge_wins": self.hedge_wins,
+                "hedge_saved_s": round(self.hedge_saved_s, 3),
+                "hedge_saved_max_s": round(self.hedge_saved_max_s, 3),
+            }
+
+
+RESILIENCE_STATS = ResilienceStats()
+
+# How often a waiting job thread checks for DELETE /jobs/{job_id}
+CANCEL_POLL_S = 0.5
+
+_hedge_pool: ThreadPoolExecutor | None = None
+_hedge_slots: threading.BoundedSemaphore | None = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool() -> tuple[ThreadPoolExecutor, threading.BoundedSemaphore]:
+    """The shared hedge pool (JOB_WORKERS threads) and its free-thread slots."""
+    global _hedge_pool, _hedge_slots
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                workers = int(os.environ.get("JOB_WORKERS", "8"))
+                _hedge_slots = threading.BoundedSemaphore(workers)
+                _hedge_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-hedge")
+    return _hedge_pool, _hedge_slots
+
+
+def _start_primary(job: JobContext | None, call: Callable, args: tuple, kwargs: dict) -> Future:
+    """Run the primary attempt on its own thread, so it never queues behind hedges."""
+    future: Future = Future()
+    # Copy the context so tracing spans (contextvars) follow the call
+    context = contextvars.copy_context()
+
+    def run():
+        try:
+            future.set_result(context.run(run_as_job, job, call, *args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="llm-primary", daemon=True).start()
+    return future
+
+
+def _wait_first(futures, timeout: float | None, job: JobContext | None):
+    """wait() for the first of `futures` for up to `timeout` seconds (None = until one is done).
+
+    Inside a job, waits in slices bounded by its remaining time and checks it
+    in between, raising JobCancelled on cancel or at the deadline.
+    """
+    until = None if timeout is None else time.monotonic() + timeout
+    while True:
+        slice_s = None if until is None else max(0.0, until - time.monotonic())
+        if job is not None:
+            job.check()
+            bound = min(CANCEL_POLL_S, job.remaining())
+            slice_s = bound if slice_s is None else min(slice_s, bound)
+        done, pending = wait(futures, timeout=slice_s, return_when=FIRST_COMPLETED)
+        if done or (until is not None and time.monotonic() >= until):
+            return done, pending
+
+
+def hedged_call(
+    call: Callable,
+    args: tuple,
+    kwargs: dict,
+    hedge_after: float,
+    stats: ResilienceStats,
+    job: JobContext | None = None,
+) -> Any:
+    """Run `call`; if it hasn't returned after `hedge_after` seconds, race a duplicate.
+
+    The primary gets its own thread and the hedge a thread of the shared pool;
+    no hedge is sent while the pool is fully busy. Both run with `job` as their
+    current job. Returns the first successful answer; raises only if both
+    attempts fail, or JobCancelled if `job` is cancelled or times out first.
+    """
+    start = time.perf_counter()
+    primary = _start_primary(job, call, args, kwargs)
+    done, _ = _wait_first([primary], hedge_after, job)
+    if done:
+        return primary.result()
+
+    pool, slots = _get_hedge_pool()
+    if not slots.acquire(blocking=False):
+        _wait_first([primary], None, job)
+        return primary.result()
+    stats.add(hedged=1)
+    hedge = pool.submit(contextvars.copy_context().run, run_as_job, job, call, *args, **kwargs)
+    hedge.add_done_callback(lambda _: slots.release())
+    pending = {primary, hedge}
+    error: BaseException | None = None
+    while pending:
+        done, pending = _wait_first(pending, None, job)
+        for future in done:
+            if future.exception() is not None:
+                error = error or future.exception()
+                continue
+            if future is hedge:
+                won_at = time.perf_counter() - start
+
+                def record_saved(f, won_at=won_at):
+                    # Only known once the slow primary finishes
+                    if f.exception() is None:
+                        stats.add(hedge_saved_s=time.perf_counter() - start - won_at)
+
+                stats.add(hedge_wins=1)
+                primary.add_done_callback(record_saved)
+            return future.result()
+    raise error
+
+
+def resilient(
+    call: Callable,
+    stats: ResilienceStats,
+    max_retries: int,
+    base: float,
+    cap: float,
+    hedge_after: Callable[[], float] | None = None,
+) -> Callable:
+    """Wrap an LLM `call` with retries and, when `hedge_after()` > 0, hedging."""
+    # Captured now because CrewAI may run agents in helper threads
+    job = current_job()
+
+    def _call(*args, **kwargs):
+        attempt = 0
+        while True:
+            delay = hedge_after() if hedge_after else 0
+            try:
+                if delay > 0:
+                    result = hedged_call(call, args, kwargs, delay, stats, job)
+                else:
+                    result = call(*args, **kwargs)
+            except Exception as e:
+                if attempt >= max_retries or not is_retryable(e):
+                    if attempt:
+                        stats.add(exhausted=1)
+                    raise
+                wait_s = max(backoff_delay(attempt, base, cap), min(retry_after(e) or 0, cap))
+                print(f"[LLM] {type(e).__name__}, retry {attempt + 1}/{max_retries} in {wait_s:.1f}s")
+                stats.add(retries=1)
+                attempt += 1
+                if job is not None:
+                    job.sleep(wait_s)
+                else:
+                    time.sleep(wait_s)
+                continue
+            if attempt:
+                stats.add(recovered=1)
+            return result
+
+    return _call
+
+
+def _on_task_done(task: Any, done: Callable[[], None]) -> None:
+    previous = getattr(task, "callback", None)
+
+    def callback(output):
+        done()
+        if previous is not None:
+            return previous(output)
+
+    object.__setattr__(task, "callback", callback)
+
+
+def make_llm_calls_resilient(crew: Any) -> ResilienceStats:
+    """Add retries (and final-task hedging, if enabled) to every agent LLM in `crew`.
+
+    Returns the crew run's stats; they also count towards RESILIENCE_STATS.
+    """
+    stats = ResilienceStats(parent=RESILIENCE_STATS)
+    max_retries = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+    base = float(os.environ.get("LLM_RETRY_BASE_S", "1"))
+    cap = float(os.environ.get("LLM_RETRY_MAX_S", "30"))
+    hedge_s = float(os.environ.get("LLM_HEDGE_AFTER_S", "0"))
+
+    hedge_after = None
+    tasks = list(getattr(crew, "tasks", []) or [])
+    if hedge_s > 0 and tasks:
+        # Hedge only once every task before the final one has completed
+        remaining = [len(tasks) - 1]
+        lock = threading.Lock()
+
+        def task_done():
+            with lock:
+                remaining[0] -= 1
+
+        for task in tasks[:-1]:
+            _on_task_done(task, task_done)
+
+        def hedge_after():
+            return hedge_s if remaining[0] <= 0 else 0
+
+    seen: set[int] = set()
+    for agent in getattr(crew, "agents", []) or []:
+        llm = getattr(agent, "llm", None)
+        if llm is None or not hasattr(llm, "call") or id(llm) in seen:
+            continue
+        seen.add(id(llm))
+        # Same per-instance hook as usage.wrap_llm_call (which imports this module)
+        object.__setattr__(llm, "call", resilient(llm.call, stats, max_retries, base, cap, hedge_after))
+
+    return stats
+
+
+def resilience_metrics() -> dict[str, Any]:
+    """Process-wide retry and hedging counters since startup."""
+    return RESILIENCE_STATS.as_dict()
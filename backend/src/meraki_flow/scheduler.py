@@ -0,0 +1,178 @@
+"""
+Priority-aware scheduler for background crew jobs.
+
+Every job endpoint queues its run_*_job here instead of spawning a thread.
+A fixed pool of worker threads always picks the most urgent queued job:
+
+- Priority classes: "interactive" (a user is waiting on the page),
+  "standard", and "background" (nudges, roadmaps, bulk discovery).
+- Starvation protection: a queued job gains one class of priority for every
+  JOB_AGING_S seconds it waits, so background work still runs under load.
+- Per-class concurrency caps: background and standard jobs can never occupy
+  every worker, so a new interactive job always finds a free one soon.
+
+Settings (env vars):
+    JOB_WORKERS              worker threads (default 8)
+    JOB_CAP_INTERACTIVE      max concurrent interactive jobs (default JOB_WORKERS)
+    JOB_CAP_STANDARD         max concurrent standard jobs (default JOB_WORKERS // 2)
+    JOB_CAP_BACKGROUND       max concurrent background jobs (default JOB_WORKERS // 4)
+    JOB_AGING_S              seconds of waiting worth one priority class (default 30)
+"""
+
+import itertools
+import os
+import threading
+import time
+from typing import Any, Callable
+
+PRIORITY_CLASSES = ("interactive", "standard", "background")
+
+JOB_PRIORITIES: dict[str, str] = {
+    "discovery": "interactive",
+    "sampling_preview": "interactive",
+    "local_experiences": "interactive",
+    "practice_feedback": "interactive",
+    "challenge_generation": "standard",
+    "motivation_check": "background",
+    "roadmap_generation": "background",
+}
+
+
+def priority_class(job_type: str) -> str:
+    return JOB_PRIORITIES.get(job_type, "standard")
+
+
+class _QueuedJob:
+    def __init__(self, seq: int, job_type: str, cls: str, fn: Callable, args: tuple):
+        self.seq = seq
+        self.job_type = job_type
+        self.cls = cls
+        self.fn = fn
+        self.args = args
+        self.queued_at = time.monotonic()
+
+
+class JobScheduler:
+    """Fixed worker pool that dispatches queued jobs by aged priority under per-class caps."""
+
+    def __init__(
+        self,
+        workers: int = 8,
+        caps: dict[str, int] | None = None,
+        aging_s: float = 30.0,
+    ):
+        self.workers = workers
+        self.caps = {cls: workers for cls in PRIORITY_CLASSES}
+        self.caps.update(caps or {})
+        self.aging_s = aging_s
+        self._cond = threading.Condition()
+        self._queue: list[_QueuedJob] = []
+        self._running = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._started = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._wait_total = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._wait_max = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, job_type: str, fn: Callable, *args: Any, cls: str | None = None) -> None:
+        """Queue `fn(*args)`; `cls` overrides the job type's priority class."""
+        cls = cls or priority_class(job_type)
+        if cls not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {cls}")
+        with self._cond:
+            self._start_workers()
+            self._queue.append(_QueuedJob(next(self._seq), job_type, cls, fn, args))
+            self._cond.notify()
+
+    def _start_workers(self) -> None:
+        # Lazily, so importing the API (or tests) doesn't spawn threads
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(
+                target=self._work,
+                name=f"job-worker-{len(self._threads)}",
+                daemon=True,
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _urgency(self, job: _QueuedJob, now: float) -> tuple[float, int]:
+        rank = PRIORITY_CLASSES.index(job.cls)
+        aged = (now - job.queued_at) / self.aging_s if self.aging_s > 0 else 0.0
+        return rank - aged, job.seq
+
+    def _next_job(self) -> _QueuedJob | None:
+        """Most urgent queued job whose class is under its cap (caller holds the lock)."""
+        now = time.monotonic()
+        eligible = [j for j in self._queue if self._running[j.cls] < self.caps[j.cls]]
+        if not eligible:
+            return None
+        job = min(eligible, key=lambda j: self._urgency(j, now))
+        self._queue.remove(job)
+        return job
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                self._running[job.cls] += 1
+                self._started[job.cls] += 1
+                waited = time.monotonic() - job.queued_at
+                self._wait_total[job.cls] += waited
+                self._wait_max[job.cls] = max(self._wait_max[job.cls], waited)
+            try:
+                job.fn(*job.args)
+            except Exception as e:
+                print(f"[Scheduler] {job.job_type} job crashed: {e!r}")
+            finally:
+                with self._cond:
+                    self._running[job.cls] -= 1
+                    self._cond.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, running count, caps and wait times per priority class."""
+        with self._cond:
+            queued = {cls: 0 for cls in PRIORITY_CLASSES}
+            for job in self._queue:
+                queued[job.cls] += 1
+            return {
+                "workers": self.workers,
+                "aging_s": self.aging_s,
+                "classes": {
+                    cls: {
+                        "cap": self.caps[cls],
+                        "queued": queued[cls],
+                        "running": self._running[cls],
+                        "started": self._started[cls],
+                        "avg_wait_s": round(self._wait_total[cls] / max(1, self._started[cls]), 3),
+                        "max_wait_s": round(self._wait_max[cls], 3),
+                    }
+                    for cls in PRIORITY_CLASSES
+                },
+            }
+
+
+_scheduler: JobScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """Return the process-wide scheduler configured from env vars."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                workers = int(os.environ.get("JOB_WORKERS", "8"))
+                caps = {
+                    "interactive": int(os.environ.get("JOB_CAP_INTERACTIVE", workers)),
+                    "standard": int(os.environ.get("JOB_CAP_STANDARD", max(1, workers // 2))),
+                    "background": int(os.environ.get("JOB_CAP_BACKGROUND", max(1, workers // 4))),
+                }
+                _scheduler = JobScheduler(
+                    workers=workers,
+                    caps=caps,
+                    aging_s=float(os.environ.get("JOB_AGING_S", "30")),
+                )
+    return _scheduler
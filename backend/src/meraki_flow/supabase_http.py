@@ -0,0 +1,192 @@
+"""
+Tuned HTTP transport for the Supabase clients.
+
+The sync client in db.py (shared by every job thread) and the async client in
+async_db.py (shared by the API handlers) each get one httpx client from here:
+a bounded connection pool with keep-alive, HTTP/2 multiplexing, and explicit
+connect/read/write/pool timeouts so a slow Supabase never hangs a job forever.
+
+A thin transport wrapper counts in-flight requests, latency and pool timeouts
+per client, reported by `pool_metrics()` (exposed on GET /metrics). A rising
+`pool_timeouts` count, or `peak_in_flight` pinned at `max_connections`, means
+the pool is saturated and SUPABASE_MAX_CONNECTIONS should go up.
+
+Settings (env vars):
+    SUPABASE_MAX_CONNECTIONS     pool size per client (default 20)
+    SUPABASE_MAX_KEEPALIVE       idle connections kept open (default 10)
+    SUPABASE_KEEPALIVE_EXPIRY    seconds an idle connection is kept (default 30)
+    SUPABASE_HTTP2               "0" to fall back to HTTP/1.1 (default on)
+    SUPABASE_CONNECT_TIMEOUT     seconds (default 5)
+    SUPABASE_READ_TIMEOUT        seconds (default 30)
+    SUPABASE_WRITE_TIMEOUT       seconds (default 30)
+    SUPABASE_POOL_TIMEOUT        seconds to wait for a free connection (default 10)
+"""
+
+import os
+import threading
+import time
+from typing import Any
+
+import httpx
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_env_int("SUPABASE_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=_env_int("SUPABASE_MAX_KEEPALIVE", 10),
+        keepalive_expiry=_env_float("SUPABASE_KEEPALIVE_EXPIRY", 30.0),
+    )
+
+
+def request_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=_env_float("SUPABASE_CONNECT_TIMEOUT", 5.0),
+        read=_env_float("SUPABASE_READ_TIMEOUT", 30.0),
+        write=_env_float("SUPABASE_WRITE_TIMEOUT", 30.0),
+        pool=_env_float("SUPABASE_POOL_TIMEOUT", 10.0),
+    )
+
+
+def http2_enabled() -> bool:
+    return os.environ.get("SUPABASE_HTTP2", "1") != "0"
+
+
+# ─── Pool metrics ───
+
+class PoolStats:
+    """Thread-safe request counters for one httpx client."""
+
+    def __init__(self, max_connections: int = 0):
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.requests = 0
+            self.errors = 0
+            self.timeouts = 0
+            self.pool_timeouts = 0
+            self.total_seconds = 0.0
+            self.max_seconds = 0.0
+
+    def begin(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.perf_counter()
+
+    def end(self, started: float, error: Exception | None = None) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+            if isinstance(error, httpx.PoolTimeout):
+                self.pool_timeouts += 1
+            elif isinstance(error, httpx.TimeoutException):
+                self.timeouts += 1
+            elif error is not None:
+                self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "requests": self.requests,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "pool_timeouts": self.pool_timeouts,
+                "avg_ms": round(1000 * self.total_seconds / self.requests, 1) if self.requests else 0.0,
+                "max_ms": round(1000 * self.max_seconds, 1),
+            }
+
+
+POOL_STATS = {"sync": PoolStats(), "async": PoolStats()}
+
+
+def pool_metrics() -> dict[str, Any]:
+    """Snapshot of both Supabase clients' pool counters."""
+    return {
+        "http2": http2_enabled(),
+        **{name: stats.snapshot() for name, stats in POOL_STATS.items()},
+    }
+
+
+class _MeteredTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.BaseTransport, stats: PoolStats):
+        self._transport = transport
+        self._stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        started = self._stats.begin()
+        try:
+            response = self._transport.handle_request(request)
+        except Exception as e:
+            self._stats.end(started, e)
+            raise
+        self._stats.end(started)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class _AsyncMeteredTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: PoolStats):
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = self._stats.begin()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except Exception as e:
+            self._stats.end(started, e)
+            raise
+        self._stats.end(started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+# ─── Client factories ───
+
+def sync_http_client() -> httpx.Client:
+    """httpx client for the shared sync Supabase client (job threads)."""
+    limits = pool_limits()
+    stats = POOL_STATS["sync"]
+    stats.max_connections = limits.max_connections
+    transport = httpx.HTTPTransport(limits=limits, http2=http2_enabled())
+    return httpx.Client(
+        transport=_MeteredTransport(transport, stats),
+        timeout=request_timeout(),
+        follow_redirects=True,
+    )
+
+
+def async_http_client() -> httpx.AsyncClient:
+    """httpx client for the shared async Supabase client (API handlers)."""
+    limits = pool_limits()
+    stats = POOL_STATS["async"]
+    stats.max_connections = limits.max_connections
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2_enabled())
+    return httpx.AsyncClient(
+        transport=_AsyncMeteredTransport(transport, stats),
+        timeout=request_timeout(),
+        follow_redirects=True,
+    )
@@ -11,6 +11,8 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from meraki_flow.cancellation import call_timeout, check_cancelled
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -76,6 +78,7 @@ class GooglePlacesTool(BaseTool):
             seen_place_ids = set()
 
             for query in search_queries:
+                check_cancelled()
                 try:
                     places = self._search_places(api_key, query, max_results)
                 except Exception as e:
@@ -117,7 +120,7 @@ class GooglePlacesTool(BaseTool):
             "type": "establishment",
         }
 
-        response = requests.get(url, params=params, timeout=30)
+        response = requests.get(url, params=params, timeout=call_timeout(30))
         response.raise_for_status()
         data = response.json()
 
@@ -11,6 +11,8 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from meraki_flow.cancellation import call_timeout, check_cancelled
+
 try:
     from ddgs import DDGS
     DDGS_AVAILABLE = True
@@ -47,6 +49,7 @@ class WebSearchTool(BaseTool):
         Returns:
             JSON string with search results
         """
+        check_cancelled()
         if not DDGS_AVAILABLE:
             return json.dumps({
                 "error": "ddgs not installed. Run: pip install ddgs",
@@ -56,7 +59,7 @@ class WebSearchTool(BaseTool):
         try:
             results = []
 
-            with DDGS() as ddgs:
+            with DDGS(timeout=int(call_timeout(10))) as ddgs:
                 search_results = list(ddgs.text(
                     query,
                     max_results=max_results * 2,  # Get more to filter
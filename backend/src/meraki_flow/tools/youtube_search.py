@@ -11,6 +11,8 @@ from typing import Type
 from pydantic import BaseModel, Field
 from crewai.tools import BaseTool
 
+from meraki_flow.cancellation import check_cancelled
+
 try:
     from googleapiclient.discovery import build
     from googleapiclient.errors import HttpError
@@ -48,6 +50,7 @@ class YouTubeSearchTool(BaseTool):
         Returns:
             JSON string with video information
         """
+        check_cancelled()
         api_key = os.getenv("YOUTUBE_API_KEY")
 
         if not api_key:
@@ -0,0 +1,211 @@
+"""
+LLM token and cost accounting for crew runs.
+
+Wraps each agent's LLM so every call is counted and timed, then combines
+those numbers with the crew's own usage metrics (prompt/completion tokens)
+and its retry/hedging counters into a plain dict that is persisted alongside
+the job result.
+"""
+
+import threading
+import time
+from typing import Any
+
+from meraki_flow.cancellation import check_cancelled, guard_llm_calls
+from meraki_flow.resilience import make_llm_calls_resilient
+
+# Approximate USD prices per 1M tokens: (prompt, completion).
+# Only used for rough cost estimates on the /metrics surface.
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+class LLMCallStats:
+    """Thread-safe counter of LLM calls and the wall time spent in them."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.wall_time = 0.0
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.wall_time += elapsed
+
+
+def _llm_of(agent: Any) -> Any:
+    llm = getattr(agent, "llm", None)
+    return llm if llm is not None and hasattr(llm, "call") else None
+
+
+def wrap_llm_call(llm: Any, wrapper) -> None:
+    """Replace `llm.call` on this instance with `wrapper(original_call)`.
+
+    Uses object.__setattr__ so it also works on pydantic-backed LLM classes.
+    """
+    object.__setattr__(llm, "call", wrapper(llm.call))
+
+
+def track_llm_calls(crew: Any) -> LLMCallStats:
+    """Instrument every agent LLM in `crew` and return the shared stats object."""
+    stats = LLMCallStats()
+    seen: set[int] = set()
+
+    def timed(call):
+        def _call(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                stats.record(time.perf_counter() - start)
+        return _call
+
+    for agent in getattr(crew, "agents", []) or []:
+        llm = _llm_of(agent)
+        if llm is None or id(llm) in seen:
+            continue
+        seen.add(id(llm))
+        wrap_llm_call(llm, timed)
+
+    return stats
+
+
+def crew_model_name(crew: Any) -> str:
+    """Return the model name(s) used by the crew's agents."""
+    models = []
+    for agent in getattr(crew, "agents", []) or []:
+        llm = getattr(agent, "llm", None)
+        model = getattr(llm, "model", None) or (llm if isinstance(llm, str) else None)
+        if model and model not in models:
+            models.append(str(model))
+    return ",".join(models)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate USD cost from token counts. Unknown models cost 0."""
+    name = model.split(",")[0].split("/")[-1]
+    # Match the longest known prefix so "gpt-4o-mini-2024-07-18" -> "gpt-4o-mini"
+    for known in sorted(MODEL_PRICES, key=len, reverse=True):
+        if name.startswith(known):
+            prompt_price, completion_price = MODEL_PRICES[known]
+            return round(
+                (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000,
+                6,
+            )
+    return 0.0
+
+
+def build_usage(
+    crew_name: str,
+    crew: Any,
+    output: Any,
+    stats: LLMCallStats,
+    wall_time: float,
+) -> dict[str, Any]:
+    """Combine the crew's token usage metrics with call stats into a JSON-able dict."""
+    token_usage = getattr(output, "token_usage", None)
+    prompt_tokens = int(getattr(token_usage, "prompt_tokens", 0) or 0)
+    completion_tokens = int(getattr(token_usage, "completion_tokens", 0) or 0)
+    cached_prompt_tokens = int(getattr(token_usage, "cached_prompt_tokens", 0) or 0)
+    total_tokens = int(getattr(token_usage, "total_tokens", 0) or 0) or prompt_tokens + completion_tokens
+    successful_requests = int(getattr(token_usage, "successful_requests", 0) or 0)
+    model = crew_model_name(crew)
+
+    return {
+        "crew": crew_name,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "cached_prompt_tokens": cached_prompt_tokens,
+        "total_tokens": total_tokens,
+        "llm_calls": stats.calls or successful_requests,
+        "llm_wall_time_s": round(stats.wall_time, 3),
+        "wall_time_s": round(wall_time, 3),
+        "estimated_cost_usd": estimate_cost(model, prompt_tokens, completion_tokens),
+    }
+
+
+def kickoff_with_usage(
+    crew_name: str,
+    crew: Any,
+    inputs: dict[str, Any],
+) -> tuple[Any, dict[str, Any]]:
+    """Kick off `crew` and return (crew_output, usage_dict).
+
+    Transient LLM errors are retried per call (see resilience.py). Inside a
+    background job, the crew stops at its next LLM call once the job is
+    cancelled or past its deadline (see cancellation.py).
+    """
+    # Innermost wrapper, so a call and its retries are timed as one call
+    resilience = make_llm_calls_resilient(crew)
+    stats = track_llm_calls(crew)
+    guard_llm_calls(crew)
+    start = time.perf_counter()
+    output = crew.kickoff(inputs=inputs)
+    check_cancelled()
+    usage = build_usage(crew_name, crew, output, stats, time.perf_counter() - start)
+    usage.update(resilience.as_dict())
+    return output, usage
+
+
+def summarize_usage(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """Aggregate per-job usage rows into totals and averages by job type.
+
+    Each row needs `job_type` and `usage`.
+    """
+    by_type: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        usage = row.get("usage") or {}
+        if not usage:
+            continue
+        bucket = by_type.setdefault(row.get("job_type", "unknown"), {
+            "jobs": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "llm_calls": 0,
+            "llm_retries": 0,
+            "llm_wall_time_s": 0.0,
+            "hedge_saved_s": 0.0,
+            "wall_time_s": 0.0,
+            "estimated_cost_usd": 0.0,
+            "models": [],
+        })
+        bucket["jobs"] += 1
+        for key in ("prompt_tokens", "completion_tokens", "total_tokens", "llm_calls", "llm_retries"):
+            bucket[key] += int(usage.get(key, 0) or 0)
+        for key in ("llm_wall_time_s", "wall_time_s", "hedge_saved_s", "estimated_cost_usd"):
+            bucket[key] += float(usage.get(key, 0) or 0)
+        model = usage.get("model")
+        if model and model not in bucket["models"]:
+            bucket["models"].append(model)
+
+    for bucket in by_type.values():
+        n = bucket["jobs"]
+        bucket["avg_total_tokens"] = round(bucket["total_tokens"] / n, 1)
+        bucket["avg_llm_calls"] = round(bucket["llm_calls"] / n, 2)
+        bucket["avg_llm_wall_time_s"] = round(bucket["llm_wall_time_s"] / n, 3)
+        bucket["avg_wall_time_s"] = round(bucket["wall_time_s"] / n, 3)
+        bucket["llm_wall_time_s"] = round(bucket["llm_wall_time_s"], 3)
+        bucket["wall_time_s"] = round(bucket["wall_time_s"], 3)
+        bucket["hedge_saved_s"] = round(bucket["hedge_saved_s"], 3)
+        bucket["estimated_cost_usd"] = round(bucket["estimated_cost_usd"], 6)
+
+    # Most expensive crews first so optimization targets are obvious
+    ordered = dict(sorted(
+        by_type.items(),
+        key=lambda kv: kv[1]["estimated_cost_usd"] or kv[1]["total_tokens"],
+        reverse=True,
+    ))
+    return {
+        "jobs": sum(b["jobs"] for b in ordered.values()),
+        "total_tokens": sum(b["total_tokens"] for b in ordered.values()),
+        "estimated_cost_usd": round(sum(b["estimated_cost_usd"] for b in ordered.values()), 6),
+        "by_job_type": ordered,
+    }
@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 """
 Railway deployment script for Meraki backend.
+
+Railway terminates connections at its proxy, so the client address comes from
+X-Forwarded-For (anonymous rate limits are keyed on it). FORWARDED_ALLOW_IPS
+lists the proxies trusted to set it; the default trusts any peer, since the
+service is only reachable through Railway's proxy.
 """
 import os
 import uvicorn
@@ -8,4 +13,10 @@ from meraki_flow.api import app
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        proxy_headers=True,
+        forwarded_allow_ips=os.environ.get("FORWARDED_ALLOW_IPS", "*"),
+    )
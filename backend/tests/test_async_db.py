@@ -0,0 +1,73 @@
+"""Tests for the async Supabase job helpers."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from meraki_flow import async_db
+
+
+class FakeQuery:
+    def __init__(self, table, log):
+        self.table = table
+        self.log = log
+        self.filters = []
+
+    def insert(self, rows):
+        self.log.append(("insert", self.table, rows))
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    async def execute(self):
+        await asyncio.sleep(0)
+        rows = [{"id": value, "status": "running"} for column, value in self.filters if column == "id"]
+        return SimpleNamespace(data=rows)
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.log = []
+
+    def table(self, name):
+        return FakeQuery(name, self.log)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeAsyncClient()
+    monkeypatch.setattr(async_db, "_async_supabase", fake)
+    return fake
+
+
+class TestAsyncDb:
+    """Test cases for non-blocking job CRUD."""
+
+    def test_create_jobs_chunks_inserts(self, client):
+        """Test that bulk job creation inserts in chunks and keeps input order."""
+        items = [({"n": i}, f"user-{i}") for i in range(5)]
+        job_ids = asyncio.run(async_db.create_jobs("discovery", items, "batch-1", chunk_size=2))
+        inserts = [rows for op, _, rows in client.log if op == "insert"]
+        assert [len(rows) for rows in inserts] == [2, 2, 1]
+        assert [row["id"] for rows in inserts for row in rows] == job_ids
+        assert all(row["batch_id"] == "batch-1" and row["status"] == "pending" for rows in inserts for row in rows)
+        assert len({row["created_at"] for rows in inserts for row in rows}) == 1
+
+    def test_concurrent_status_polls(self, client):
+        """Test that many get_job calls run concurrently on one loop."""
+        async def poll_all():
+            return await asyncio.gather(*(async_db.get_job(f"job-{i}") for i in range(50)))
+
+        jobs = asyncio.run(poll_all())
+        assert [job["id"] for job in jobs] == [f"job-{i}" for i in range(50)]
+
+    def test_cached_result_job_is_born_completed(self, client):
+        """Test that a job created from a stored result needs no crew run."""
+        job_id = asyncio.run(async_db.create_job("sampling_preview", {}, "user-1", result={"videos": []}))
+        [(_, _, row)] = client.log
+        assert row["id"] == job_id
+        assert (row["status"], row["result"]) == ("completed", {"videos": []})
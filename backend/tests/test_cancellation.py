@@ -0,0 +1,107 @@
+"""Tests for job deadlines and cooperative cancellation."""
+import threading
+import time
+from types import SimpleNamespace
+
+from meraki_flow import cancellation
+from meraki_flow.cancellation import (
+    JobCancelled,
+    call_timeout,
+    cancel_job,
+    check_cancelled,
+    guard_llm_calls,
+    run_with_deadline,
+)
+
+
+class FakeLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, messages):
+        self.calls += 1
+        return "ok"
+
+
+class TestRunWithDeadline:
+    """Test cases for the job runner decorator."""
+
+    def test_timeout_is_reported_and_job_stops(self, monkeypatch):
+        """Test that a job past its deadline is failed once and stops at the next check."""
+        monkeypatch.setenv("JOB_TIMEOUT_SLOW_S", "0.05")
+        timeouts, steps = [], []
+
+        @run_with_deadline("slow", on_timeout=lambda job_id, reason: timeouts.append((job_id, reason)))
+        def run(job_id):
+            for step in range(100):
+                check_cancelled()
+                steps.append(step)
+                time.sleep(0.01)
+
+        run("job-1")
+        assert timeouts == [("job-1", "Timed out after 0s")]
+        assert len(steps) < 50
+        assert cancellation.active_jobs() == []
+
+    def test_cancel_before_start(self):
+        """Test that a job cancelled while queued never runs."""
+        ran = []
+
+        @run_with_deadline("discovery")
+        def run(job_id):
+            ran.append(job_id)
+
+        assert not cancel_job("job-2")
+        run("job-2")
+        assert ran == []
+
+    def test_cancel_while_running(self):
+        """Test that cancelling a running job stops it at its next LLM call."""
+        llm = FakeLLM()
+        crew = SimpleNamespace(agents=[SimpleNamespace(llm=llm), SimpleNamespace(llm=llm)])
+        started, outcome = threading.Event(), []
+
+        @run_with_deadline("discovery")
+        def run(job_id):
+            guard_llm_calls(crew)
+            llm.call([])
+            started.set()
+            time.sleep(0.05)
+            try:
+                llm.call([])
+            except JobCancelled as e:
+                outcome.append(e.reason)
+                raise
+
+        worker = threading.Thread(target=run, args=("job-3",))
+        worker.start()
+        started.wait(1)
+        assert cancel_job("job-3")
+        worker.join(1)
+        assert outcome == ["Cancelled by user"]
+        assert llm.calls == 1
+
+    def test_cancel_requests_expire(self, monkeypatch):
+        """Test that cancellations for jobs that never start here don't pile up."""
+        now = [1000.0]
+        monkeypatch.setattr(cancellation.time, "monotonic", lambda: now[0])
+        monkeypatch.setenv("CANCEL_REQUEST_TTL_S", "60")
+        monkeypatch.setattr(cancellation, "_cancel_requested", {})
+        cancel_job("elsewhere-1")
+        now[0] += 30
+        cancel_job("elsewhere-2")
+        now[0] += 45
+        cancel_job("elsewhere-3")
+        assert set(cancellation._cancel_requested) == {"elsewhere-2", "elsewhere-3"}
+
+
+class TestOutsideJobs:
+    """Test cases for the helpers when no job is running."""
+
+    def test_helpers_are_noops(self):
+        """Test that checks and timeouts don't affect evaluation or CLI runs."""
+        check_cancelled()
+        assert call_timeout(30) == 30
+        llm = FakeLLM()
+        guard_llm_calls(SimpleNamespace(agents=[SimpleNamespace(llm=llm)]))
+        assert llm.call([]) == "ok"
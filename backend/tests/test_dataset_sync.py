@@ -0,0 +1,95 @@
+"""Tests for content-hash Opik dataset syncing."""
+import pytest
+from meraki_flow.evaluation import local_cache
+from meraki_flow.evaluation.dataset_sync import item_hash, sync_dataset
+
+
+class FakeDataset:
+    def __init__(self):
+        self.items = {}
+        self.next_id = 0
+        self.get_calls = 0
+        self.insert_batches = []
+
+    @property
+    def dataset_items_count(self):
+        return len(self.items)
+
+    def get_items(self):
+        self.get_calls += 1
+        return [{**item, "id": item_id} for item_id, item in self.items.items()]
+
+    def insert(self, items):
+        self.insert_batches.append(len(items))
+        for item in items:
+            self.next_id += 1
+            self.items[f"id-{self.next_id}"] = dict(item)
+
+    def delete(self, ids):
+        for item_id in ids:
+            del self.items[item_id]
+
+
+class FakeClient:
+    def __init__(self):
+        self.datasets = {}
+
+    def get_or_create_dataset(self, name, description=""):
+        return self.datasets.setdefault(name, FakeDataset())
+
+    def delete_dataset(self, name):
+        self.datasets.pop(name, None)
+
+
+ITEMS = [{"input": f"profile {i}", "expected_output": f"match {i}"} for i in range(5)]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_cache, "CACHE_DIR", tmp_path)
+
+
+class TestDatasetSync:
+    """Test cases for idempotent dataset uploads."""
+
+    def test_unchanged_sync_skips_remote_items(self):
+        """Test that a second sync with the same items uploads nothing."""
+        client = FakeClient()
+        dataset = sync_dataset(client, "ds", ITEMS, batch_size=2)
+        assert dataset.insert_batches == [2, 2, 1]
+
+        sync_dataset(client, "ds", ITEMS)
+        assert dataset.insert_batches == [2, 2, 1]
+        assert dataset.get_calls == 1
+
+    def test_only_changed_items_are_replaced(self):
+        """Test that an edited item replaces its old version and others stay put."""
+        client = FakeClient()
+        dataset = sync_dataset(client, "ds", ITEMS)
+        kept_ids = set(dataset.items)
+
+        edited = ITEMS[:4] + [{"input": "profile 4", "expected_output": "changed"}]
+        sync_dataset(client, "ds", edited)
+        assert dataset.insert_batches[-1] == 1
+        assert len(dataset.items) == 5
+        assert len(kept_ids & set(dataset.items)) == 4
+        assert {item_hash(i) for i in dataset.items.values()} == {item_hash(i) for i in edited}
+
+    def test_duplicate_remote_items_are_removed(self):
+        """Test that items uploaded twice by older runs are de-duplicated."""
+        client = FakeClient()
+        dataset = client.get_or_create_dataset("ds")
+        dataset.insert(ITEMS + ITEMS)
+        sync_dataset(client, "ds", ITEMS)
+        assert len(dataset.items) == 5
+
+    def test_remote_changes_force_comparison(self):
+        """Test that items deleted on the server are re-uploaded despite the manifest."""
+        client = FakeClient()
+        dataset = sync_dataset(client, "ds", ITEMS)
+        dataset.delete([next(iter(dataset.items))])
+
+        sync_dataset(client, "ds", ITEMS)
+        assert dataset.get_calls == 2
+        assert dataset.insert_batches[-1] == 1
+        assert {item_hash(i) for i in dataset.items.values()} == {item_hash(i) for i in ITEMS}
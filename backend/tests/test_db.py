@@ -0,0 +1,95 @@
+"""Tests for the persistence helpers in db.py."""
+from types import SimpleNamespace
+
+import pytest
+from meraki_flow import db
+
+
+class FakeRpc:
+    def __init__(self, result):
+        self.result = result
+
+    def execute(self):
+        return SimpleNamespace(data=self.result)
+
+
+class FakeClient:
+    def __init__(self, result="assignment-1"):
+        self.result = result
+        self.calls = []
+
+    def rpc(self, fn, params):
+        self.calls.append((fn, params))
+        return FakeRpc(self.result)
+
+    def table(self, name):
+        raise AssertionError("job completion must not issue table queries")
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(db, "_supabase", fake)
+    return fake
+
+
+class TestCompleteJob:
+    """Test cases for the combined job completion write."""
+
+    def test_result_and_side_write_in_one_rpc(self, client):
+        """Test that the job result and its domain row go out in a single call."""
+        client.result = {"saved": True, "id": "row-1", "count": 0}
+        saved = db.complete_job("job-1", {"message": "hi"}, {"total_tokens": 10}, "nudge", {"user_id": "user-1"})
+        assert saved["id"] == "row-1"
+        [(fn, params)] = client.calls
+        assert fn == "complete_job"
+        assert params["p_persist"] == "nudge" and params["p_usage"] == {"total_tokens": 10}
+
+    def test_no_side_write(self, client):
+        """Test that an empty persist kind and usage are sent as nulls."""
+        client.result = None
+        assert db.complete_job("job-1", {}) == {"saved": False}
+        params = client.calls[0][1]
+        assert params["p_persist"] is None and params["p_usage"] is None and params["p_params"] == {}
+
+
+class FakeContentTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = {}
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def gte(self, column, value):
+        return self
+
+    def limit(self, n):
+        return self
+
+    def upsert(self, row, on_conflict):
+        key = tuple(row[c] for c in on_conflict.split(","))
+        self.rows[key] = row
+        return self
+
+    def execute(self):
+        key = (self.filters.get("content_type"), self.filters.get("hobby_key"), self.filters.get("location_key"))
+        row = self.rows.get(key)
+        return SimpleNamespace(data=[row] if row else [])
+
+
+class TestHobbyContent:
+    """Test cases for the cross-user hobby content cache."""
+
+    def test_shared_across_spellings_of_a_location(self, monkeypatch):
+        """Test that content saved for one user's location is found for another's."""
+        rows = {}
+        monkeypatch.setattr(db, "_supabase", SimpleNamespace(table=lambda name: FakeContentTable(rows)))
+        db.save_hobby_content("local_experiences", "pottery", {"local_spots": [1]}, "Lyon,  France")
+        assert db.get_hobby_content("local_experiences", "Pottery", "lyon, france") == {"local_spots": [1]}
+        assert db.get_hobby_content("local_experiences", "pottery", "Paris") is None
+        assert db.get_hobby_content("videos", "pottery") is None
@@ -0,0 +1,119 @@
+"""Tests for the discovery batch endpoints."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from meraki_flow import api
+from meraki_flow.rate_limit import Limit, MemoryRateLimitStore, RateLimiter
+
+HTTP_REQUEST = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"))
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, job_type, fn, job_id, cls="interactive"):
+        self.submitted.append((job_type, job_id, cls))
+
+
+@pytest.fixture
+def batch_env(monkeypatch):
+    """Record bulk inserts and scheduled jobs instead of touching Supabase."""
+    created = []
+
+    async def create_jobs(job_type, items, batch_id):
+        created.append((job_type, items, batch_id))
+        return [f"job-{i}" for i in range(len(items))]
+
+    scheduler = FakeScheduler()
+    limiter = RateLimiter(
+        MemoryRateLimitStore(),
+        user_limit=Limit(0),
+        anonymous_limit=Limit(0),
+        global_limits={"discovery_batch": Limit(60, burst=1)},
+    )
+    monkeypatch.setattr(api.async_db, "create_jobs", create_jobs)
+    monkeypatch.setattr(api, "get_scheduler", lambda: scheduler)
+    monkeypatch.setattr(api, "get_rate_limiter", lambda: limiter)
+    return SimpleNamespace(created=created, scheduler=scheduler)
+
+
+def start_batch(requests):
+    batch = api.DiscoveryBatchRequest(requests=[api.DiscoveryRequest(**r) for r in requests])
+    return asyncio.run(api.start_discovery_batch(batch, HTTP_REQUEST))
+
+
+def batch_status(monkeypatch, statuses):
+    jobs = [{"id": f"job-{i}", "status": status} for i, status in enumerate(statuses)]
+
+    async def get_batch_jobs(batch_id):
+        return jobs
+
+    monkeypatch.setattr(api.async_db, "get_batch_jobs", get_batch_jobs)
+    return asyncio.run(api.get_discovery_batch_status("batch-1"))
+
+
+class TestStartDiscoveryBatch:
+    """Test cases for submitting a discovery batch."""
+
+    def test_jobs_inserted_once_and_queued_as_background(self, batch_env):
+        """Test that one bulk insert creates every job and all queue as background work."""
+        response = start_batch([{"user_id": "u1", "q1": "1–3 hours"}, {"user_id": "u2", "mode": "engine"}])
+        assert response.job_ids == ["job-0", "job-1"]
+        [(job_type, items, batch_id)] = batch_env.created
+        assert (job_type, batch_id) == ("discovery", response.batch_id)
+        assert [user_id for _, user_id in items] == ["u1", "u2"]
+        assert "user_id" not in items[0][0]
+        assert items[0][0]["q1"] == "1–3 hours"
+        assert batch_env.scheduler.submitted == [
+            ("discovery", "job-0", "background"),
+            ("discovery", "job-1", "background"),
+        ]
+
+    @pytest.mark.parametrize("requests,status", [
+        ([], 400),
+        ([{"user_id": "u1", "mode": "turbo"}], 400),
+    ])
+    def test_invalid_batches_are_rejected(self, batch_env, requests, status):
+        """Test that empty batches and unknown modes create no jobs."""
+        with pytest.raises(HTTPException) as exc:
+            start_batch(requests)
+        assert exc.value.status_code == status
+        assert batch_env.created == []
+
+    def test_oversized_batch(self, batch_env, monkeypatch):
+        """Test that batches over DISCOVERY_BATCH_MAX_SIZE answer 413."""
+        monkeypatch.setattr(api, "DISCOVERY_BATCH_MAX_SIZE", 1)
+        with pytest.raises(HTTPException) as exc:
+            start_batch([{"user_id": "u1"}, {"user_id": "u2"}])
+        assert exc.value.status_code == 413
+
+    def test_batches_are_rate_limited(self, batch_env):
+        """Test that a batch takes one token and the next one gets 429 + Retry-After."""
+        start_batch([{"user_id": "u1"}])
+        with pytest.raises(HTTPException) as exc:
+            start_batch([{"user_id": "u2"}])
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) >= 1
+        assert len(batch_env.created) == 1
+
+
+class TestDiscoveryBatchStatus:
+    """Test cases for aggregate batch progress."""
+
+    def test_cancelled_jobs_are_terminal(self, monkeypatch):
+        """Test that a batch with cancelled jobs still finishes."""
+        status = batch_status(monkeypatch, ["completed", "failed", "cancelled"])
+        assert status["cancelled"] == 1
+        assert status["progress"] == 1.0
+        assert status["done"] is True
+        assert status["failed_job_ids"] == ["job-1"]
+
+    def test_in_flight_batch(self, monkeypatch):
+        """Test progress while jobs are still queued or running."""
+        status = batch_status(monkeypatch, ["completed", "running", "pending", "pending"])
+        assert (status["pending"], status["running"], status["completed"]) == (2, 1, 1)
+        assert status["progress"] == 0.25
+        assert status["done"] is False
@@ -0,0 +1,86 @@
+"""Tests for discovery mode selection and crew inputs."""
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import yaml
+from meraki_flow import discovery_modes
+from meraki_flow.crews.discovery_crew.discovery_crew import DEFAULT_CANDIDATE_HOBBIES
+from meraki_flow.discovery_modes import build_discovery_inputs, run_discovery
+
+TASKS_YAML = (
+    Path(discovery_modes.__file__).parent / "crews" / "discovery_crew" / "config" / "tasks.yaml"
+)
+FULL_QUIZ = {f"q{i}": "Making physical objects" for i in range(1, 23)}
+
+
+class FakeDiscoveryCrew:
+    def crew(self):
+        return "crew"
+
+    def fast_crew(self):
+        return "fast_crew"
+
+    def reasoning_crew(self):
+        return "reasoning_crew"
+
+
+@pytest.fixture
+def kickoffs(monkeypatch):
+    """Record (crew, inputs) of every kickoff instead of calling an LLM."""
+    calls = []
+
+    def kickoff(crew_name, crew, inputs):
+        calls.append((crew, inputs))
+        raw = '{"matches": [{"hobby_slug": "pottery"}], "encouragement": ""}'
+        return SimpleNamespace(raw=raw, tasks_output=[]), {"crew": crew_name}
+
+    monkeypatch.setattr(discovery_modes, "DiscoveryCrew", FakeDiscoveryCrew)
+    monkeypatch.setattr(discovery_modes, "kickoff_with_usage", kickoff)
+    monkeypatch.setattr(discovery_modes, "get_hobby_index", lambda: None)
+    return calls
+
+
+def task_placeholders(task_name):
+    task = yaml.safe_load(TASKS_YAML.read_text())[task_name]
+    # Only the description: expected_output holds a literal JSON example
+    return set(re.findall(r"\{([a-z0-9_]+)\}", task["description"]))
+
+
+class TestDiscoveryModes:
+    """Test cases for running each discovery mode."""
+
+    def test_fast_mode_without_index_fills_every_placeholder(self, kickoffs):
+        """Test that fast mode falls back to the default candidates with no index."""
+        inputs = build_discovery_inputs(FULL_QUIZ)
+        run_discovery("job-1", inputs, mode="fast")
+        [(crew, crew_inputs)] = kickoffs
+        assert crew == "fast_crew"
+        assert crew_inputs["candidate_hobbies"] == DEFAULT_CANDIDATE_HOBBIES
+        assert task_placeholders("match_hobbies_fast_task") <= set(crew_inputs)
+
+    def test_index_candidates_are_used(self, kickoffs, monkeypatch):
+        """Test that retrieved candidates replace the default list."""
+        index = SimpleNamespace(candidates_for_profile=lambda inputs, k: [
+            {"slug": "pottery", "name": "Pottery", "description": ""},
+        ])
+        monkeypatch.setattr(discovery_modes, "get_hobby_index", lambda: index)
+        run_discovery("job-2", build_discovery_inputs(FULL_QUIZ), mode="crew")
+        [(crew, crew_inputs)] = kickoffs
+        assert crew == "crew"
+        assert "pottery" in crew_inputs["candidate_hobbies"]
+        assert crew_inputs["candidate_hobbies"] != DEFAULT_CANDIDATE_HOBBIES
+
+    def test_sparse_quiz_falls_back_from_engine_to_crew(self, kickoffs):
+        """Test that engine mode runs the full crew when too few answers match."""
+        parsed, usage = run_discovery("job-3", build_discovery_inputs({"q1": "1–3 hours"}), mode="engine")
+        assert [crew for crew, _ in kickoffs] == ["crew"]
+        assert parsed["matches"] == [{"hobby_slug": "pottery"}]
+        assert usage == {"crew": "discovery"}
+
+    def test_unknown_mode(self, kickoffs):
+        """Test that an unknown mode is rejected before any crew runs."""
+        with pytest.raises(ValueError):
+            run_discovery("job-4", {}, mode="turbo")
+        assert kickoffs == []
@@ -0,0 +1,105 @@
+"""Tests for the hobby embedding index and candidate retrieval."""
+import numpy as np
+import pytest
+from meraki_flow import discovery_modes
+from meraki_flow.crews.discovery_crew.discovery_crew import DEFAULT_CANDIDATE_HOBBIES
+from meraki_flow.matching import embedding_index
+from meraki_flow.matching.embedding_index import (
+    HobbyIndex,
+    build_index,
+    format_candidates,
+    get_hobby_index,
+    profile_query,
+)
+
+VOCAB = ["yarn", "clay", "plants", "paint"]
+CATALOG = [
+    {"slug": "knitting", "name": "Knitting", "description": "Yarn and needles", "tags": []},
+    {"slug": "pottery", "name": "Pottery", "description": "Shaping clay", "tags": []},
+    {"slug": "gardening", "name": "Gardening", "description": "Growing plants", "tags": []},
+]
+
+
+def fake_embed_texts(texts, model=None):
+    """Bag-of-words vectors over VOCAB, L2-normalized like the real embeddings."""
+    vectors = np.array(
+        [[float(word in text.lower()) for word in VOCAB] for text in texts], dtype=np.float32,
+    ) + 1e-3
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_index, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(embedding_index, "INDEX_DIR", tmp_path)
+    get_hobby_index.cache_clear()
+    yield tmp_path
+    get_hobby_index.cache_clear()
+
+
+class TestHobbyIndex:
+    """Test cases for building and searching the index."""
+
+    def test_search_ranks_closest_hobby_first(self, index_dir):
+        """Test that a built index round-trips and ranks by cosine similarity."""
+        build_index(CATALOG, index_dir)
+        index = HobbyIndex(index_dir)
+        [(hobby, score)] = index.search("I love working with clay", k=1)
+        assert hobby["slug"] == "pottery"
+        assert score > 0.9
+        assert [h["slug"] for h, _ in index.search("clay", k=10)][0] == "pottery"
+        assert len(index.search("clay", k=10)) == len(CATALOG)
+
+    def test_candidates_for_profile(self, index_dir):
+        """Test that quiz answers are the query and an empty profile retrieves nothing."""
+        build_index(CATALOG, index_dir)
+        index = HobbyIndex(index_dir)
+        inputs = {"q4_creative_type": "Growing or nurturing living things", "q21_dream_hobby": "plants"}
+        assert index.candidates_for_profile(inputs, k=1)[0]["slug"] == "gardening"
+        assert index.candidates_for_profile({}, k=3) == []
+
+    def test_out_of_sync_index_is_rejected(self, index_dir):
+        """Test that metadata and vectors of different sizes fail loudly."""
+        build_index(CATALOG, index_dir)
+        np.save(index_dir / embedding_index.VECTORS_FILE, fake_embed_texts(["yarn"]))
+        with pytest.raises(ValueError):
+            HobbyIndex(index_dir)
+
+    def test_missing_index_loads_as_none(self, index_dir):
+        """Test that an unbuilt index means "no retrieval" rather than an error."""
+        assert get_hobby_index() is None
+
+    def test_profile_query_puts_dream_hobby_first(self):
+        """Test the query text built from quiz answers."""
+        query = profile_query({"q4_creative_type": "Making physical objects", "q21_dream_hobby": "pottery"})
+        assert query == "Dream hobby: pottery. Making physical objects"
+
+    def test_format_candidates(self):
+        """Test the candidate lines rendered into the discovery prompt."""
+        assert format_candidates(CATALOG[:1]) == "- knitting (Knitting): Yarn and needles"
+
+
+class TestCandidateRetrieval:
+    """Test cases for discovery's fallback to the default candidate list."""
+
+    def test_built_index_narrows_candidates(self, index_dir):
+        """Test that a built index replaces the default list."""
+        build_index(CATALOG, index_dir)
+        candidates = discovery_modes.retrieve_candidate_hobbies("job-1", {"q21_dream_hobby": "yarn"})
+        assert candidates.startswith("- knitting")
+
+    def test_retrieval_errors_fall_back(self, index_dir, monkeypatch):
+        """Test that an embeddings API failure falls back to the default list."""
+        build_index(CATALOG, index_dir)
+
+        def unavailable(texts, model=None):
+            raise ConnectionError("embeddings API unreachable")
+
+        monkeypatch.setattr(embedding_index, "embed_texts", unavailable)
+        candidates = discovery_modes.retrieve_candidate_hobbies("job-2", {"q21_dream_hobby": "yarn"})
+        assert candidates == DEFAULT_CANDIDATE_HOBBIES
+
+    def test_empty_profile_falls_back(self, index_dir):
+        """Test that a profile with nothing to search with keeps the default list."""
+        build_index(CATALOG, index_dir)
+        assert discovery_modes.retrieve_candidate_hobbies("job-3", {}) == DEFAULT_CANDIDATE_HOBBIES
@@ -0,0 +1,92 @@
+"""Tests for the disk-backed LLM response cache."""
+import json
+import sys
+import types
+
+import pytest
+from meraki_flow import llm_cache
+from meraki_flow.llm_cache import LLMResponseCache, cache_crew_llm_calls, request_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(tmp_path / "responses.sqlite", max_mb=1)
+
+
+class FakeLLM:
+    def __init__(self):
+        self.model = "gpt-4o-mini"
+        self.temperature = 0.7
+        self.calls = 0
+
+    def call(self, messages, tools=None, callbacks=None, **kwargs):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class TestLLMResponseCache:
+    """Test cases for the SQLite LRU store."""
+
+    def test_roundtrip_persists_across_instances(self, cache, tmp_path):
+        """Test that a stored response is readable from a new connection."""
+        cache.put("k", "gpt-4o", "hello")
+        assert LLMResponseCache(tmp_path / "responses.sqlite").get("k") == "hello"
+        assert cache.get("missing") is None
+        assert (cache.hits, cache.misses) == (0, 1)
+
+    def test_lru_eviction_keeps_recently_used(self, tmp_path):
+        """Test that the least recently read response is evicted first."""
+        small = LLMResponseCache(tmp_path / "small.sqlite", max_mb=2.5 / 1024)  # 2.5 KB
+        small.put("a", "m", "x" * 1024)
+        small.put("b", "m", "y" * 1024)
+        small.get("a")
+        small.put("c", "m", "z" * 1024)
+        assert small.get("b") is None
+        assert small.get("a") is not None and small.get("c") is not None
+        assert small.evictions == 1
+
+    def test_request_key_ignores_metadata(self):
+        """Test that tracing metadata doesn't split the cache but params do."""
+        messages = [{"role": "user", "content": "hi"}]
+        base = request_key("gpt-4o", messages, temperature=0)
+        assert request_key("gpt-4o", messages, temperature=0, metadata={"span": 1}) == base
+        assert request_key("gpt-4o", messages, temperature=1) != base
+
+
+class TestCacheHooks:
+    """Test cases for the crew and LiteLLM hooks."""
+
+    def test_crew_llm_calls_are_cached(self, cache):
+        """Test that a repeated agent LLM call is served from the cache."""
+        llm = FakeLLM()
+        crew = types.SimpleNamespace(agents=[types.SimpleNamespace(llm=llm)])
+        cache_crew_llm_calls(crew, cache)
+        messages = [{"role": "user", "content": "suggest a hobby"}]
+        assert llm.call(messages) == "answer 1"
+        assert llm.call(messages) == "answer 1"
+        assert llm.call([{"role": "user", "content": "another"}]) == "answer 2"
+        assert llm.calls == 2
+
+    def test_litellm_completion_is_cached(self, cache, monkeypatch):
+        """Test that install_llm_cache wraps litellm.completion once."""
+        class ModelResponse(dict):
+            def model_dump_json(self):
+                return json.dumps(self)
+
+        calls = []
+
+        def completion(**kwargs):
+            calls.append(kwargs)
+            return ModelResponse(content="ok")
+
+        fake = types.SimpleNamespace(completion=completion, acompletion=None, ModelResponse=ModelResponse)
+        monkeypatch.setitem(sys.modules, "litellm", fake)
+        monkeypatch.setenv("MERAKI_LLM_CACHE", "1")
+        monkeypatch.setattr(llm_cache, "_cache", cache)
+
+        assert llm_cache.install_llm_cache() is cache
+        assert llm_cache.install_llm_cache() is cache
+        request = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+        assert fake.completion(**request, metadata={"a": 1}) == {"content": "ok"}
+        assert fake.completion(**request, metadata={"a": 2}) == {"content": "ok"}
+        assert len(calls) == 1
@@ -0,0 +1,90 @@
+"""Tests for the local evaluation dataset/output cache."""
+import pytest
+from meraki_flow.evaluation import local_cache
+
+
+ITEM = {
+    "input": "Budget-limited solo creative",
+    "metadata": {"crew_inputs": {"q1_time_available": "1-3 hours", "q11_initial_budget": "Under $25"}},
+}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_cache, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+class TestLocalCache:
+    """Test cases for offline evaluation caching."""
+
+    def test_dataset_roundtrip(self, cache_dir):
+        """Test that exported dataset items load back unchanged."""
+        local_cache.save_dataset("discovery", [ITEM])
+        assert local_cache.load_dataset("discovery") == [ITEM]
+
+    def test_missing_dataset_raises(self, cache_dir):
+        """Test that loading an unexported dataset explains how to export it."""
+        with pytest.raises(FileNotFoundError, match="--export-local"):
+            local_cache.load_dataset("roadmap")
+
+    def test_item_key_ignores_input_order(self):
+        """Test that the item key depends on crew inputs, not dict ordering."""
+        reordered = {
+            "input": ITEM["input"],
+            "metadata": {"crew_inputs": dict(reversed(list(ITEM["metadata"]["crew_inputs"].items())))},
+        }
+        assert local_cache.item_key(ITEM) == local_cache.item_key(reordered)
+
+    def test_latest_recorded_output_wins(self, cache_dir):
+        """Test that re-recording an item replaces its cached output."""
+        local_cache.record_output("discovery", ITEM, "first")
+        local_cache.record_output("discovery", ITEM, "second")
+        assert local_cache.load_outputs("discovery") == {local_cache.item_key(ITEM): "second"}
+
+    def test_outputs_filtered_by_config_hash(self, cache_dir):
+        """Test that outputs recorded under an older crew config are not reused."""
+        local_cache.record_output("discovery", ITEM, "old prompt", config_hash="aaa")
+        local_cache.record_output("discovery", ITEM, "new prompt", config_hash="bbb")
+        assert local_cache.load_outputs("discovery", "aaa") == {local_cache.item_key(ITEM): "old prompt"}
+        assert local_cache.load_outputs("discovery", "ccc") == {}
+
+    def test_config_hash_changes_with_prompts(self, tmp_path):
+        """Test that editing a crew's tasks.yaml changes its config hash."""
+        (tmp_path / "config").mkdir()
+        tasks = tmp_path / "config" / "tasks.yaml"
+        tasks.write_text("task:\n  description: v1\n")
+        (tmp_path / "crew.py").write_text("CREW = 1\n")
+        before = local_cache.crew_config_hash(tmp_path)
+        assert local_cache.crew_config_hash(tmp_path) == before
+        tasks.write_text("task:\n  description: v2\n")
+        assert local_cache.crew_config_hash(tmp_path) != before
+
+    def test_config_hash_covers_schemas_tools_and_model(self, tmp_path, monkeypatch):
+        """Test that editing a shared schema, an imported tool or the model changes the hash."""
+        package = tmp_path / "meraki_flow"
+        (package / "tools").mkdir(parents=True)
+        crew_dir = package / "crews" / "demo_crew"
+        (crew_dir / "config").mkdir(parents=True)
+        (crew_dir / "config" / "tasks.yaml").write_text("task:\n  description: v1\n")
+        (crew_dir / "demo_crew.py").write_text("from meraki_flow.tools.web_search import WebSearchTool\n")
+        models = package / "models.py"
+        models.write_text("class Output(BaseModel):\n    title: str\n")
+        tool = package / "tools" / "web_search.py"
+        tool.write_text("class WebSearchTool: ...\n")
+        (package / "tools" / "unused.py").write_text("v1\n")
+        monkeypatch.setattr(local_cache, "PACKAGE_DIR", package)
+        monkeypatch.delenv("MODEL", raising=False)
+        monkeypatch.setenv("OPENAI_MODEL_NAME", "gpt-4o-mini")
+
+        hashes = [local_cache.crew_config_hash(crew_dir)]
+        models.write_text("class Output(BaseModel):\n    title: str\n    summary: str\n")
+        hashes.append(local_cache.crew_config_hash(crew_dir))
+        tool.write_text("class WebSearchTool:\n    description = 'v2'\n")
+        hashes.append(local_cache.crew_config_hash(crew_dir))
+        monkeypatch.setenv("OPENAI_MODEL_NAME", "gpt-4o")
+        hashes.append(local_cache.crew_config_hash(crew_dir))
+        assert len(set(hashes)) == 4
+
+        (package / "tools" / "unused.py").write_text("v2\n")
+        assert local_cache.crew_config_hash(crew_dir) == hashes[-1]
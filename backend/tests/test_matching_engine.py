@@ -0,0 +1,121 @@
+"""Tests for the deterministic hobby matching engine."""
+import re
+from pathlib import Path
+
+import pytest
+from meraki_flow.matching.engine import (
+    QUESTION_RULES,
+    MatchingEngine,
+    _normalize,
+    to_match_percentage,
+)
+from meraki_flow.matching.hobby_profiles import HOBBY_PROFILES
+
+QUIZ_DATA = Path(__file__).resolve().parents[2] / "frontend" / "src" / "lib" / "quizData.ts"
+
+
+def quiz_options() -> dict[int, list[str]]:
+    """Option lists per question id, read from the frontend quiz definition."""
+    if not QUIZ_DATA.exists():
+        pytest.skip("frontend quizData.ts not available")
+    options = {}
+    for block in re.split(r"\n\s*id: ", QUIZ_DATA.read_text())[1:]:
+        # Section ids are strings and text questions have no options
+        qid = re.match(r"\d+", block)
+        listed = re.search(r"options: \[(.*?)\]", block, re.S)
+        if qid and listed:
+            options[int(qid.group())] = re.findall(r'"([^"]*)"', listed.group(1))
+    return options
+
+
+BUDGET_TACTILE_PROFILE = {
+    "q1_time_available": "1–3 hours",
+    "q3_session_preference": "Are easy to pause and resume",
+    "q4_creative_type": "Making physical objects",
+    "q6_mess_tolerance": "Prefer clean, contained activities",
+    "q9_practice_location": "At home, packs away easily",
+    "q10_social_preference": "Completely solo",
+    "q11_initial_budget": "Under $25",
+    "q14_motivations": "Stress relief and mindfulness, Making gifts or useful items",
+    "q17_sensory_experience": "Repetitive, meditative motion",
+    "q21_dream_hobby": "",
+}
+
+
+class TestMatchingEngine:
+    """Test cases for quiz encoding and vectorized hobby scoring."""
+
+    def test_scores_every_hobby(self):
+        """Test that one score is returned per catalog hobby."""
+        engine = MatchingEngine()
+        scores = engine.score(BUDGET_TACTILE_PROFILE)
+        assert scores.shape == (len(HOBBY_PROFILES),)
+        assert ((scores >= 0) & (scores <= 1)).all()
+
+    def test_budget_tactile_profile_prefers_fiber_crafts(self):
+        """Test that a cheap, clean, meditative maker gets knitting/crochet on top."""
+        engine = MatchingEngine()
+        top = [m["hobby_slug"] for m in engine.rank(BUDGET_TACTILE_PROFILE, top_k=2)]
+        assert set(top) == {"knitting", "crochet"}
+
+    def test_expensive_messy_hobby_ranks_low(self):
+        """Test that woodworking is penalized for a low budget and low mess tolerance."""
+        engine = MatchingEngine()
+        ranked = [m["hobby_slug"] for m in engine.rank(BUDGET_TACTILE_PROFILE, top_k=len(HOBBY_PROFILES))]
+        assert ranked.index("woodworking") >= len(ranked) - 3
+
+    def test_dream_hobby_bonus(self):
+        """Test that mentioning a hobby in q21 raises its score."""
+        engine = MatchingEngine()
+        base = engine.score(BUDGET_TACTILE_PROFILE)
+        boosted = engine.score({**BUDGET_TACTILE_PROFILE, "q21_dream_hobby": "Always wanted to try pottery"})
+        idx = engine.slugs.index("pottery")
+        assert boosted[idx] > base[idx]
+
+    def test_rank_batch_matches_single(self):
+        """Test that batch ranking agrees with ranking profiles one at a time."""
+        engine = MatchingEngine()
+        other = {**BUDGET_TACTILE_PROFILE, "q4_creative_type": "Growing or nurturing living things"}
+        batch = engine.rank_batch([BUDGET_TACTILE_PROFILE, other], top_k=3)
+        assert batch[0] == engine.rank(BUDGET_TACTILE_PROFILE, top_k=3)
+        assert batch[1] == engine.rank(other, top_k=3)
+
+    def test_output_shape(self):
+        """Test that matches use the DiscoveryCrew output fields."""
+        engine = MatchingEngine()
+        match = engine.rank(BUDGET_TACTILE_PROFILE, top_k=1)[0]
+        assert set(match) == {"hobby_slug", "match_percentage", "match_tags", "reasoning"}
+
+    def test_unmatched_answers_are_not_counted(self):
+        """Test that free text matching no option doesn't count as answered."""
+        engine = MatchingEngine()
+        profile = engine.encode({"q3_session_preference": "short bursts", "q1_time_available": "2 hours"})
+        assert profile.answered == 1
+
+    @pytest.mark.parametrize("score,expected", [(0.0, 40), (1.0, 98), (2.0, 98)])
+    def test_match_percentage_range(self, score, expected):
+        """Test that engine scores map into the displayed percentage range."""
+        assert to_match_percentage(score) == expected
+
+
+class TestQuestionRules:
+    """Test cases keeping the engine rules in sync with the quiz options."""
+
+    def test_every_quiz_option_hits_a_rule(self):
+        """Test that each option of an encoded question counts as answered."""
+        options = quiz_options()
+        engine = MatchingEngine()
+        for key in QUESTION_RULES:
+            qid = int(key.split("_")[0][1:])
+            assert options.get(qid), f"no options for {key}"
+            for option in options[qid]:
+                assert engine.encode({key: option}).answered == 1, f"{key}: {option!r}"
+
+    def test_every_rule_is_a_quiz_option(self):
+        """Test that no rule pattern is dead text the frontend never sends."""
+        options = quiz_options()
+        for key, rules in QUESTION_RULES.items():
+            qid = int(key.split("_")[0][1:])
+            normalized = [_normalize(o) for o in options[qid]]
+            for pattern, _ in rules:
+                assert pattern in normalized, f"{key}: {pattern!r}"
@@ -0,0 +1,116 @@
+"""Tests for the heuristic Opik metrics and their batch scoring API."""
+import pytest
+from meraki_flow.models import GeneratedChallenge, GeneratedRoadmap, MotivationNudge
+from meraki_flow.opik_metrics import (
+    ChallengeCalibrationMetric,
+    FeedbackSpecificityMetric,
+    HobbyMatchDiversityMetric,
+    KeywordGroups,
+    LocalExperiencesCompletenessMetric,
+    NudgeUrgencyCalibrationMetric,
+    RoadmapCompletenessMetric,
+    SamplingCompletenessMetric,
+    parse_as,
+    parse_field,
+    parse_output,
+)
+
+
+OUTPUTS = [
+    '{"matches": [{"hobby_slug": "knitting"}, {"hobby_slug": "drawing"}, {"hobby_slug": "gardening"}]}',
+    "Great job! Your brush technique and color blending show real texture and depth.",
+    '{"title": "Path", "description": "d", "phases": [{"phase_number": 1, "title": "Basics", "description": "d", '
+    '"goals": ["g"], "suggested_activities": ["a"], "time_per_week": "2h"}]}',
+    '{"recommendation": {}, "micro_activity": {}, "curated_videos": []}',
+    '{"spots": [{"name": "A"}, {"name": "B"}, {"name": "C"}], "general_tips": []}',
+    "",
+]
+
+
+class TestKeywordGroups:
+    """Test cases for the shared keyword matcher."""
+
+    def test_count_and_present(self):
+        """Test distinct keyword counts and group presence."""
+        groups = KeywordGroups({"a": ["line", "form"], "b": ["video"]})
+        assert groups.count("a", "an outline of the form, line by line") == 2
+        assert groups.present("curated_videos") == ["b"]
+        assert groups.present("nothing here") == []
+
+
+class TestBatchScoring:
+    """Test cases for score_batch on text-only metrics."""
+
+    @pytest.mark.parametrize("metric_cls", [
+        FeedbackSpecificityMetric,
+        HobbyMatchDiversityMetric,
+        LocalExperiencesCompletenessMetric,
+        RoadmapCompletenessMetric,
+        SamplingCompletenessMetric,
+    ])
+    def test_batch_matches_single(self, metric_cls):
+        """Test that batch scores equal one-at-a-time scores, in order."""
+        metric = metric_cls()
+        batch = metric.score_batch(OUTPUTS + OUTPUTS)
+        single = [metric.score(output=o) for o in OUTPUTS + OUTPUTS]
+        assert [r.value for r in batch] == [r.value for r in single]
+
+    def test_known_scores(self):
+        """Test representative scores for well-formed outputs."""
+        assert HobbyMatchDiversityMetric().score(output=OUTPUTS[0]).value == 1.0
+        assert RoadmapCompletenessMetric().score(output=OUTPUTS[2]).value == 1.0
+        assert SamplingCompletenessMetric().score(output=OUTPUTS[3]).value == 1.0
+        assert LocalExperiencesCompletenessMetric().score(output=OUTPUTS[4]).value == 1.0
+        assert FeedbackSpecificityMetric().score(output=OUTPUTS[1]).value == 1.0  # 6 specific - 1 generic
+
+
+class TestStructuredMetrics:
+    """Test cases for metrics that accept parsed pydantic outputs."""
+
+    def test_parse_output_is_shared(self):
+        """Test that repeated parses of one output return the cached object."""
+        assert parse_output(OUTPUTS[2]) is parse_output(OUTPUTS[2])
+        assert parse_output("```json\n" + OUTPUTS[2] + "\n```") == parse_output(OUTPUTS[2])
+        assert parse_output("not json") is None
+
+    def test_roadmap_accepts_model(self):
+        """Test that a parsed GeneratedRoadmap scores like its JSON text."""
+        roadmap = parse_as(OUTPUTS[2], GeneratedRoadmap)
+        assert roadmap is not None
+        metric = RoadmapCompletenessMetric()
+        assert metric.score(output=roadmap).value == metric.score(output=OUTPUTS[2]).value == 1.0
+
+    def test_roadmap_structural_checks_need_content(self):
+        """Test that empty goals count as missing once the output validates."""
+        empty = OUTPUTS[2].replace('["g"]', "[]")
+        result = RoadmapCompletenessMetric().score(output=empty)
+        assert "has_goals" in result.reason
+
+    def test_challenge_accepts_model(self):
+        """Test that the parsed challenge's difficulty is used."""
+        challenge = GeneratedChallenge(
+            title="t", description="d", why_this_challenge="w", skills=[],
+            difficulty="easy", estimated_time="10m", tips=[], what_youll_learn=[],
+        )
+        assert ChallengeCalibrationMetric().score(challenge=challenge, session_count=2).value == 1.0
+
+    def test_nudge_accepts_model(self):
+        """Test that the parsed nudge's urgency is used."""
+        nudge = MotivationNudge(nudge_type="re_engage", message="m", suggested_action="a", urgency="re_engage")
+        assert NudgeUrgencyCalibrationMetric().score(nudge=nudge, days_since_last_session=14).value == 1.0
+
+    def test_parse_field_falls_back_to_raw_text(self):
+        """Test that a field is still read from output that doesn't validate."""
+        truncated = '{"nudge_type": "re_engage", "urgency": "re_engage", "message": "Come ba'
+        assert parse_field(truncated, MotivationNudge, "urgency") == "re_engage"
+        assert parse_field("no json here", MotivationNudge, "urgency") == ""
+        nudge = MotivationNudge(nudge_type="gentle", message="m", suggested_action="a", urgency="gentle")
+        assert parse_field(nudge, MotivationNudge, "urgency") == "gentle"
+        assert parse_field(nudge.model_dump_json(), MotivationNudge, "urgency") == "gentle"
+
+    def test_calibration_needs_engagement_signal(self):
+        """Test that session and day counts have no silent defaults."""
+        with pytest.raises(TypeError):
+            ChallengeCalibrationMetric().score(difficulty="easy")
+        with pytest.raises(TypeError):
+            NudgeUrgencyCalibrationMetric().score(urgency="gentle")
@@ -0,0 +1,122 @@
+"""Tests for adaptive trial budgeting of the prompt optimizers."""
+from meraki_flow.optimization.budget import EarlyStopping, run_adaptive_optimization, successive_halving
+
+
+class FakePrompt:
+    def __init__(self, text):
+        self.text = text
+
+    def get_messages(self):
+        return [{"role": "system", "content": self.text}]
+
+    def with_messages(self, messages):
+        return FakePrompt(messages[0]["content"])
+
+
+class FakeResult:
+    def __init__(self, prompt):
+        self.prompt = prompt
+        self.details = {}
+
+    def model_copy(self, update):
+        copy = FakeResult(self.prompt)
+        copy.__dict__.update(update)
+        return copy
+
+
+class FakeCheckpoint:
+    def __init__(self):
+        self.prompts = {}
+
+    def bind_dataset(self, dataset_items):
+        self.dataset_items = dataset_items
+
+    def agent_class(self, prompt):
+        return None
+
+    def candidate_scores(self, prompt_hashes):
+        return {h: [0.1] for h in prompt_hashes}
+
+
+class FakeDataset:
+    def get_items(self):
+        return [{"id": str(i)} for i in range(4)]
+
+
+class FakeOptimizer:
+    """Proposes "v<round>" each round; prompt quality is fixed per text."""
+
+    def __init__(self, quality, checkpoint):
+        self.quality = quality
+        self.checkpoint = checkpoint
+        self.seed = 42
+        self.rounds = 0
+        self.evaluated_items = 0
+
+    def optimize_prompt(self, prompt, max_trials, **kwargs):
+        self.rounds += 1
+        text = f"v{self.rounds}"
+        self.checkpoint.prompts[text] = [{"role": "system", "content": text}]
+        return FakeResult([{"role": "system", "content": text}])
+
+    def evaluate_prompt(self, prompt, dataset_item_ids, **kwargs):
+        self.evaluated_items += len(dataset_item_ids)
+        return self.quality.get(prompt.text, 0.0)
+
+
+class TestEarlyStopping:
+    """Test cases for the patience / min-delta controller."""
+
+    def test_stops_after_patience_stale_rounds(self):
+        """Test that gains below min_delta count as stale rounds."""
+        stopper = EarlyStopping(patience=2, min_delta=0.05)
+        assert stopper.update(0.5)
+        assert not stopper.update(0.52)
+        assert not stopper.should_stop
+        assert stopper.update(0.6)
+        assert not stopper.update(0.6)
+        assert not stopper.update(0.61)
+        assert stopper.should_stop
+
+    def test_zero_patience_never_stops(self):
+        """Test that patience 0 disables early stopping."""
+        stopper = EarlyStopping(patience=0)
+        stopper.update(0.5)
+        stopper.update(0.1)
+        assert not stopper.should_stop
+
+
+class TestSuccessiveHalving:
+    """Test cases for subset-first candidate selection."""
+
+    def test_only_finalists_see_full_dataset(self):
+        """Test that weak candidates are dropped before the full evaluation."""
+        quality = {"a": 0.2, "b": 0.9, "c": 0.5, "d": 0.1}
+        seen = []
+
+        def evaluate(candidate, ids):
+            seen.append((candidate, len(ids)))
+            return quality[candidate]
+
+        best, score, rungs = successive_halving(list("abcd"), [str(i) for i in range(8)], evaluate, min_items=2)
+        assert (best, score) == ("b", 0.9)
+        assert [r["candidates"] for r in rungs] == [4, 2, 1]
+        assert [c for c, n in seen if n == 8] == ["b"]
+
+
+class TestAdaptiveOptimization:
+    """Test cases for the round-based optimization loop."""
+
+    def test_early_stop_keeps_best_prompt(self):
+        """Test that rounds stop once scores plateau and the best candidate is returned."""
+        checkpoint = FakeCheckpoint()
+        optimizer = FakeOptimizer({"start": 0.5, "v1": 0.7, "v2": 0.7, "v3": 0.69}, checkpoint)
+        result = run_adaptive_optimization(
+            optimizer, FakePrompt("start"), FakeDataset(), metric=None, checkpoint=checkpoint,
+            n_trials=20, round_trials=4, patience=2, min_delta=0.01,
+        )
+        assert result.prompt == [{"role": "system", "content": "v1"}]
+        assert (result.initial_score, result.score) == (0.5, 0.7)
+        budget = result.details["budget"]
+        assert budget["stopped_early"] and budget["trials_used"] == 12
+        assert optimizer.rounds == 3 and optimizer.seed == 42
@@ -0,0 +1,94 @@
+"""Tests for prompt-optimization checkpoints."""
+import pytest
+from meraki_flow.optimization import checkpoint as checkpoint_mod
+from meraki_flow.optimization.checkpoint import OptimizationCheckpoint, item_key
+
+
+ITEM = {"id": "abc", "input": "Time: 2hrs/week", "expected_output": "Knitting"}
+
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint_mod, "RESULTS_DIR", tmp_path)
+    return tmp_path
+
+
+def counting_metric():
+    calls = []
+
+    def metric_fn(dataset_item: dict, llm_output: str) -> float:
+        calls.append(llm_output)
+        return 0.5
+    return metric_fn, calls
+
+
+class TestOptimizationCheckpoint:
+    """Test cases for checkpoint memoization and resume."""
+
+    def test_metric_scored_once_per_output(self, results_dir):
+        """Test that repeated (item, output) pairs are served from the checkpoint."""
+        metric_fn, calls = counting_metric()
+        wrapped = OptimizationCheckpoint("discovery").wrap_metric(metric_fn)
+        assert wrapped.__name__ == "metric_fn"
+        assert wrapped(ITEM, "knitting") == 0.5
+        assert wrapped({**ITEM, "id": "recreated"}, "knitting ") == 0.5
+        assert calls == ["knitting"]
+
+    def test_resume_replays_checkpoint(self, results_dir):
+        """Test that a resumed run reuses outputs and scores from the previous run."""
+        first = OptimizationCheckpoint("discovery")
+        prompt_hash = first.register_prompt([{"role": "system", "content": "v1"}], "gpt-4o")
+        first.record_output(prompt_hash, "m1", "knitting", "i1")
+        first.wrap_metric(counting_metric()[0])(ITEM, "knitting")
+
+        resumed = OptimizationCheckpoint("discovery", resume=True)
+        metric_fn, calls = counting_metric()
+        assert resumed.cached_output(prompt_hash, "m1") == "knitting"
+        assert resumed.output_items == {(prompt_hash, "m1"): "i1"}
+        assert resumed.wrap_metric(metric_fn)(ITEM, "knitting") == 0.5
+        assert calls == []
+        assert resumed.hits == 2
+
+    def test_fresh_run_discards_checkpoint(self, results_dir):
+        """Test that starting without --resume clears the old checkpoint."""
+        first = OptimizationCheckpoint("motivation")
+        first.record_output("p", "m", "out")
+        assert OptimizationCheckpoint("motivation").outputs == {}
+
+    def test_best_so_far(self, results_dir):
+        """Test that the best candidate is chosen by mean score over its items."""
+        ckpt = OptimizationCheckpoint("challenges")
+        weak = ckpt.register_prompt([{"role": "system", "content": "weak"}])
+        strong = ckpt.register_prompt([{"role": "system", "content": "strong"}])
+        ckpt.record_output(weak, "m1", "meh", "i1")
+        ckpt.record_output(strong, "m1", "great", "i1")
+        ckpt.record_score("i1", "meh", 0.2)
+        ckpt.record_score("i1", "great", 0.9)
+
+        best = ckpt.best_so_far()
+        assert best["prompt_hash"] == strong
+        assert best["score"] == 0.9
+        assert best["prompt"] == [{"role": "system", "content": "strong"}]
+
+    def test_scores_joined_per_item(self, results_dir):
+        """Test that the same output text scored differently per item is attributed to its item."""
+        ckpt = OptimizationCheckpoint("discovery")
+        prompt_hash = ckpt.register_prompt([{"role": "system", "content": "v1"}])
+        ckpt.record_output(prompt_hash, "m1", "knitting", "i1")
+        ckpt.record_output(prompt_hash, "m2", "knitting", "i2")
+        ckpt.record_output(prompt_hash, "m3", "pottery")
+        ckpt.record_score("i1", "knitting", 0.9)
+        ckpt.record_score("i2", "knitting", 0.1)
+        ckpt.record_score("i3", "pottery", 1.0)
+        assert sorted(ckpt.candidate_scores()[prompt_hash]) == [0.1, 0.9]
+
+    def test_item_keys_for_rendered_prompt(self, results_dir):
+        """Test that rendered messages map back to the dataset item they came from."""
+        class Prompt:
+            def get_messages(self, item):
+                return [{"role": "user", "content": item["input"]}]
+
+        ckpt = OptimizationCheckpoint("discovery")
+        ckpt.bind_dataset([ITEM])
+        messages_hash = checkpoint_mod._hash(Prompt().get_messages(ITEM))
+        assert ckpt.item_keys_for(Prompt()) == {messages_hash: item_key(ITEM)}
@@ -0,0 +1,102 @@
+"""Tests for running optimizers concurrently under a shared LLM budget."""
+import asyncio
+import sys
+import time
+from multiprocessing import Manager
+from types import ModuleType, SimpleNamespace
+
+import pytest
+from meraki_flow.optimization import run_all
+from meraki_flow.optimization.rate_budget import SharedRateBudget, install_litellm_throttle
+
+
+@pytest.fixture
+def fake_optimizers(monkeypatch, tmp_path):
+    """Register optimizer modules: "ok" scores 0.5 -> 0.8, "broken" raises."""
+    ok = ModuleType("fake_optimize_ok")
+    ok.run_optimization = lambda n_trials, **kwargs: {
+        "initial_score": 0.5, "best_score": 0.8, "budget": {"trials_used": n_trials},
+    }
+    ok.save_results = lambda data: tmp_path / "ok.json"
+    ok.apply_to_yaml = lambda data: None
+
+    broken = ModuleType("fake_optimize_broken")
+
+    def fail(**kwargs):
+        raise RuntimeError("dataset missing")
+
+    broken.run_optimization = fail
+    for module in (ok, broken):
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+    monkeypatch.setattr(run_all, "OPTIMIZERS", {
+        "ok": {"module": ok.__name__, "description": "ok"},
+        "broken": {"module": broken.__name__, "description": "broken"},
+    })
+
+
+class TestSharedRateBudget:
+    """Test cases for the cross-process requests-per-minute budget."""
+
+    def test_calls_are_spaced_by_interval(self):
+        """Test that back-to-back acquires wait for consecutive slots."""
+        with Manager() as manager:
+            budget = SharedRateBudget(manager, per_minute=600)
+            assert budget.acquire() == 0
+            start = time.perf_counter()
+            waited = budget.acquire()
+            assert 0 < waited <= 0.1
+            assert time.perf_counter() - start >= waited
+
+    def test_zero_budget_is_unlimited(self):
+        """Test that --llm-rpm 0 never waits."""
+        with Manager() as manager:
+            budget = SharedRateBudget(manager, per_minute=0)
+            assert [budget.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_litellm_throttle_wraps_once(self, monkeypatch):
+        """Test that sync and async completions take a slot and re-installs don't stack."""
+        acquired = []
+        budget = SimpleNamespace(acquire=lambda: acquired.append(1) or 0.0)
+
+        async def acompletion(**kwargs):
+            return "async"
+
+        litellm = ModuleType("litellm")
+        litellm.completion = lambda **kwargs: "sync"
+        litellm.acompletion = acompletion
+        monkeypatch.setitem(sys.modules, "litellm", litellm)
+
+        install_litellm_throttle(budget)
+        install_litellm_throttle(budget)
+        assert litellm.completion(model="m") == "sync"
+        assert asyncio.run(litellm.acompletion(model="m")) == "async"
+        assert len(acquired) == 2
+
+
+class TestRunAll:
+    """Test cases for running optimizers and collecting their results."""
+
+    def test_run_optimizer_reports_success_and_failure(self, fake_optimizers):
+        """Test that a failing optimizer is reported instead of aborting the run."""
+        ok = run_all.run_optimizer("ok", apply=False, trials=4)
+        assert ok["status"] == "success"
+        assert (ok["initial_score"], ok["best_score"], ok["trials_used"]) == (0.5, 0.8, 4)
+        broken = run_all.run_optimizer("broken", apply=False, trials=4)
+        assert broken["status"] == "failed"
+        assert broken["error"] == "dataset missing"
+
+    def test_run_parallel_keeps_requested_order(self, fake_optimizers):
+        """Test that worker processes return results in the requested order."""
+        results = run_all.run_parallel(["broken", "ok"], apply=False, trials=2, workers=2, llm_rpm=600)
+        assert [(r["name"], r["status"]) for r in results] == [("broken", "failed"), ("ok", "success")]
+
+    def test_run_sequential_under_budget(self, fake_optimizers, monkeypatch):
+        """Test the in-process path with a shared budget installed for its runs."""
+        installed = []
+        monkeypatch.setattr(
+            "meraki_flow.optimization.rate_budget.install_litellm_throttle",
+            lambda budget: installed.append(budget.interval),
+        )
+        results = run_all.run_sequential(["ok", "broken"], apply=False, trials=2, llm_rpm=600)
+        assert [(r["name"], r["status"]) for r in results] == [("ok", "success"), ("broken", "failed")]
+        assert installed == [0.1]
@@ -0,0 +1,144 @@
+"""Tests for the job submission rate limits."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from meraki_flow import api
+from meraki_flow.rate_limit import (
+    Limit,
+    MemoryRateLimitStore,
+    RateLimited,
+    RateLimiter,
+    RateLimitStore,
+    global_limit,
+)
+
+
+class BrokenStore(RateLimitStore):
+    async def take(self, buckets, cost=1):
+        raise ConnectionError("supabase unreachable")
+
+
+def make_limiter(store=None, user=Limit(60, burst=2), global_per_min=600):
+    return RateLimiter(
+        store or MemoryRateLimitStore(),
+        user_limit=user,
+        anonymous_limit=Limit(60, burst=1),
+        global_limits={"discovery": Limit(global_per_min, burst=3)},
+    )
+
+
+class TestRateLimiter:
+    """Test cases for per-user and global token buckets."""
+
+    def test_user_bucket_rejects_with_retry_after(self):
+        """Test that a user past their burst gets a retry delay, other users don't."""
+        limiter = make_limiter()
+        asyncio.run(limiter.check("discovery", "user-1"))
+        asyncio.run(limiter.check("discovery", "user-1"))
+        with pytest.raises(RateLimited) as exc:
+            asyncio.run(limiter.check("discovery", "user-1"))
+        assert exc.value.scope == "user"
+        assert 0 < exc.value.retry_after <= 1
+        asyncio.run(limiter.check("discovery", "user-2"))
+
+    def test_global_bucket_caps_all_users(self):
+        """Test that the per-job-type bucket limits the sum over users."""
+        limiter = make_limiter(user=Limit(0))
+        for i in range(3):
+            asyncio.run(limiter.check("discovery", f"user-{i}"))
+        with pytest.raises(RateLimited) as exc:
+            asyncio.run(limiter.check("discovery", "user-9"))
+        assert exc.value.scope == "global"
+        assert limiter.stats()["job_types"]["discovery"] == {
+            "global_per_min": 600,
+            "allowed": 3,
+            "rejected": {"global": 1},
+        }
+
+    def test_rejection_takes_no_tokens(self):
+        """Test that a request the global bucket rejects keeps the user's token."""
+        limiter = make_limiter()
+        for i in range(3):
+            asyncio.run(limiter.check("discovery", f"user-{i}"))
+        with pytest.raises(RateLimited) as exc:
+            asyncio.run(limiter.check("discovery", "user-9"))
+        assert exc.value.scope == "global"
+        # The user's bucket (burst 2) is shared by job types and still full
+        asyncio.run(limiter.check("sampling_preview", "user-9"))
+        asyncio.run(limiter.check("sampling_preview", "user-9"))
+
+    def test_anonymous_requests_keyed_by_client(self):
+        """Test that requests without a user_id share a bucket per client address."""
+        limiter = make_limiter()
+        asyncio.run(limiter.check("discovery", "", "10.0.0.1"))
+        with pytest.raises(RateLimited):
+            asyncio.run(limiter.check("discovery", "", "10.0.0.1"))
+        asyncio.run(limiter.check("discovery", "", "10.0.0.2"))
+
+    def test_store_errors_fail_open(self):
+        """Test that an unreachable shared store doesn't block submissions."""
+        asyncio.run(make_limiter(store=BrokenStore()).check("discovery", "user-1"))
+
+
+class TestForwardedClients:
+    """Test cases for anonymous buckets behind the deployment proxy."""
+
+    def test_forwarded_clients_get_separate_buckets(self, monkeypatch):
+        """Test that anonymous users behind one proxy are limited per X-Forwarded-For."""
+        from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+        async def create_job(job_type, request_data, user_id):
+            return "job-1"
+
+        class Scheduler:
+            def submit(self, *args, **kwargs):
+                pass
+
+        limiter = make_limiter(user=Limit(0), global_per_min=0)
+        monkeypatch.setattr(api, "get_rate_limiter", lambda: limiter)
+        monkeypatch.setattr(api, "get_scheduler", Scheduler)
+        monkeypatch.setattr(api.async_db, "create_job", create_job)
+        # As configured in start_server.py
+        client = TestClient(ProxyHeadersMiddleware(api.app, trusted_hosts="*"))
+
+        def submit(forwarded_for):
+            headers = {"X-Forwarded-For": forwarded_for}
+            return client.post("/discovery", json={"user_id": ""}, headers=headers).status_code
+
+        assert submit("203.0.113.1") == 200
+        assert submit("203.0.113.2") == 200
+        assert submit("203.0.113.1") == 429
+
+
+class TestMemoryRateLimitStore:
+    """Test cases for the in-memory bucket math."""
+
+    def test_bucket_refills_over_time(self, monkeypatch):
+        """Test that tokens come back at the refill rate, up to the burst size."""
+        now = [100.0]
+        monkeypatch.setattr("meraki_flow.rate_limit.time.monotonic", lambda: now[0])
+        store, bucket = MemoryRateLimitStore(), [("k", Limit(60, burst=2))]
+
+        assert asyncio.run(store.take(bucket)) == [0]
+        assert asyncio.run(store.take(bucket)) == [0]
+        assert asyncio.run(store.take(bucket)) == [pytest.approx(1.0)]
+        now[0] += 0.5
+        assert asyncio.run(store.take(bucket)) == [pytest.approx(0.5)]
+        now[0] += 60
+        assert asyncio.run(store.take(bucket, cost=2)) == [0]
+
+    def test_all_or_nothing(self):
+        """Test that no bucket is charged unless every bucket has a token."""
+        store = MemoryRateLimitStore()
+        full, empty = ("full", Limit(60, burst=1)), ("empty", Limit(60, burst=1))
+        asyncio.run(store.take([empty]))
+        waits = asyncio.run(store.take([full, empty]))
+        assert waits[0] == 0 and waits[1] > 0
+        assert asyncio.run(store.take([full])) == [0]
+
+    def test_env_overrides_global_limit(self, monkeypatch):
+        """Test RATE_LIMIT_<JOB_TYPE>_PER_MIN and the default limits."""
+        monkeypatch.setenv("RATE_LIMIT_ROADMAP_GENERATION_PER_MIN", "5")
+        assert global_limit("roadmap_generation").per_min == 5
+        assert global_limit("challenge_generation").capacity == 60
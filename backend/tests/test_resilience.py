@@ -0,0 +1,174 @@
+"""Tests for LLM call retries and hedged requests."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from meraki_flow import resilience
+from meraki_flow.cancellation import JobCancelled, JobContext, call_timeout, current_job
+from meraki_flow.resilience import (
+    ResilienceStats,
+    hedged_call,
+    is_retryable,
+    make_llm_calls_resilient,
+)
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class FlakyLLM:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def call(self, messages):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "ok"
+
+
+def crew_with(llm, tasks=1):
+    return SimpleNamespace(
+        agents=[SimpleNamespace(llm=llm)],
+        tasks=[SimpleNamespace(callback=None) for _ in range(tasks)],
+    )
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setenv("LLM_RETRY_BASE_S", "0.001")
+    monkeypatch.setenv("LLM_RETRY_MAX_S", "0.01")
+    monkeypatch.delenv("LLM_HEDGE_AFTER_S", raising=False)
+
+
+class TestRetries:
+    """Test cases for per-call retries with backoff."""
+
+    def test_transient_errors_are_retried(self):
+        """Test that rate limits and 5xx are retried in place and counted."""
+        llm = FlakyLLM([RateLimitError("slow down"), ProviderError(503)])
+        stats = make_llm_calls_resilient(crew_with(llm))
+        assert llm.call([]) == "ok"
+        assert llm.calls == 3
+        assert (stats.retries, stats.recovered, stats.exhausted) == (2, 1, 0)
+
+    def test_client_errors_fail_fast(self):
+        """Test that a 400 is raised without retrying."""
+        llm = FlakyLLM([ProviderError(400)])
+        stats = make_llm_calls_resilient(crew_with(llm))
+        with pytest.raises(ProviderError):
+            llm.call([])
+        assert llm.calls == 1
+        assert stats.retries == 0
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        """Test that the last error is raised once retries run out."""
+        monkeypatch.setenv("LLM_MAX_RETRIES", "2")
+        llm = FlakyLLM([ProviderError(500)] * 5)
+        stats = make_llm_calls_resilient(crew_with(llm))
+        with pytest.raises(ProviderError):
+            llm.call([])
+        assert llm.calls == 3
+        assert stats.exhausted == 1
+
+    def test_retryable_from_cause(self):
+        """Test that wrapped provider errors are recognized through __cause__."""
+        wrapped = RuntimeError("LLM call failed")
+        wrapped.__cause__ = ProviderError(429)
+        assert is_retryable(wrapped)
+        assert not is_retryable(ValueError("bad json"))
+
+
+class TestHedging:
+    """Test cases for hedged final-task calls."""
+
+    def test_hedge_wins_over_slow_primary(self):
+        """Test that a slow call is raced by a duplicate and the saving recorded."""
+        delays = [0.3, 0.0]
+        lock = threading.Lock()
+
+        def call(messages):
+            with lock:
+                delay = delays.pop(0)
+            time.sleep(delay)
+            return f"answer after {delay}"
+
+        stats = ResilienceStats()
+        start = time.perf_counter()
+        assert hedged_call(call, ([],), {}, 0.05, stats) == "answer after 0.0"
+        assert time.perf_counter() - start < 0.25
+        assert (stats.hedged, stats.hedge_wins) == (1, 1)
+        deadline = time.monotonic() + 1
+        while stats.hedge_saved_s == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stats.hedge_saved_s > 0.1
+
+    def test_only_final_task_is_hedged(self, monkeypatch):
+        """Test that hedging starts once the earlier tasks have completed."""
+        monkeypatch.setenv("LLM_HEDGE_AFTER_S", "5")
+        hedged = []
+        monkeypatch.setattr(
+            resilience, "hedged_call",
+            lambda call, args, kwargs, delay, stats, job: hedged.append(delay) or call(*args, **kwargs),
+        )
+        crew = crew_with(FlakyLLM([]), tasks=2)
+        make_llm_calls_resilient(crew)
+
+        crew.agents[0].llm.call([])
+        assert hedged == []
+        crew.tasks[0].callback("first task output")
+        crew.agents[0].llm.call([])
+        assert hedged == [5.0]
+
+    def test_hedged_attempts_run_as_the_job(self):
+        """Test that both attempts see the job, so tools honor its cancel and deadline."""
+        job = JobContext("job-1", "discovery", timeout=60)
+        seen = []
+        delays = [0.2, 0.0]
+        lock = threading.Lock()
+
+        def call(messages):
+            with lock:
+                delay = delays.pop(0)
+            seen.append((current_job(), call_timeout(300) <= 60))
+            time.sleep(delay)
+            return "ok"
+
+        assert hedged_call(call, ([],), {}, 0.02, ResilienceStats(), job) == "ok"
+        assert seen == [(job, True), (job, True)]
+
+    def test_cancel_interrupts_hedged_wait(self, monkeypatch):
+        """Test that a cancelled job stops waiting on a stuck call instead of blocking."""
+        monkeypatch.setattr(resilience, "CANCEL_POLL_S", 0.01)
+        job = JobContext("job-2", "discovery", timeout=60)
+        release = threading.Event()
+        threading.Timer(0.05, job.cancel).start()
+        start = time.perf_counter()
+        with pytest.raises(JobCancelled):
+            hedged_call(lambda messages: release.wait(5), ([],), {}, 0.01, ResilienceStats(), job)
+        release.set()
+        assert time.perf_counter() - start < 1
+
+    def test_no_hedge_when_pool_is_busy(self, monkeypatch):
+        """Test that a saturated hedge pool skips hedging instead of queueing."""
+        resilience._get_hedge_pool()  # create the pool so it keeps the patched slots
+        empty = threading.BoundedSemaphore(1)
+        empty.acquire()
+        monkeypatch.setattr(resilience, "_hedge_slots", empty)
+        stats = ResilienceStats()
+
+        def call(messages):
+            time.sleep(0.05)
+            return "primary"
+
+        assert hedged_call(call, ([],), {}, 0.01, stats) == "primary"
+        assert stats.hedged == 0
@@ -0,0 +1,71 @@
+"""Tests for the priority-aware job scheduler."""
+import threading
+import time
+
+from meraki_flow.scheduler import JobScheduler, priority_class
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+class TestJobScheduler:
+    """Test cases for dispatch order, caps and aging."""
+
+    def _blocked(self, scheduler):
+        """Occupy the only worker until the returned event is set."""
+        gate, started = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            gate.wait(2)
+
+        scheduler.submit("practice_feedback", block)
+        started.wait(1)
+        return gate
+
+    def test_interactive_jobs_jump_the_queue(self):
+        """Test that queued interactive work runs before earlier background work."""
+        scheduler = JobScheduler(workers=1, aging_s=0)
+        order = []
+        gate = self._blocked(scheduler)
+        scheduler.submit("roadmap_generation", order.append, "roadmap")
+        scheduler.submit("motivation_check", order.append, "nudge")
+        scheduler.submit("sampling_preview", order.append, "preview")
+        gate.set()
+        assert wait_for(lambda: len(order) == 3)
+        assert order == ["preview", "roadmap", "nudge"]
+
+    def test_background_cap_leaves_workers_free(self):
+        """Test that background jobs never take more workers than their cap."""
+        scheduler = JobScheduler(workers=3, caps={"background": 1})
+        gate = threading.Event()
+        for _ in range(3):
+            scheduler.submit("motivation_check", gate.wait, 2)
+        assert wait_for(lambda: scheduler.stats()["classes"]["background"]["running"] == 1)
+
+        done = threading.Event()
+        scheduler.submit("sampling_preview", done.set)
+        assert done.wait(1)
+        assert scheduler.stats()["classes"]["background"]["queued"] == 2
+        gate.set()
+
+    def test_aging_prevents_starvation(self):
+        """Test that a long-waiting background job overtakes fresh interactive jobs."""
+        scheduler = JobScheduler(workers=1, aging_s=0.01)
+        order = []
+        gate = self._blocked(scheduler)
+        scheduler.submit("roadmap_generation", order.append, "roadmap")
+        time.sleep(0.05)
+        scheduler.submit("sampling_preview", order.append, "preview")
+        gate.set()
+        assert wait_for(lambda: len(order) == 2)
+        assert order == ["roadmap", "preview"]
+
+    def test_unknown_job_type_is_standard(self):
+        """Test the default priority class."""
+        assert priority_class("something_new") == "standard"
+        assert priority_class("practice_feedback") == "interactive"
@@ -0,0 +1,66 @@
+"""Tests for the Supabase HTTP pool settings and metrics."""
+import asyncio
+
+import httpx
+import pytest
+from meraki_flow.supabase_http import (
+    PoolStats,
+    _AsyncMeteredTransport,
+    _MeteredTransport,
+    pool_limits,
+    request_timeout,
+)
+
+
+class TestPoolSettings:
+    """Test cases for env-configured limits and timeouts."""
+
+    def test_env_overrides(self, monkeypatch):
+        """Test that pool limits and timeouts come from env vars."""
+        monkeypatch.setenv("SUPABASE_MAX_CONNECTIONS", "50")
+        monkeypatch.setenv("SUPABASE_KEEPALIVE_EXPIRY", "5")
+        monkeypatch.setenv("SUPABASE_POOL_TIMEOUT", "2")
+        limits = pool_limits()
+        assert (limits.max_connections, limits.keepalive_expiry) == (50, 5.0)
+        assert request_timeout().pool == 2.0
+
+
+class TestMeteredTransport:
+    """Test cases for in-flight and timeout counters."""
+
+    def test_counts_requests_and_pool_timeouts(self):
+        """Test that successes, pool timeouts and other errors are tallied separately."""
+        def handler(request):
+            if request.url.path == "/pool":
+                raise httpx.PoolTimeout("pool exhausted")
+            if request.url.path == "/boom":
+                raise httpx.ConnectError("refused")
+            return httpx.Response(200, json={})
+
+        stats = PoolStats(max_connections=4)
+        client = httpx.Client(transport=_MeteredTransport(httpx.MockTransport(handler), stats))
+        client.get("http://sb/ok")
+        for path in ("/pool", "/boom"):
+            with pytest.raises(httpx.HTTPError):
+                client.get(f"http://sb{path}")
+
+        snap = stats.snapshot()
+        assert (snap["requests"], snap["pool_timeouts"], snap["errors"]) == (3, 1, 1)
+        assert snap["in_flight"] == 0 and snap["peak_in_flight"] == 1
+
+    def test_tracks_peak_concurrency(self):
+        """Test that concurrent async requests raise peak_in_flight."""
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200)
+
+        stats = PoolStats()
+
+        async def run():
+            transport = _AsyncMeteredTransport(httpx.MockTransport(handler), stats)
+            async with httpx.AsyncClient(transport=transport) as client:
+                await asyncio.gather(*(client.get("http://sb/") for _ in range(5)))
+
+        asyncio.run(run())
+        assert stats.snapshot()["peak_in_flight"] == 5
+        assert stats.in_flight == 0
@@ -0,0 +1,88 @@
+"""Tests for LLM usage capture and aggregation."""
+from types import SimpleNamespace
+
+import pytest
+from meraki_flow.usage import estimate_cost, kickoff_with_usage, summarize_usage
+
+
+class FakeLLM:
+    model = "gpt-4o-mini-2024-07-18"
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, messages):
+        self.calls += 1
+        return "ok"
+
+
+class FakeCrew:
+    """Two agents sharing one LLM; kickoff makes `n_calls` LLM calls."""
+
+    def __init__(self, n_calls=3):
+        self.llm = FakeLLM()
+        self.agents = [SimpleNamespace(llm=self.llm), SimpleNamespace(llm=self.llm)]
+        self.tasks = [SimpleNamespace(callback=None)]
+        self.n_calls = n_calls
+        self.inputs = None
+
+    def kickoff(self, inputs):
+        self.inputs = inputs
+        for _ in range(self.n_calls):
+            self.agents[0].llm.call([])
+        token_usage = SimpleNamespace(
+            prompt_tokens=1000, completion_tokens=500, cached_prompt_tokens=200,
+            total_tokens=0, successful_requests=self.n_calls,
+        )
+        return SimpleNamespace(raw="{}", token_usage=token_usage)
+
+
+class TestKickoffWithUsage:
+    """Test cases for per-run usage capture."""
+
+    def test_usage_counts_calls_tokens_and_cost(self):
+        """Test that a shared LLM is counted once per call and tokens are priced."""
+        crew = FakeCrew(n_calls=3)
+        output, usage = kickoff_with_usage("discovery", crew, {"q1": "1–3 hours"})
+        assert output.raw == "{}"
+        assert crew.inputs == {"q1": "1–3 hours"}
+        assert crew.llm.calls == 3
+        assert usage["crew"] == "discovery"
+        assert usage["model"] == "gpt-4o-mini-2024-07-18"
+        assert (usage["prompt_tokens"], usage["completion_tokens"]) == (1000, 500)
+        assert usage["cached_prompt_tokens"] == 200
+        assert usage["total_tokens"] == 1500
+        assert usage["llm_calls"] == 3
+        assert usage["llm_retries"] == 0
+        assert usage["estimated_cost_usd"] == pytest.approx((1000 * 0.15 + 500 * 0.60) / 1_000_000)
+        assert usage["wall_time_s"] >= usage["llm_wall_time_s"] >= 0
+
+    def test_unknown_model_costs_nothing(self):
+        """Test that unpriced models are reported at 0 rather than guessed."""
+        assert estimate_cost("local/llama3", 1000, 1000) == 0.0
+        assert estimate_cost("openai/gpt-4o,gpt-4o-mini", 1_000_000, 0) == 2.50
+
+
+class TestSummarizeUsage:
+    """Test cases for the /metrics aggregation."""
+
+    def test_totals_and_averages_by_job_type(self):
+        """Test that rows are summed per job type, most expensive first."""
+        rows = [
+            {"job_type": "discovery", "usage": {"total_tokens": 100, "llm_calls": 2,
+                                                 "estimated_cost_usd": 0.01, "model": "gpt-4o"}},
+            {"job_type": "discovery", "usage": {"total_tokens": 300, "llm_calls": 4,
+                                                 "estimated_cost_usd": 0.03, "model": "gpt-4o"}},
+            {"job_type": "roadmap_generation", "usage": {"total_tokens": 50, "estimated_cost_usd": 0.001}},
+            {"job_type": "motivation_check", "usage": None},
+        ]
+        summary = summarize_usage(rows)
+        assert (summary["jobs"], summary["total_tokens"]) == (3, 450)
+        assert summary["estimated_cost_usd"] == pytest.approx(0.041)
+        discovery = summary["by_job_type"]["discovery"]
+        assert discovery["jobs"] == 2
+        assert discovery["total_tokens"] == 400
+        assert discovery["avg_total_tokens"] == 200
+        assert discovery["avg_llm_calls"] == 3
+        assert discovery["models"] == ["gpt-4o"]
+        assert list(summary["by_job_type"]) == ["discovery", "roadmap_generation"]
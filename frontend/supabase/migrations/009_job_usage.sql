@@ -0,0 +1,8 @@
+-- LLM usage accounting per backend job.
+-- Written by the backend (service role) when a job completes:
+-- { crew, model, prompt_tokens, completion_tokens, cached_prompt_tokens,
+--   total_tokens, llm_calls, llm_wall_time_s, wall_time_s, estimated_cost_usd }
+alter table jobs add column if not exists usage jsonb;
+
+-- /metrics aggregates usage by job type over a recent time window
+create index if not exists idx_jobs_type_created_at on jobs(job_type, created_at desc);
@@ -0,0 +1,5 @@
+-- Group jobs submitted together through POST /discovery/batch
+-- (cohort onboarding for schools, corporate wellness programs, ...).
+alter table jobs add column if not exists batch_id uuid;
+
+create index if not exists idx_jobs_batch_id on jobs(batch_id) where batch_id is not null;
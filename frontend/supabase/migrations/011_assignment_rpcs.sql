@@ -0,0 +1,92 @@
+-- Persist a generated challenge / roadmap and assign it to the user in one
+-- call. Each function runs in a single transaction: the hobby lookup and both
+-- inserts either all happen or none do, so a failure can no longer leave an
+-- orphan challenges/roadmaps row. Returns the assignment id, or null when the
+-- hobby slug is unknown.
+--
+-- Called by the backend (service role) through supabase.rpc(...).
+
+create or replace function public.assign_generated_challenge(
+  p_user_id uuid,
+  p_hobby_slug text,
+  p_challenge jsonb
+)
+returns uuid
+language plpgsql
+as $$
+declare
+  v_hobby_id uuid;
+  v_challenge_id uuid;
+  v_user_challenge_id uuid;
+begin
+  select id into v_hobby_id from public.hobbies where slug = p_hobby_slug;
+  if v_hobby_id is null then
+    return null;
+  end if;
+
+  insert into public.challenges (
+    hobby_id, title, description, why_this_challenge, skills,
+    difficulty, estimated_time, tips, what_youll_learn
+  )
+  values (
+    v_hobby_id,
+    coalesce(p_challenge ->> 'title', ''),
+    coalesce(p_challenge ->> 'description', ''),
+    coalesce(p_challenge ->> 'why_this_challenge', ''),
+    array(select jsonb_array_elements_text(coalesce(p_challenge -> 'skills', '[]'))),
+    coalesce(p_challenge ->> 'difficulty', 'easy'),
+    coalesce(p_challenge ->> 'estimated_time', ''),
+    array(select jsonb_array_elements_text(coalesce(p_challenge -> 'tips', '[]'))),
+    array(select jsonb_array_elements_text(coalesce(p_challenge -> 'what_youll_learn', '[]')))
+  )
+  returning id into v_challenge_id;
+
+  insert into public.user_challenges (user_id, challenge_id, status, started_at)
+  values (p_user_id, v_challenge_id, 'active', now())
+  returning id into v_user_challenge_id;
+
+  return v_user_challenge_id;
+end;
+$$;
+
+
+create or replace function public.assign_generated_roadmap(
+  p_user_id uuid,
+  p_hobby_slug text,
+  p_roadmap jsonb
+)
+returns uuid
+language plpgsql
+as $$
+declare
+  v_hobby_id uuid;
+  v_roadmap_id uuid;
+  v_user_roadmap_id uuid;
+  v_phases jsonb := coalesce(p_roadmap -> 'phases', '[]');
+begin
+  select id into v_hobby_id from public.hobbies where slug = p_hobby_slug;
+  if v_hobby_id is null then
+    return null;
+  end if;
+
+  insert into public.roadmaps (hobby_id, title, description, phases, total_phases)
+  values (
+    v_hobby_id,
+    coalesce(p_roadmap ->> 'title', ''),
+    coalesce(p_roadmap ->> 'description', ''),
+    v_phases,
+    jsonb_array_length(v_phases)
+  )
+  returning id into v_roadmap_id;
+
+  insert into public.user_roadmaps (user_id, roadmap_id, hobby_slug, current_phase)
+  values (p_user_id, v_roadmap_id, p_hobby_slug, 0)
+  returning id into v_user_roadmap_id;
+
+  return v_user_roadmap_id;
+end;
+$$;
+
+-- Backend only: these take an arbitrary user id.
+revoke execute on function public.assign_generated_challenge(uuid, text, jsonb) from public, anon, authenticated;
+revoke execute on function public.assign_generated_roadmap(uuid, text, jsonb) from public, anon, authenticated;
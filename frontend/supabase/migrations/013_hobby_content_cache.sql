@@ -0,0 +1,19 @@
+-- Hobby-level content shared across users.
+-- Curated beginner videos depend only on the hobby, and local spots/tips only
+-- on the hobby and location, so the backend generates them once and reuses
+-- them for every user; per-user personalization is still generated per job.
+--   content_type: 'videos' (location_key = '') | 'local_experiences'
+--   hobby_key:    hobby slug (or normalized hobby name)
+--   location_key: normalized location ('' when not location-specific)
+-- Backend only (service role); RLS on with no policies.
+create table if not exists hobby_content_cache (
+  id uuid primary key default gen_random_uuid(),
+  content_type text not null,
+  hobby_key text not null,
+  location_key text not null default '',
+  content jsonb not null,
+  created_at timestamptz not null default now(),
+  constraint hobby_content_cache_key unique (content_type, hobby_key, location_key)
+);
+
+alter table hobby_content_cache enable row level security;
@@ -0,0 +1,129 @@
+-- Job cancellation and deadlines (DELETE /jobs/{job_id}, per-job-type timeouts).
+--
+-- A job can now end as 'cancelled' (by the user) or 'failed' with a timeout
+-- reason while its worker thread is still winding down. complete_job only
+-- completes jobs that are still pending/running, so a late crew result never
+-- overwrites a cancelled or timed-out job; it returns {"saved": false,
+-- "stale": true} and skips the side-table write.
+
+create or replace function public.complete_job(
+  p_job_id uuid,
+  p_result jsonb,
+  p_usage jsonb default null,
+  p_persist text default null,
+  p_params jsonb default '{}'
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+  v_user_id uuid := nullif(p_params ->> 'user_id', '')::uuid;
+  v_hobby_slug text := coalesce(p_params ->> 'hobby_slug', '');
+  v_saved_id uuid;
+  v_count int := 0;
+begin
+  update public.jobs
+     set status = 'completed',
+         result = p_result,
+         usage = coalesce(p_usage, usage),
+         updated_at = now()
+   where id = p_job_id
+     and status in ('pending', 'running');
+
+  if not found then
+    return jsonb_build_object('saved', false, 'stale', true);
+  end if;
+
+  if p_persist is null then
+    return jsonb_build_object('saved', false);
+  end if;
+
+  begin
+    case p_persist
+      when 'hobby_matches' then
+        insert into public.hobby_matches (user_id, hobby_id, match_percentage, match_tags, reasoning, created_at)
+        select distinct on (h.id)
+               v_user_id,
+               h.id,
+               coalesce(round((m ->> 'match_percentage')::numeric)::int, 0),
+               array(select jsonb_array_elements_text(coalesce(m -> 'match_tags', '[]'))),
+               coalesce(m ->> 'reasoning', ''),
+               now()
+          from jsonb_array_elements(coalesce(p_result -> 'matches', '[]')) as m
+          join public.hobbies h on h.slug = m ->> 'hobby_slug'
+        on conflict (user_id, hobby_id) do update
+          set match_percentage = excluded.match_percentage,
+              match_tags = excluded.match_tags,
+              reasoning = excluded.reasoning,
+              created_at = excluded.created_at;
+        get diagnostics v_count = row_count;
+
+      when 'sampling_result' then
+        insert into public.sampling_results (user_id, hobby_slug, result, created_at)
+        values (v_user_id, v_hobby_slug, p_result, now())
+        on conflict (user_id, hobby_slug) do update
+          set result = excluded.result, created_at = excluded.created_at
+        returning id into v_saved_id;
+
+      when 'local_experience_result' then
+        insert into public.local_experience_results (user_id, hobby_slug, location, result, created_at)
+        values (v_user_id, v_hobby_slug, coalesce(p_params ->> 'location', ''), p_result, now())
+        on conflict (user_id, hobby_slug, location) do update
+          set result = excluded.result, created_at = excluded.created_at
+        returning id into v_saved_id;
+
+      when 'ai_feedback' then
+        insert into public.ai_feedback (session_id, observations, growth, suggestions, celebration, created_at)
+        values (
+          (p_params ->> 'session_id')::uuid,
+          array(select jsonb_array_elements_text(coalesce(p_result -> 'observations', '[]'))),
+          array(select jsonb_array_elements_text(coalesce(p_result -> 'growth', '[]'))),
+          array(select jsonb_array_elements_text(coalesce(p_result -> 'suggestions', '[]'))),
+          coalesce(p_result ->> 'celebration', ''),
+          now()
+        )
+        on conflict (session_id) do update
+          set observations = excluded.observations,
+              growth = excluded.growth,
+              suggestions = excluded.suggestions,
+              celebration = excluded.celebration,
+              created_at = excluded.created_at
+        returning id into v_saved_id;
+
+      when 'nudge' then
+        insert into public.nudges (user_id, hobby_id, nudge_type, message, suggested_action, action_data, urgency, created_at)
+        values (
+          v_user_id,
+          (select id from public.hobbies where slug = v_hobby_slug),
+          coalesce(p_result ->> 'nudge_type', ''),
+          coalesce(p_result ->> 'message', ''),
+          coalesce(p_result ->> 'suggested_action', ''),
+          coalesce(p_result ->> 'action_data', ''),
+          coalesce(p_result ->> 'urgency', 'gentle'),
+          now()
+        )
+        returning id into v_saved_id;
+
+      when 'challenge' then
+        v_saved_id := public.assign_generated_challenge(v_user_id, v_hobby_slug, p_result);
+
+      when 'roadmap' then
+        v_saved_id := public.assign_generated_roadmap(v_user_id, v_hobby_slug, p_result);
+
+      else
+        raise exception 'unknown persist kind: %', p_persist;
+    end case;
+  exception when others then
+    return jsonb_build_object('saved', false, 'error', sqlerrm);
+  end;
+
+  return jsonb_build_object(
+    'saved', v_saved_id is not null or v_count > 0,
+    'id', v_saved_id,
+    'count', v_count
+  );
+end;
+$$;
+
+-- Backend only: writes on behalf of arbitrary users.
+revoke execute on function public.complete_job(uuid, jsonb, jsonb, text, jsonb) from public, anon, authenticated;
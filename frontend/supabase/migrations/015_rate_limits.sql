@@ -0,0 +1,82 @@
+-- Shared token buckets for the backend's job submission rate limits.
+-- With more than one API replica the in-memory buckets would each allow the
+-- full rate, so RATE_LIMIT_BACKEND=supabase keeps them here instead. Each
+-- bucket refills continuously at its refill rate up to its capacity.
+--
+-- Unlogged: losing the buckets on a crash only resets the limits.
+-- Backend only (service role); RLS on with no policies.
+create unlogged table if not exists rate_limit_buckets (
+  key text primary key,
+  tokens double precision not null,
+  updated_at timestamptz not null default now()
+);
+
+alter table rate_limit_buckets enable row level security;
+
+-- Take p_cost tokens from every bucket in p_keys, or from none of them.
+-- p_capacities / p_refills_per_s are per key (refill rates must be positive).
+-- Returns one wait per key in seconds: all 0 when the tokens were taken,
+-- otherwise how long each bucket needs until it has enough. The rows are
+-- locked in key order, so concurrent calls from all replicas are atomic and
+-- can't deadlock.
+create or replace function public.take_rate_limit_tokens(
+  p_keys text[],
+  p_capacities double precision[],
+  p_refills_per_s double precision[],
+  p_cost double precision default 1
+)
+returns double precision[]
+language plpgsql
+as $$
+declare
+  v_now timestamptz;
+  v_tokens double precision[] := '{}';
+  v_waits double precision[] := '{}';
+  v_available double precision;
+  v_allowed boolean := true;
+  i int;
+begin
+  insert into public.rate_limit_buckets (key, tokens, updated_at)
+  select k, c, clock_timestamp()
+  from unnest(p_keys, p_capacities) as t(k, c)
+  order by k
+  on conflict (key) do nothing;
+
+  perform 1
+  from public.rate_limit_buckets
+  where key = any(p_keys)
+  order by key
+  for update;
+
+  -- After the lock: a caller that waited must not write an updated_at older
+  -- than the previous holder's, or the next refill counts the gap twice
+  v_now := clock_timestamp();
+
+  for i in 1 .. coalesce(array_length(p_keys, 1), 0) loop
+    select least(
+      p_capacities[i],
+      tokens + greatest(0, extract(epoch from v_now - updated_at)) * p_refills_per_s[i]
+    )
+    into v_available
+    from public.rate_limit_buckets
+    where key = p_keys[i];
+
+    v_tokens := v_tokens || v_available;
+    v_waits := v_waits || greatest(0, (p_cost - v_available) / p_refills_per_s[i]);
+    if v_available < p_cost then
+      v_allowed := false;
+    end if;
+  end loop;
+
+  for i in 1 .. coalesce(array_length(p_keys, 1), 0) loop
+    update public.rate_limit_buckets
+    set tokens = v_tokens[i] - case when v_allowed then p_cost else 0 end,
+        updated_at = greatest(updated_at, v_now)
+    where key = p_keys[i];
+  end loop;
+
+  return v_waits;
+end;
+$$;
+
+revoke execute on function public.take_rate_limit_tokens(text[], double precision[], double precision[], double precision) from public, anon, authenticated;